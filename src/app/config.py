@@ -2,7 +2,33 @@
 アプリケーション設定
 """
 import os
-from typing import Optional
+from typing import List, Optional
+
+
+def _split_urls(value: str) -> List[str]:
+    """カンマ区切りのURL一覧を分割する"""
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+# 同期ドライバーのURLスキームと、対応する非同期ドライバーのスキーム
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "mysql+mysqldb": "mysql+aiomysql",
+}
+
+
+def _to_async_url(url: str) -> str:
+    """既知の同期ドライバーのURLを非同期ドライバー用に置き換える（それ以外はそのまま返す）"""
+    scheme, separator, rest = url.partition("://")
+    if not separator:
+        return url
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
 
 
 class Settings:
@@ -10,6 +36,46 @@ class Settings:
     
     # データベース設定
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+    # 非同期API用（未指定時は DATABASE_URL のドライバーを非同期ドライバーに置き換える。例: postgresql:// → postgresql+asyncpg://）
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", _to_async_url(DATABASE_URL))
+    
+    # 読み取り用レプリカ（カンマ区切り。未指定時は読み取りもプライマリを使用）
+    DATABASE_REPLICA_URLS: List[str] = _split_urls(os.getenv("DATABASE_REPLICA_URLS", ""))
+    ASYNC_DATABASE_REPLICA_URLS: List[str] = _split_urls(
+        os.getenv("ASYNC_DATABASE_REPLICA_URLS", ",".join(map(_to_async_url, DATABASE_REPLICA_URLS)))
+    )
+    # 書き込んだクライアントの読み取りをプライマリへ固定する秒数（レプリカの反映遅延対策。APIはCookieで記録する）
+    DB_READ_YOUR_WRITES_SECONDS: float = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "2.0"))
+    
+    # シャーディング（カンマ区切り。指定時はCLIのユーザー操作を各DBに振り分け、新規ユーザーはメールアドレスのハッシュで配置する）
+    # シャードの数・順序を変えると既存のIDと配置が無効になる。APIは対応しておらず、指定時はユーザー操作に503を返す
+    DATABASE_SHARD_URLS: List[str] = _split_urls(os.getenv("DATABASE_SHARD_URLS", ""))
+    
+    # コネクションプール設定（インメモリSQLiteでは使用しない）
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 秒
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # 秒
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+    
+    # SQLite設定（接続ごとにPRAGMAとして適用）
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # バイト
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", "-64000"))  # 負数はKiB単位
+    SQLITE_BUSY_TIMEOUT: int = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))  # ミリ秒
+    
+    # ユーザーキャッシュ設定（プロセス内のLRU + TTL。プロセスごとに保持するため既定では無効）
+    # 他のワーカーでの更新は最大 USER_CACHE_TTL_SECONDS 反映されないため、有効にするのはワーカー1つの場合のみとする
+    USER_CACHE_ENABLED: bool = os.getenv("USER_CACHE_ENABLED", "False").lower() == "true"
+    USER_CACHE_MAXSIZE: int = int(os.getenv("USER_CACHE_MAXSIZE", "10000"))
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+    
+    # メールアドレス存在フィルタ設定（ブルームフィルタ。プロセスごとに保持するため既定では無効）
+    EMAIL_FILTER_ENABLED: bool = os.getenv("EMAIL_FILTER_ENABLED", "False").lower() == "true"
+    EMAIL_FILTER_CAPACITY: int = int(os.getenv("EMAIL_FILTER_CAPACITY", "1000000"))
+    EMAIL_FILTER_FALSE_POSITIVE_RATE: float = float(os.getenv("EMAIL_FILTER_FALSE_POSITIVE_RATE", "0.01"))
+    EMAIL_FILTER_REBUILD_SECONDS: float = float(os.getenv("EMAIL_FILTER_REBUILD_SECONDS", "300"))
     
     # API設定
     API_V1_STR: str = "/api/v1"
@@ -24,6 +90,25 @@ class Settings:
     MAIL_PORT: int = int(os.getenv("MAIL_PORT", "587"))
     MAIL_USERNAME: Optional[str] = os.getenv("MAIL_USERNAME")
     MAIL_PASSWORD: Optional[str] = os.getenv("MAIL_PASSWORD")
+    MAIL_USE_TLS: bool = os.getenv("MAIL_USE_TLS", "True").lower() == "true"  # STARTTLSを使用する
+    MAIL_TIMEOUT_SECONDS: float = float(os.getenv("MAIL_TIMEOUT_SECONDS", "30"))
+    
+    # SMTPコネクションプール設定（認証済みの接続を使い回す）
+    MAIL_POOL_SIZE: int = int(os.getenv("MAIL_POOL_SIZE", "4"))
+    MAIL_POOL_IDLE_SECONDS: float = float(os.getenv("MAIL_POOL_IDLE_SECONDS", "60"))  # 超えた接続は破棄する
+    MAIL_BULK_CONCURRENCY: int = int(os.getenv("MAIL_BULK_CONCURRENCY", "4"))  # 一括送信の同時接続数
+    
+    # アウトボックス設定（ユーザーと同じトランザクションで記録したメールをリレーが配送する）
+    OUTBOX_BATCH_SIZE: int = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))
+    OUTBOX_CONCURRENCY: int = int(os.getenv("OUTBOX_CONCURRENCY", "4"))  # バッチ内の同時配送数
+    # 取得した行を他のリレーに渡さない秒数（配送中はこの1/3ごとに延長するため、リレーが停止した場合にだけ切れる）
+    OUTBOX_LEASE_SECONDS: float = float(os.getenv("OUTBOX_LEASE_SECONDS", "60"))
+    OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+    OUTBOX_BACKOFF_SECONDS: float = float(os.getenv("OUTBOX_BACKOFF_SECONDS", "10"))  # 再送ごとに倍増
+    OUTBOX_POLL_SECONDS: float = float(os.getenv("OUTBOX_POLL_SECONDS", "1.0"))
+    # 配送を諦めた行・配送されないまま残った行を削除するまでの秒数
+    OUTBOX_RETENTION_SECONDS: float = float(os.getenv("OUTBOX_RETENTION_SECONDS", str(7 * 24 * 60 * 60)))
+    OUTBOX_PURGE_INTERVAL_SECONDS: float = float(os.getenv("OUTBOX_PURGE_INTERVAL_SECONDS", "3600"))
     
     # 開発環境設定
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
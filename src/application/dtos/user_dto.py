@@ -1,7 +1,7 @@
 """
 ユーザーDTO
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
@@ -21,8 +21,15 @@ class UserUpdateDTO:
 
 
 @dataclass
+class UserLookupDTO:
+    """ユーザー一括検索用DTO"""
+    ids: list[int] = field(default_factory=list)
+    emails: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
 class UserResponseDTO:
-    """ユーザー応答用DTO"""
+    """ユーザー応答用DTO（一覧・エクスポートで大量に生成するためスロットを使用）"""
     id: int
     email: str
     name: str
@@ -41,10 +48,41 @@ class UserResponseDTO:
         )
 
 
+@dataclass(frozen=True)
+class UserVersionDTO:
+    """ユーザーのバージョン情報DTO（条件付きGETの判定用）"""
+    id: int
+    updated_at: datetime
+
+
 @dataclass
 class UserListResponseDTO:
-    """ユーザー一覧応答用DTO"""
+    """ユーザー一覧応答用DTO
+    
+    カーソル方式で取得した場合は total_count と page を None とし、
+    次ページ取得用のカーソルを next_cursor に設定する
+    """
     users: list[UserResponseDTO]
-    total_count: int
-    page: int
+    total_count: Optional[int]
+    page: Optional[int]
     per_page: int
+    next_cursor: Optional[str] = None
+
+
+@dataclass
+class UserImportErrorDTO:
+    """ユーザー一括インポートのエラー行DTO"""
+    row: int
+    email: str
+    reason: str
+
+
+@dataclass
+class UserImportResultDTO:
+    """ユーザー一括インポート結果DTO"""
+    imported_count: int = 0
+    errors: list[UserImportErrorDTO] = field(default_factory=list)
+    
+    @property
+    def error_count(self) -> int:
+        return len(self.errors)
@@ -0,0 +1,35 @@
+"""
+アウトボックス
+ユーザーの保存と同じトランザクションで副作用（メール送信など）を記録し、コミット後に別プロセス・スレッドで配送する
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+
+# メッセージの種類
+WELCOME_EMAIL = "welcome_email"
+
+
+@dataclass(frozen=True)
+class OutboxMessage:
+    """アウトボックスに記録するメッセージ（payload はJSONに変換できる値のみ）"""
+    kind: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    
+    @classmethod
+    def welcome_email(cls, email: str, name: str) -> "OutboxMessage":
+        """ウェルカムメールの送信依頼"""
+        return cls(WELCOME_EMAIL, {"email": email, "name": name})
+
+
+class Outbox(ABC):
+    """アウトボックス
+    
+    記録したメッセージはユニットオブワークのコミットで確定し、ロールバックで破棄される
+    """
+    
+    @abstractmethod
+    def add(self, message: OutboxMessage) -> None:
+        """メッセージを記録する"""
+        pass
@@ -0,0 +1,3 @@
+"""
+クエリ（参照系の読み取りモデル）
+"""
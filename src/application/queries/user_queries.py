@@ -0,0 +1,169 @@
+"""
+ユーザー参照用の読み取りモデル（CQRSのクエリ側）
+一覧・一括検索などの参照専用の処理で、エンティティを経由せずに応答DTOを返す
+"""
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+from domain.repositories.async_user_repository import AsyncUserRepository
+from domain.repositories.user_repository import UserRepository
+from domain.value_objects.email import Email
+from application.dtos.user_dto import UserResponseDTO, UserVersionDTO
+
+
+class UserQueryService(ABC):
+    """ユーザー参照用の読み取りモデル"""
+    
+    @abstractmethod
+    def list_page(self, offset: int, limit: int) -> List[UserResponseDTO]:
+        """ID順にページ単位でユーザーを取得する"""
+        pass
+    
+    @abstractmethod
+    def list_after(self, after_id: Optional[int], limit: int) -> List[UserResponseDTO]:
+        """指定IDより後ろのユーザーをID順に取得する"""
+        pass
+    
+    @abstractmethod
+    def list_by_domain(self, domain: str, offset: int, limit: int) -> List[UserResponseDTO]:
+        """指定ドメイン（小文字）のユーザーをID順に取得する"""
+        pass
+    
+    @abstractmethod
+    def lookup(self, ids: List[int], emails: List[Email]) -> List[UserResponseDTO]:
+        """IDとメールアドレスの一覧でユーザーをまとめて取得する（重複はIDでまとめる）"""
+        pass
+    
+    @abstractmethod
+    def iter_all(self, batch_size: int = 1000) -> Iterator[UserResponseDTO]:
+        """すべてのユーザーをID順にストリーミング取得する"""
+        pass
+    
+    @abstractmethod
+    def version_by_id(self, user_id: int) -> Optional[UserVersionDTO]:
+        """IDでユーザーのバージョン（更新日時）だけを取得する"""
+        pass
+    
+    @abstractmethod
+    def version_by_email(self, email: Email) -> Optional[UserVersionDTO]:
+        """メールアドレスでユーザーのバージョン（更新日時）だけを取得する"""
+        pass
+
+
+class AsyncUserQueryService(ABC):
+    """非同期ユーザー参照用の読み取りモデル"""
+    
+    @abstractmethod
+    async def list_page(self, offset: int, limit: int) -> List[UserResponseDTO]:
+        """ID順にページ単位でユーザーを取得する"""
+        pass
+    
+    @abstractmethod
+    async def list_after(self, after_id: Optional[int], limit: int) -> List[UserResponseDTO]:
+        """指定IDより後ろのユーザーをID順に取得する"""
+        pass
+    
+    @abstractmethod
+    async def list_by_domain(self, domain: str, offset: int, limit: int) -> List[UserResponseDTO]:
+        """指定ドメイン（小文字）のユーザーをID順に取得する"""
+        pass
+    
+    @abstractmethod
+    async def lookup(self, ids: List[int], emails: List[Email]) -> List[UserResponseDTO]:
+        """IDとメールアドレスの一覧でユーザーをまとめて取得する（重複はIDでまとめる）"""
+        pass
+    
+    @abstractmethod
+    def iter_all(self, batch_size: int = 1000) -> AsyncIterator[UserResponseDTO]:
+        """すべてのユーザーをID順にストリーミング取得する"""
+        pass
+    
+    @abstractmethod
+    async def version_by_id(self, user_id: int) -> Optional[UserVersionDTO]:
+        """IDでユーザーのバージョン（更新日時）だけを取得する"""
+        pass
+    
+    @abstractmethod
+    async def version_by_email(self, email: Email) -> Optional[UserVersionDTO]:
+        """メールアドレスでユーザーのバージョン（更新日時）だけを取得する"""
+        pass
+
+
+class RepositoryUserQueryService(UserQueryService):
+    """リポジトリのエンティティをDTOに変換する読み取りモデル
+    
+    専用の読み取りモデルがない構成（シャーディングなど）で使用する
+    """
+    
+    def __init__(self, repository: UserRepository):
+        self._repository = repository
+    
+    def list_page(self, offset: int, limit: int) -> List[UserResponseDTO]:
+        return [UserResponseDTO.from_domain(user) for user in self._repository.find_page(offset, limit)]
+    
+    def list_after(self, after_id: Optional[int], limit: int) -> List[UserResponseDTO]:
+        return [UserResponseDTO.from_domain(user) for user in self._repository.find_after(after_id, limit)]
+    
+    def list_by_domain(self, domain: str, offset: int, limit: int) -> List[UserResponseDTO]:
+        users = self._repository.find_by_domain(domain, offset, limit)
+        return [UserResponseDTO.from_domain(user) for user in users]
+    
+    def lookup(self, ids: List[int], emails: List[Email]) -> List[UserResponseDTO]:
+        users: Dict[int, UserResponseDTO] = {}
+        if ids:
+            for user in self._repository.find_by_ids(ids):
+                users[user.id] = UserResponseDTO.from_domain(user)
+        if emails:
+            for user in self._repository.find_by_emails(emails):
+                users[user.id] = UserResponseDTO.from_domain(user)
+        return list(users.values())
+    
+    def iter_all(self, batch_size: int = 1000) -> Iterator[UserResponseDTO]:
+        for user in self._repository.iter_all(batch_size):
+            yield UserResponseDTO.from_domain(user)
+    
+    def version_by_id(self, user_id: int) -> Optional[UserVersionDTO]:
+        user = self._repository.find_by_id(user_id)
+        return None if user is None else UserVersionDTO(id=user.id, updated_at=user.updated_at)
+    
+    def version_by_email(self, email: Email) -> Optional[UserVersionDTO]:
+        user = self._repository.find_by_email(email)
+        return None if user is None else UserVersionDTO(id=user.id, updated_at=user.updated_at)
+
+
+class AsyncRepositoryUserQueryService(AsyncUserQueryService):
+    """非同期リポジトリのエンティティをDTOに変換する読み取りモデル"""
+    
+    def __init__(self, repository: AsyncUserRepository):
+        self._repository = repository
+    
+    async def list_page(self, offset: int, limit: int) -> List[UserResponseDTO]:
+        return [UserResponseDTO.from_domain(user) for user in await self._repository.find_page(offset, limit)]
+    
+    async def list_after(self, after_id: Optional[int], limit: int) -> List[UserResponseDTO]:
+        return [UserResponseDTO.from_domain(user) for user in await self._repository.find_after(after_id, limit)]
+    
+    async def list_by_domain(self, domain: str, offset: int, limit: int) -> List[UserResponseDTO]:
+        users = await self._repository.find_by_domain(domain, offset, limit)
+        return [UserResponseDTO.from_domain(user) for user in users]
+    
+    async def lookup(self, ids: List[int], emails: List[Email]) -> List[UserResponseDTO]:
+        users: Dict[int, UserResponseDTO] = {}
+        if ids:
+            for user in await self._repository.find_by_ids(ids):
+                users[user.id] = UserResponseDTO.from_domain(user)
+        if emails:
+            for user in await self._repository.find_by_emails(emails):
+                users[user.id] = UserResponseDTO.from_domain(user)
+        return list(users.values())
+    
+    async def iter_all(self, batch_size: int = 1000) -> AsyncIterator[UserResponseDTO]:
+        async for user in self._repository.iter_all(batch_size):
+            yield UserResponseDTO.from_domain(user)
+    
+    async def version_by_id(self, user_id: int) -> Optional[UserVersionDTO]:
+        user = await self._repository.find_by_id(user_id)
+        return None if user is None else UserVersionDTO(id=user.id, updated_at=user.updated_at)
+    
+    async def version_by_email(self, email: Email) -> Optional[UserVersionDTO]:
+        user = await self._repository.find_by_email(email)
+        return None if user is None else UserVersionDTO(id=user.id, updated_at=user.updated_at)
@@ -0,0 +1,159 @@
+"""
+非同期ユーザーアプリケーションサービス
+非同期APIから利用する（UserAppService と同じ振る舞いを async で提供）
+"""
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from domain.exceptions import UserNotFoundError
+from domain.models.user import User
+from domain.value_objects.email import Email, validate_emails
+from application.dtos.user_dto import (
+    UserCreateDTO,
+    UserUpdateDTO,
+    UserLookupDTO,
+    UserResponseDTO,
+    UserListResponseDTO,
+    UserVersionDTO
+)
+from application.services.pagination import decode_cursor, encode_cursor
+from application.queries.user_queries import AsyncRepositoryUserQueryService, AsyncUserQueryService
+from application.outbox import OutboxMessage
+from application.unit_of_work import AsyncUnitOfWork
+
+
+class AsyncUserAppService:
+    """非同期ユーザーアプリケーションサービス
+    
+    各操作はユニットオブワーク内で実行し、書き込みは操作の最後に1回だけコミットする。
+    参照専用の一覧・一括検索は読み取りモデル（queries）から応答DTOを直接取得する
+    （未指定時はリポジトリのエンティティを変換する）
+    """
+    
+    def __init__(self, uow: AsyncUnitOfWork, queries: Optional[AsyncUserQueryService] = None):
+        self._uow = uow
+        self._user_repository = uow.users
+        self._queries = queries or AsyncRepositoryUserQueryService(uow.users)
+    
+    async def create_user(self, dto: UserCreateDTO) -> UserResponseDTO:
+        """ユーザーを作成する（重複は保存時の一意制約違反で検出する）"""
+        email = Email(dto.email)
+        now = datetime.now()
+        user = User(
+            id=None,
+            email=email,
+            name=dto.name,
+            created_at=now,
+            updated_at=now
+        )
+        async with self._uow:
+            saved_user = await self._user_repository.save(user)
+            # ウェルカムメールは同じトランザクションでアウトボックスに記録し、コミット後にリレーが送信する
+            if self._uow.outbox is not None:
+                self._uow.outbox.add(OutboxMessage.welcome_email(str(saved_user.email), saved_user.name))
+            await self._uow.commit()
+        return UserResponseDTO.from_domain(saved_user)
+    
+    async def get_user_by_id(self, user_id: int) -> Optional[UserResponseDTO]:
+        """IDでユーザーを取得する"""
+        user = await self._user_repository.find_by_id(user_id)
+        if user is None:
+            return None
+        return UserResponseDTO.from_domain(user)
+    
+    async def get_user_version(self, user_id: int) -> Optional[UserVersionDTO]:
+        """IDでユーザーのバージョン（更新日時）を取得する（条件付きGET用）"""
+        return await self._queries.version_by_id(user_id)
+    
+    async def get_user_version_by_email(self, email: str) -> Optional[UserVersionDTO]:
+        """メールアドレスでユーザーのバージョン（更新日時）を取得する（条件付きGET用）"""
+        return await self._queries.version_by_email(Email(email))
+    
+    async def get_user_by_email(self, email: str) -> Optional[UserResponseDTO]:
+        """メールアドレスでユーザーを取得する"""
+        user = await self._user_repository.find_by_email(Email(email))
+        if user is None:
+            return None
+        return UserResponseDTO.from_domain(user)
+    
+    async def lookup_users(self, dto: UserLookupDTO) -> List[UserResponseDTO]:
+        """IDとメールアドレスの一覧でユーザーをまとめて取得する"""
+        validation = validate_emails(dto.emails)
+        if validation.invalid_count:
+            index, reason = validation.invalid_rows()[0]
+            raise ValueError(f"{index + 1}件目のメールアドレス: {reason}")
+        return await self._queries.lookup(dto.ids, validation.valid_emails())
+    
+    async def update_user(self, user_id: int, dto: UserUpdateDTO) -> Optional[UserResponseDTO]:
+        """ユーザーを更新する（メールアドレスの重複は保存時の一意制約違反で検出する）"""
+        async with self._uow:
+            user = await self._user_repository.find_by_id(user_id)
+            if user is None:
+                return None
+            
+            # 変更がなければ書き込まずに返す
+            if dto.name is None and dto.email is None:
+                return UserResponseDTO.from_domain(user)
+            
+            if dto.name is not None:
+                user.change_name(dto.name)
+            if dto.email is not None:
+                user.change_email(Email(dto.email))
+            
+            try:
+                updated_user = await self._user_repository.save(user)
+            except UserNotFoundError:
+                # 取得後に並行して削除された
+                return None
+            await self._uow.commit()
+        return UserResponseDTO.from_domain(updated_user)
+    
+    async def delete_user(self, user_id: int) -> bool:
+        """ユーザーを削除する"""
+        async with self._uow:
+            deleted = await self._user_repository.delete(user_id)
+            if deleted:
+                await self._uow.commit()
+        return deleted
+    
+    async def get_users(self, page: int = 1, per_page: int = 10) -> UserListResponseDTO:
+        """ユーザー一覧を取得する"""
+        offset = (page - 1) * per_page
+        users = await self._queries.list_page(offset, per_page)
+        total_count = await self._user_repository.count()
+        
+        return UserListResponseDTO(
+            users=users,
+            total_count=total_count,
+            page=page,
+            per_page=per_page
+        )
+    
+    async def get_users_after(self, cursor: Optional[str] = None, limit: int = 10) -> UserListResponseDTO:
+        """カーソル方式でユーザー一覧を取得する"""
+        after_id = decode_cursor(cursor) if cursor else None
+        
+        # 次ページの有無を判定するため1件多く取得する
+        users = await self._queries.list_after(after_id, limit + 1)
+        has_next = len(users) > limit
+        users = users[:limit]
+        
+        return UserListResponseDTO(
+            users=users,
+            total_count=None,
+            page=None,
+            per_page=limit,
+            next_cursor=encode_cursor(users[-1].id) if has_next else None
+        )
+    
+    def iter_users(self, batch_size: int = 1000) -> AsyncIterator[UserResponseDTO]:
+        """すべてのユーザーをID順にストリーミング取得する（エクスポート用）"""
+        return self._queries.iter_all(batch_size)
+    
+    async def get_active_users_count(self) -> int:
+        """アクティブなユーザー数を取得する"""
+        return await self._user_repository.count_active()
+    
+    async def get_users_by_domain(self, domain: str, page: int = 1, per_page: int = 100) -> List[UserResponseDTO]:
+        """指定されたドメインのユーザーを取得する"""
+        offset = (page - 1) * per_page
+        return await self._queries.list_by_domain(domain.lower(), offset, per_page)
@@ -0,0 +1,19 @@
+"""
+カーソル方式ページネーションの補助関数
+"""
+import base64
+import binascii
+
+
+def encode_cursor(user_id: int) -> str:
+    """ユーザーIDを不透明なカーソル文字列に変換する"""
+    return base64.urlsafe_b64encode(str(user_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """カーソル文字列からユーザーIDを復元する"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("無効なカーソルです")
@@ -2,32 +2,54 @@
 ユーザーアプリケーションサービス
 複数のユースケースを組み合わせて複雑な処理を実装
 """
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
+from domain.exceptions import DuplicateEmailError, UserNotFoundError
 from domain.models.user import User
-from domain.value_objects.email import Email
-from domain.repositories.user_repository import UserRepository
+from domain.value_objects.email import Email, validate_emails
 from domain.services.user_service import UserService
 from application.dtos.user_dto import (
     UserCreateDTO, 
     UserUpdateDTO, 
+    UserLookupDTO,
     UserResponseDTO,
-    UserListResponseDTO
+    UserListResponseDTO,
+    UserImportResultDTO,
+    UserVersionDTO
 )
 from application.use_cases.create_user import CreateUserUseCase
+from application.use_cases.import_users import ImportUsersUseCase
+from application.unit_of_work import UnitOfWork
+from application.queries.user_queries import RepositoryUserQueryService, UserQueryService
+from application.services.pagination import decode_cursor, encode_cursor
 
 
 class UserAppService:
-    """ユーザーアプリケーションサービス"""
+    """ユーザーアプリケーションサービス
     
-    def __init__(self, user_repository: UserRepository):
-        self._user_repository = user_repository
-        self._user_service = UserService(user_repository)
-        self._create_user_use_case = CreateUserUseCase(user_repository)
+    各操作はユニットオブワーク内で実行し、書き込みは操作の最後に1回だけコミットする。
+    参照専用の一覧・一括検索は読み取りモデル（queries）から応答DTOを直接取得する
+    （未指定時はリポジトリのエンティティを変換する）
+    """
+    
+    def __init__(self, uow: UnitOfWork, queries: Optional[UserQueryService] = None):
+        self._uow = uow
+        self._user_repository = uow.users
+        self._queries = queries or RepositoryUserQueryService(uow.users)
+        self._user_service = UserService(uow.users)
+        self._create_user_use_case = CreateUserUseCase(uow)
     
     def create_user(self, dto: UserCreateDTO) -> UserResponseDTO:
         """ユーザーを作成する"""
         return self._create_user_use_case.execute(dto)
     
+    def import_users(
+        self,
+        rows: Iterable[UserCreateDTO],
+        chunk_size: int = ImportUsersUseCase.DEFAULT_CHUNK_SIZE
+    ) -> UserImportResultDTO:
+        """ユーザーを一括インポートする"""
+        return ImportUsersUseCase(self._uow, chunk_size).execute(rows)
+    
     def get_user_by_id(self, user_id: int) -> Optional[UserResponseDTO]:
         """IDでユーザーを取得する"""
         user = self._user_repository.find_by_id(user_id)
@@ -35,6 +57,14 @@ class UserAppService:
             return None
         return UserResponseDTO.from_domain(user)
     
+    def get_user_version(self, user_id: int) -> Optional[UserVersionDTO]:
+        """IDでユーザーのバージョン（更新日時）を取得する（条件付きGET用）"""
+        return self._queries.version_by_id(user_id)
+    
+    def get_user_version_by_email(self, email: str) -> Optional[UserVersionDTO]:
+        """メールアドレスでユーザーのバージョン（更新日時）を取得する（条件付きGET用）"""
+        return self._queries.version_by_email(Email(email))
+    
     def get_user_by_email(self, email: str) -> Optional[UserResponseDTO]:
         """メールアドレスでユーザーを取得する"""
         email_vo = Email(email)
@@ -43,43 +73,59 @@ class UserAppService:
             return None
         return UserResponseDTO.from_domain(user)
     
+    def lookup_users(self, dto: UserLookupDTO) -> List[UserResponseDTO]:
+        """IDとメールアドレスの一覧でユーザーをまとめて取得する"""
+        validation = validate_emails(dto.emails)
+        if validation.invalid_count:
+            index, reason = validation.invalid_rows()[0]
+            raise ValueError(f"{index + 1}件目のメールアドレス: {reason}")
+        return self._queries.lookup(dto.ids, validation.valid_emails())
+    
     def update_user(self, user_id: int, dto: UserUpdateDTO) -> Optional[UserResponseDTO]:
         """ユーザーを更新する"""
-        user = self._user_repository.find_by_id(user_id)
-        if user is None:
-            return None
-        
-        # 名前の更新
-        if dto.name is not None:
-            user.change_name(dto.name)
-        
-        # メールアドレスの更新
-        if dto.email is not None:
-            new_email = Email(dto.email)
-            if not self._user_service.can_change_email(user, new_email):
-                raise ValueError("このメールアドレスは既に使用されています")
-            user.change_email(new_email)
-        
-        # 保存
-        updated_user = self._user_repository.save(user)
+        with self._uow:
+            user = self._user_repository.find_by_id(user_id)
+            if user is None:
+                return None
+            
+            # 変更がなければ書き込まずに返す
+            if dto.name is None and dto.email is None:
+                return UserResponseDTO.from_domain(user)
+            
+            # 名前の更新
+            if dto.name is not None:
+                user.change_name(dto.name)
+            
+            # メールアドレスの更新
+            if dto.email is not None:
+                new_email = Email(dto.email)
+                if not self._user_service.can_change_email(user, new_email):
+                    raise DuplicateEmailError()
+                user.change_email(new_email)
+            
+            # 保存（取得済みのエンティティをそのまま返し、再読み込みはしない）
+            try:
+                updated_user = self._user_repository.save(user)
+            except UserNotFoundError:
+                # 取得後に並行して削除された
+                return None
+            self._uow.commit()
         return UserResponseDTO.from_domain(updated_user)
     
     def delete_user(self, user_id: int) -> bool:
         """ユーザーを削除する"""
-        return self._user_repository.delete(user_id)
+        with self._uow:
+            deleted = self._user_repository.delete(user_id)
+            if deleted:
+                self._uow.commit()
+        return deleted
     
     def get_users(self, page: int = 1, per_page: int = 10) -> UserListResponseDTO:
         """ユーザー一覧を取得する"""
-        all_users = self._user_repository.find_all()
-        total_count = len(all_users)
-        
-        # ページネーション
-        start_index = (page - 1) * per_page
-        end_index = start_index + per_page
-        paginated_users = all_users[start_index:end_index]
-        
-        # DTOに変換
-        user_dtos = [UserResponseDTO.from_domain(user) for user in paginated_users]
+        # ページネーション（1ページ分のみをDBから取得する）
+        offset = (page - 1) * per_page
+        user_dtos = self._queries.list_page(offset, per_page)
+        total_count = self._user_repository.count()
         
         return UserListResponseDTO(
             users=user_dtos,
@@ -88,11 +134,35 @@ class UserAppService:
             per_page=per_page
         )
     
+    def get_users_after(self, cursor: Optional[str] = None, limit: int = 10) -> UserListResponseDTO:
+        """カーソル方式でユーザー一覧を取得する"""
+        after_id = decode_cursor(cursor) if cursor else None
+        
+        # 次ページの有無を判定するため1件多く取得する
+        users = self._queries.list_after(after_id, limit + 1)
+        has_next = len(users) > limit
+        users = users[:limit]
+        
+        next_cursor = encode_cursor(users[-1].id) if has_next else None
+        
+        return UserListResponseDTO(
+            users=users,
+            total_count=None,
+            page=None,
+            per_page=limit,
+            next_cursor=next_cursor
+        )
+    
+    def iter_users(self, batch_size: int = 1000) -> Iterator[UserResponseDTO]:
+        """すべてのユーザーをID順にストリーミング取得する（エクスポート用）"""
+        return self._queries.iter_all(batch_size)
+    
     def get_active_users_count(self) -> int:
         """アクティブなユーザー数を取得する"""
         return self._user_service.get_active_users_count()
     
-    def get_users_by_domain(self, domain: str) -> List[UserResponseDTO]:
+    def get_users_by_domain(self, domain: str, page: int = 1, per_page: int = 100) -> List[UserResponseDTO]:
         """指定されたドメインのユーザーを取得する"""
-        users = self._user_service.get_users_by_domain(domain)
-        return [UserResponseDTO.from_domain(user) for user in users]
+        offset = (page - 1) * per_page
+        # ドメインは大文字小文字を区別しない
+        return self._queries.list_by_domain(domain.lower(), offset, per_page)
@@ -0,0 +1,46 @@
+"""
+ユーザーエクスポートの出力形式
+APIとCLIで共有する（1ユーザーずつ行に変換し、全件をメモリに保持しない）
+"""
+import csv
+import io
+import json
+from application.dtos.user_dto import UserResponseDTO
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_FIELDS = ("id", "email", "name", "created_at", "updated_at")
+
+
+def _values(dto: UserResponseDTO) -> tuple:
+    return (dto.id, dto.email, dto.name, dto.created_at.isoformat(), dto.updated_at.isoformat())
+
+
+class UserExportFormatter:
+    """ユーザーを指定形式の行に変換する"""
+    
+    def __init__(self, file_format: str):
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"出力形式は {', '.join(EXPORT_FORMATS)} のいずれかを指定してください")
+        self.file_format = file_format
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+    
+    @property
+    def media_type(self) -> str:
+        return "application/x-ndjson" if self.file_format == "ndjson" else "text/csv"
+    
+    def header(self) -> str:
+        """先頭行（CSVのヘッダー。NDJSONは空文字）"""
+        return self._csv_line(EXPORT_FIELDS) if self.file_format == "csv" else ""
+    
+    def format(self, dto: UserResponseDTO) -> str:
+        """1ユーザーを改行付きの1行に変換する"""
+        if self.file_format == "csv":
+            return self._csv_line(_values(dto))
+        return json.dumps(dict(zip(EXPORT_FIELDS, _values(dto))), ensure_ascii=False) + "\n"
+    
+    def _csv_line(self, values) -> str:
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._writer.writerow(values)
+        return self._buffer.getvalue()
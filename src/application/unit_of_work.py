@@ -0,0 +1,63 @@
+"""
+ユニットオブワーク
+複数のリポジトリ操作を1つのトランザクションにまとめ、最後に1回だけコミットする
+"""
+from abc import ABC, abstractmethod
+from typing import Optional
+from domain.repositories.async_user_repository import AsyncUserRepository
+from domain.repositories.user_repository import UserRepository
+from application.outbox import Outbox
+
+
+class UnitOfWork(ABC):
+    """ユニットオブワーク
+    
+    with ブロックを抜ける時点で未コミットの変更は取り消される
+    """
+    
+    users: UserRepository
+    # 同じトランザクションで副作用を記録するアウトボックス（持たない構成ではNone）
+    outbox: Optional[Outbox] = None
+    
+    def __enter__(self) -> "UnitOfWork":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.rollback()
+    
+    @abstractmethod
+    def commit(self) -> None:
+        """変更を確定する"""
+        pass
+    
+    @abstractmethod
+    def rollback(self) -> None:
+        """未確定の変更を取り消す"""
+        pass
+
+
+class AsyncUnitOfWork(ABC):
+    """非同期ユニットオブワーク
+    
+    async with ブロックを抜ける時点で未コミットの変更は取り消される
+    """
+    
+    users: AsyncUserRepository
+    # 同じトランザクションで副作用を記録するアウトボックス（持たない構成ではNone）
+    outbox: Optional[Outbox] = None
+    
+    async def __aenter__(self) -> "AsyncUnitOfWork":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.rollback()
+    
+    @abstractmethod
+    async def commit(self) -> None:
+        """変更を確定する"""
+        pass
+    
+    @abstractmethod
+    async def rollback(self) -> None:
+        """未確定の変更を取り消す"""
+        pass
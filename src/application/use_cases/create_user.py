@@ -5,27 +5,26 @@ from datetime import datetime
 from typing import Optional
 from domain.models.user import User
 from domain.value_objects.email import Email
-from domain.repositories.user_repository import UserRepository
-from domain.services.user_service import UserService
 from application.dtos.user_dto import UserCreateDTO, UserResponseDTO
+from application.outbox import OutboxMessage
+from application.unit_of_work import UnitOfWork
 
 
 class CreateUserUseCase:
     """ユーザー作成ユースケース"""
     
-    def __init__(self, user_repository: UserRepository):
-        self._user_repository = user_repository
-        self._user_service = UserService(user_repository)
+    def __init__(self, uow: UnitOfWork):
+        self._uow = uow
     
     def execute(self, dto: UserCreateDTO) -> UserResponseDTO:
-        """ユーザーを作成する"""
+        """ユーザーを作成する
+        
+        事前の重複チェックは行わず、保存時の一意制約違反で重複を検出する
+        （重複時は DuplicateEmailError を送出）
+        """
         # メールアドレス値オブジェクトを作成
         email = Email(dto.email)
         
-        # メールアドレスの重複チェック
-        if not self._user_service.is_email_available(email):
-            raise ValueError("このメールアドレスは既に使用されています")
-        
         # ユーザーエンティティを作成
         now = datetime.now()
         user = User(
@@ -37,7 +36,12 @@ class CreateUserUseCase:
         )
         
         # ユーザーを保存
-        saved_user = self._user_repository.save(user)
+        with self._uow:
+            saved_user = self._uow.users.save(user)
+            # ウェルカムメールは同じトランザクションでアウトボックスに記録し、コミット後にリレーが送信する
+            if self._uow.outbox is not None:
+                self._uow.outbox.add(OutboxMessage.welcome_email(str(saved_user.email), saved_user.name))
+            self._uow.commit()
         
         # DTOに変換して返す
         return UserResponseDTO.from_domain(saved_user)
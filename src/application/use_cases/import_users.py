@@ -0,0 +1,105 @@
+"""
+ユーザー一括インポートユースケース
+"""
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+from domain.models.user import User
+from domain.value_objects.email import Email, validate_emails
+from application.unit_of_work import UnitOfWork
+from application.dtos.user_dto import (
+    UserCreateDTO,
+    UserImportErrorDTO,
+    UserImportResultDTO
+)
+
+
+class ImportUsersUseCase:
+    """ユーザー一括インポートユースケース
+    
+    入力をチャンク単位で処理し、チャンクごとに
+    重複チェック1クエリ・一括INSERT・コミット1回で保存する
+    """
+    
+    DEFAULT_CHUNK_SIZE = 1000
+    
+    def __init__(self, uow: UnitOfWork, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if chunk_size < 1:
+            raise ValueError("チャンクサイズは1以上である必要があります")
+        self._uow = uow
+        self._chunk_size = chunk_size
+    
+    def execute(self, rows: Iterable[UserCreateDTO]) -> UserImportResultDTO:
+        """ユーザーを一括インポートする"""
+        result = UserImportResultDTO()
+        for chunk in self._chunked(enumerate(rows, start=1)):
+            self._import_chunk(chunk, result)
+        return result
+    
+    def _import_chunk(
+        self,
+        chunk: List[Tuple[int, UserCreateDTO]],
+        result: UserImportResultDTO
+    ) -> None:
+        """1チャンク分のユーザーを検証して保存する"""
+        now = datetime.now()
+        candidates: dict[Email, Tuple[int, User]] = {}
+        
+        # メールアドレスはチャンク単位でまとめて検証する（不正な行ごとに例外を作らない）
+        validation = validate_emails([dto.email for _, dto in chunk])
+        
+        # 入力値の検証（チャンク内の重複もここで除外する）
+        for (row, dto), email_error in zip(chunk, validation.errors):
+            if email_error is not None:
+                result.errors.append(UserImportErrorDTO(row=row, email=dto.email, reason=email_error))
+                continue
+            try:
+                email = Email.trusted(dto.email)
+                user = User(
+                    id=None,
+                    email=email,
+                    name=dto.name,
+                    created_at=now,
+                    updated_at=now
+                )
+            except ValueError as e:
+                result.errors.append(UserImportErrorDTO(row=row, email=dto.email, reason=str(e)))
+                continue
+            
+            if email in candidates:
+                result.errors.append(self._duplicate_error(row, dto.email))
+                continue
+            candidates[email] = (row, user)
+        
+        with self._uow:
+            # 登録済みメールアドレスをまとめて確認
+            existing_emails = self._uow.users.find_existing_emails(list(candidates))
+            new_users = []
+            for email, (row, user) in candidates.items():
+                if email in existing_emails:
+                    result.errors.append(self._duplicate_error(row, str(email)))
+                else:
+                    new_users.append(user)
+            
+            self._uow.users.save_all(new_users)
+            self._uow.commit()
+        result.imported_count += len(new_users)
+    
+    def _chunked(
+        self,
+        rows: Iterator[Tuple[int, UserCreateDTO]]
+    ) -> Iterator[List[Tuple[int, UserCreateDTO]]]:
+        """入力をチャンクサイズごとに分割する"""
+        while True:
+            chunk = list(islice(rows, self._chunk_size))
+            if not chunk:
+                return
+            yield chunk
+    
+    @staticmethod
+    def _duplicate_error(row: int, email: str) -> UserImportErrorDTO:
+        return UserImportErrorDTO(
+            row=row,
+            email=email,
+            reason="このメールアドレスは既に使用されています"
+        )
@@ -0,0 +1,87 @@
+"""
+API層（FastAPIのルート）のベンチマーク
+プロセス内のASGIクライアントで呼び出すため、ネットワークを介さずにルーティング・検証・シリアライズまでを計測する
+"""
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, List
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from application.services.async_user_app_service import AsyncUserAppService
+from application.services.pagination import encode_cursor
+from infrastructure.cache.user_cache import user_cache
+from infrastructure.db.session import AsyncDatabaseSession, get_async_session_factory
+from infrastructure.db.unit_of_work import SqlAlchemyAsyncUnitOfWork
+from infrastructure.repositories.user_query_service_impl import AsyncUserQueryServiceImpl
+from interfaces.api.user_api import get_user_app_service, router as user_router
+from benchmarks.context import BenchmarkContext
+from benchmarks.timing import BenchmarkResult, measure_async
+
+SUITE = "api"
+
+
+def create_app(db: AsyncDatabaseSession) -> FastAPI:
+    """ユーザーAPIだけを登録し、DBとサービスをベンチマーク用に差し替えたアプリケーションを作成する
+    
+    本来のサービスはアウトボックスのリレーやメールアドレス存在フィルタの再構築を
+    設定されたDBに対して起動するため、それらを持たないサービスに差し替える
+    """
+    app = FastAPI()
+    app.include_router(user_router, prefix=settings.API_V1_STR)
+    
+    async def get_benchmark_db() -> AsyncIterator[AsyncSession]:
+        async with db.get_session() as session:
+            yield session
+    
+    def get_benchmark_user_app_service(session: AsyncSession = Depends(get_benchmark_db)) -> AsyncUserAppService:
+        cache = user_cache if settings.USER_CACHE_ENABLED else None
+        return AsyncUserAppService(
+            SqlAlchemyAsyncUnitOfWork(session, user_cache=cache, record_outbox=False),
+            AsyncUserQueryServiceImpl(session)
+        )
+    
+    app.dependency_overrides[get_async_session_factory] = lambda: db.get_session
+    app.dependency_overrides[get_user_app_service] = get_benchmark_user_app_service
+    return app
+
+
+def run(context: BenchmarkContext) -> List[BenchmarkResult]:
+    """主要なルートを計測する（ユーザーキャッシュの有無は Settings に従い、メール送信・フィルタは使わない）"""
+    return asyncio.run(_run(context))
+
+
+async def _run(context: BenchmarkContext) -> List[BenchmarkResult]:
+    db = AsyncDatabaseSession(database_url=context.async_database_url, replica_urls=[])
+    size = context.size
+    prefix = f"{settings.API_V1_STR}/users"
+    ids = context.sample_ids("get_user", context.total_iterations)
+    update_ids = context.sample_ids("update_user", context.total_iterations)
+    domains = context.sample_domains(context.total_iterations)
+    middle_cursor = encode_cursor(size // 2)
+    results = []
+    # 前回の計測のエントリが残らないようにする
+    user_cache.clear()
+    
+    transport = httpx.ASGITransport(app=create_app(db))
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            async def bench(name: str, request: Callable[[int], Awaitable[httpx.Response]]) -> None:
+                async def run_once(i: int) -> None:
+                    response = await request(i)
+                    response.raise_for_status()
+                results.append(await measure_async(SUITE, name, size, run_once, context.iterations, context.warmup))
+            
+            await bench("create_user", lambda i: client.post(
+                f"{prefix}/", json={"email": f"bench-api-{i}@bench.example.com", "name": "ベンチマーク"}
+            ))
+            await bench("update_user", lambda i: client.put(f"{prefix}/{update_ids[i]}", json={"name": f"更新{i}"}))
+            await bench("get_user", lambda i: client.get(f"{prefix}/{ids[i]}"))
+            await bench("get_users_first_page", lambda i: client.get(f"{prefix}/", params={"page": 1, "per_page": 20}))
+            await bench("get_users_after_middle", lambda i: client.get(
+                f"{prefix}/", params={"after": middle_cursor, "limit": 20}
+            ))
+            await bench("get_users_by_domain", lambda i: client.get(f"{prefix}/domain/{domains[i]}"))
+    finally:
+        await db.engine.dispose()
+    return results
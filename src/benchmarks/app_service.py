@@ -0,0 +1,49 @@
+"""
+アプリケーション層（UserAppService）のベンチマーク
+"""
+from typing import Callable, List
+from application.dtos.user_dto import UserCreateDTO, UserUpdateDTO
+from application.services.pagination import encode_cursor
+from application.services.user_app_service import UserAppService
+from infrastructure.db.session import DatabaseSession
+from infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+from infrastructure.repositories.user_query_service_impl import UserQueryServiceImpl
+from benchmarks.context import BenchmarkContext
+from benchmarks.timing import BenchmarkResult, measure
+
+SUITE = "app_service"
+
+
+def run(context: BenchmarkContext) -> List[BenchmarkResult]:
+    """アプリケーションサービスの主要な処理を計測する（APIと同じく処理ごとにセッションを開く）"""
+    db = DatabaseSession(database_url=context.database_url, replica_urls=[])
+    size = context.size
+    per_page = 20
+    update_ids = context.sample_ids("update_user", context.total_iterations)
+    domains = context.sample_domains(context.total_iterations)
+    middle_cursor = encode_cursor(size // 2)
+    results = []
+    
+    def bench(name: str, operation: Callable[[UserAppService, int], object]) -> None:
+        def run_once(i: int) -> None:
+            session = db.get_session()
+            try:
+                operation(UserAppService(SqlAlchemyUnitOfWork(session), UserQueryServiceImpl(session)), i)
+            finally:
+                session.close()
+        results.append(measure(SUITE, name, size, run_once, context.iterations, context.warmup))
+    
+    try:
+        bench("create_user", lambda service, i: service.create_user(
+            UserCreateDTO(email=f"bench-create-{i}@bench.example.com", name="ベンチマーク")
+        ))
+        bench("update_user", lambda service, i: service.update_user(
+            update_ids[i], UserUpdateDTO(name=f"更新{i}")
+        ))
+        bench("get_users_first_page", lambda service, i: service.get_users(1, per_page))
+        bench("get_users_middle_page", lambda service, i: service.get_users(size // 2 // per_page, per_page))
+        bench("get_users_after_middle", lambda service, i: service.get_users_after(middle_cursor, per_page))
+        bench("get_users_by_domain", lambda service, i: service.get_users_by_domain(domains[i], 1, 100))
+    finally:
+        db.engine.dispose()
+    return results
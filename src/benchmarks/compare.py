@@ -0,0 +1,78 @@
+"""
+ベンチマーク結果の比較
+2つのコミットの結果（benchmarks.run の出力）を比べ、しきい値を超えて遅くなった操作を報告する
+
+    python -m benchmarks.compare base.json head.json --threshold 0.1
+"""
+import json
+from dataclasses import dataclass
+from typing import List, Optional, TextIO
+import click
+
+METRICS = ("median_ms", "mean_ms", "p95_ms", "min_ms")
+
+
+@dataclass
+class Comparison:
+    """1つの操作の比較結果（ratio は head / base）"""
+    suite: str
+    name: str
+    size: int
+    base: Optional[float]
+    head: Optional[float]
+    
+    @property
+    def ratio(self) -> Optional[float]:
+        if self.base is None or self.head is None or self.base == 0:
+            return None
+        return self.head / self.base
+    
+    def is_regression(self, threshold: float) -> bool:
+        return self.ratio is not None and self.ratio > 1 + threshold
+
+
+def compare_results(base: dict, head: dict, metric: str = "median_ms") -> List[Comparison]:
+    """同じ（スイート, 操作, 件数）の結果どうしを比較する（片方にしかない操作も含める）"""
+    base_values = {_key(result): result[metric] for result in base["results"]}
+    head_values = {_key(result): result[metric] for result in head["results"]}
+    keys = list(base_values) + [key for key in head_values if key not in base_values]
+    return [
+        Comparison(suite, name, size, base_values.get((suite, name, size)), head_values.get((suite, name, size)))
+        for suite, name, size in keys
+    ]
+
+
+def _key(result: dict) -> tuple:
+    return (result["suite"], result["name"], result["size"])
+
+
+def _format(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.3f}"
+
+
+@click.command()
+@click.argument('base', type=click.File('r', encoding='utf-8'))
+@click.argument('head', type=click.File('r', encoding='utf-8'))
+@click.option('--metric', type=click.Choice(METRICS), default='median_ms', show_default=True, help='比較する指標')
+@click.option('--threshold', type=float, default=0.1, show_default=True, help='遅くなったと判定する割合（0.1 = 10%）')
+def main(base: TextIO, head: TextIO, metric: str, threshold: float):
+    """2つのベンチマーク結果を比較する（遅くなった操作があれば終了コード1）"""
+    comparisons = compare_results(json.load(base), json.load(head), metric)
+    regressions = [comparison for comparison in comparisons if comparison.is_regression(threshold)]
+    
+    click.echo(f"{'suite':12s} {'name':28s} {'size':>8s} {'base':>10s} {'head':>10s} {'ratio':>7s}")
+    for comparison in comparisons:
+        ratio = "-" if comparison.ratio is None else f"{comparison.ratio:.2f}x"
+        mark = " !" if comparison in regressions else ""
+        click.echo(
+            f"{comparison.suite:12s} {comparison.name:28s} {comparison.size:8d} "
+            f"{_format(comparison.base):>10s} {_format(comparison.head):>10s} {ratio:>7s}{mark}"
+        )
+    
+    if regressions:
+        click.echo(f"{len(regressions)}件の操作が{threshold:.0%}を超えて遅くなりました（{metric}）", err=True)
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+各スイートで共有する計測条件と入力データ
+"""
+import random
+from dataclasses import dataclass
+from typing import Dict, List
+from sqlalchemy import create_engine, select
+from infrastructure.db.models import UserModel
+from infrastructure.repositories.user_model_mapper import IN_CLAUSE_CHUNK_SIZE, chunks
+from benchmarks.dataset import DOMAINS
+
+
+@dataclass
+class BenchmarkContext:
+    """計測条件（database_url はシード済みデータベースの作業用コピー）"""
+    database_url: str
+    size: int
+    seed: int = 42
+    iterations: int = 200
+    warmup: int = 10
+    
+    @property
+    def async_database_url(self) -> str:
+        return self.database_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    
+    @property
+    def total_iterations(self) -> int:
+        return self.iterations + self.warmup
+    
+    def batch_iterations(self, divisor: int = 20) -> int:
+        """1回あたりの処理量が多い操作の計測回数"""
+        return max(1, self.iterations // divisor)
+    
+    def rng(self, name: str) -> random.Random:
+        """操作ごとに独立した乱数（他の操作の有無で入力が変わらないようにする）"""
+        return random.Random(f"{self.seed}:{name}")
+    
+    def sample_ids(self, name: str, count: int) -> List[int]:
+        """既存ユーザーのIDを無作為に選ぶ（IDは1から連番）"""
+        rng = self.rng(name)
+        return [rng.randint(1, self.size) for _ in range(count)]
+    
+    def sample_domains(self, count: int) -> List[str]:
+        """データセットのドメインを順に選ぶ"""
+        domains = [domain for domain, _ in DOMAINS]
+        return [domains[i % len(domains)] for i in range(count)]
+    
+    def load_emails(self, user_ids: List[int]) -> List[str]:
+        """IDに対応するメールアドレスを同じ順序で取得する"""
+        engine = create_engine(self.database_url)
+        try:
+            emails: Dict[int, str] = {}
+            with engine.connect() as connection:
+                for chunk in chunks(sorted(set(user_ids)), IN_CLAUSE_CHUNK_SIZE):
+                    rows = connection.execute(
+                        select(UserModel.id, UserModel.email).where(UserModel.id.in_(chunk))
+                    )
+                    emails.update((user_id, email) for user_id, email in rows)
+            return [emails[user_id] for user_id in user_ids]
+        finally:
+            engine.dispose()
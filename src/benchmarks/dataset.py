@@ -0,0 +1,111 @@
+"""
+ベンチマーク用データセットの生成
+シードを固定して同じ件数・同じ内容のユーザーを再現する
+"""
+import random
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List
+from sqlalchemy import create_engine, func, insert, select
+from infrastructure.db.models import UserModel, create_tables
+
+# 件数のプリセット
+DATASET_SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# メールアドレスのドメインと出現比率（一部のドメインに偏らせる）
+DOMAINS = [
+    ("example.com", 40),
+    ("example.org", 20),
+    ("example.net", 15),
+    ("mail.example.jp", 10),
+    ("corp.example.co.jp", 10),
+    ("rare.example.com", 5),
+]
+
+# 基準日時（実行日時によらず同じデータにするため固定）
+BASE_TIME = datetime(2024, 1, 1)
+
+
+def parse_size(value: str) -> int:
+    """件数の指定（10k / 100k / 1m または整数）を件数に変換する"""
+    key = value.strip().lower()
+    if key in DATASET_SIZES:
+        return DATASET_SIZES[key]
+    count = int(key)
+    if count < 1:
+        raise ValueError("件数は1以上である必要があります")
+    return count
+
+
+def generate_users(count: int, seed: int = 42) -> Iterator[dict]:
+    """users テーブルに挿入する行を生成する（IDは1から連番で採番される想定）"""
+    rng = random.Random(seed)
+    domains = [domain for domain, _ in DOMAINS]
+    weights = [weight for _, weight in DOMAINS]
+    for i in range(count):
+        domain = rng.choices(domains, weights)[0]
+        created_at = BASE_TIME + timedelta(seconds=i * 30 + rng.randrange(30))
+        updated_at = created_at + timedelta(days=rng.randrange(30))
+        yield {
+            "email": f"user{i:07d}.{rng.randrange(16 ** 6):06x}@{domain}",
+            "email_domain": domain,
+            "name": f"ユーザー{i}",
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+
+def seed_database(database_url: str, count: int, seed: int = 42, batch_size: int = 10_000) -> None:
+    """空のデータベースにテーブルを作成してユーザーを挿入する（executemanyでバッチ単位にINSERT）"""
+    engine = create_engine(database_url)
+    try:
+        create_tables(engine)
+        batch: List[dict] = []
+        for row in generate_users(count, seed):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                _insert(engine, batch)
+                batch = []
+        _insert(engine, batch)
+    finally:
+        engine.dispose()
+
+
+def prepare_database(data_dir: Path, work_path: Path, count: int, seed: int = 42) -> str:
+    """シード済みのデータベースを作業用にコピーしてURLを返す
+    
+    生成したデータベースは data_dir に件数・シードごとに保存し、次回以降は再利用する。
+    書き込みを伴う計測でも元のデータを変えないよう、計測には毎回コピーを使う
+    """
+    data_dir.mkdir(parents=True, exist_ok=True)
+    seeded_path = data_dir / f"users_{count}_{seed}.db"
+    if not _is_seeded(seeded_path, count):
+        partial_path = seeded_path.with_suffix(".partial")
+        partial_path.unlink(missing_ok=True)
+        seed_database(f"sqlite:///{partial_path}", count, seed)
+        partial_path.replace(seeded_path)
+    
+    work_path.unlink(missing_ok=True)
+    shutil.copyfile(seeded_path, work_path)
+    return f"sqlite:///{work_path}"
+
+
+def _insert(engine, rows: List[dict]) -> None:
+    if rows:
+        with engine.begin() as connection:
+            connection.execute(insert(UserModel), rows)
+
+
+def _is_seeded(path: Path, count: int) -> bool:
+    """生成済みで件数が一致するかどうか"""
+    if not path.exists():
+        return False
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        with engine.connect() as connection:
+            if not engine.dialect.has_table(connection, UserModel.__tablename__):
+                return False
+            return connection.execute(select(func.count(UserModel.id))).scalar_one() == count
+    finally:
+        engine.dispose()
@@ -0,0 +1,96 @@
+"""
+リポジトリ層（UserRepositoryImpl）のベンチマーク
+"""
+from datetime import datetime
+from itertools import islice
+from typing import Callable, List
+from domain.models.user import User
+from domain.value_objects.email import Email
+from infrastructure.db.session import DatabaseSession
+from infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+from infrastructure.repositories.user_repository_impl import UserRepositoryImpl
+from benchmarks.context import BenchmarkContext
+from benchmarks.timing import BenchmarkResult, measure
+
+SUITE = "repository"
+
+
+def run(context: BenchmarkContext) -> List[BenchmarkResult]:
+    """リポジトリの各操作を計測する（操作ごとにセッションを開き、書き込みはコミットまで含める）"""
+    db = DatabaseSession(database_url=context.database_url, replica_urls=[])
+    size = context.size
+    ids = context.sample_ids("find_by_id", context.total_iterations)
+    emails = context.load_emails(context.sample_ids("find_by_email", context.total_iterations))
+    id_batches = [context.sample_ids(f"find_by_ids:{i}", 100) for i in range(context.total_iterations)]
+    domains = context.sample_domains(context.total_iterations)
+    update_ids = context.sample_ids("save_update", context.total_iterations)
+    update_emails = context.load_emails(update_ids)
+    inserted_ids: List[int] = []
+    results = []
+    
+    def read(name: str, operation: Callable[[UserRepositoryImpl, int], object], iterations: int = 0) -> None:
+        def run_once(i: int) -> None:
+            session = db.get_session()
+            try:
+                operation(UserRepositoryImpl(session), i)
+            finally:
+                session.close()
+        results.append(measure(SUITE, name, size, run_once, iterations or context.iterations, context.warmup))
+    
+    def write(name: str, operation: Callable[[SqlAlchemyUnitOfWork, int], object], iterations: int = 0) -> None:
+        def run_once(i: int) -> None:
+            session = db.get_session()
+            try:
+                with SqlAlchemyUnitOfWork(session) as uow:
+                    operation(uow, i)
+                    uow.commit()
+            finally:
+                session.close()
+        results.append(measure(SUITE, name, size, run_once, iterations or context.iterations, context.warmup))
+    
+    def insert(uow: SqlAlchemyUnitOfWork, i: int) -> None:
+        inserted_ids.append(uow.users.save(_new_user(f"bench-insert-{i}@bench.example.com")).id)
+    
+    def update(uow: SqlAlchemyUnitOfWork, i: int) -> None:
+        now = datetime.now()
+        uow.users.save(User.reconstruct(
+            id=update_ids[i],
+            email=Email.trusted(update_emails[i]),
+            name=f"更新{i}",
+            created_at=now,
+            updated_at=now
+        ))
+    
+    try:
+        read("find_by_id", lambda repository, i: repository.find_by_id(ids[i]))
+        read("find_by_email", lambda repository, i: repository.find_by_email(Email.trusted(emails[i])))
+        read("find_by_ids_100", lambda repository, i: repository.find_by_ids(id_batches[i]))
+        read("find_page_first", lambda repository, i: repository.find_page(0, 20))
+        read("find_page_middle", lambda repository, i: repository.find_page(size // 2, 20))
+        read("find_after_middle", lambda repository, i: repository.find_after(size // 2, 20))
+        read("find_by_domain", lambda repository, i: repository.find_by_domain(domains[i], 0, 100))
+        read("count", lambda repository, i: repository.count())
+        read("count_active", lambda repository, i: repository.count_active())
+        read(
+            "iter_all_10k",
+            lambda repository, i: sum(1 for _ in islice(repository.iter_all(1000), 10_000)),
+            context.batch_iterations()
+        )
+        write("save_insert", insert)
+        write("save_update", update)
+        write("delete", lambda uow, i: uow.users.delete(inserted_ids[i]), len(inserted_ids) - context.warmup)
+        write(
+            "save_all_1000",
+            lambda uow, i: uow.users.save_all([
+                _new_user(f"bench-bulk-{i}-{j}@bench.example.com") for j in range(1000)
+            ]),
+            context.batch_iterations()
+        )
+    finally:
+        db.engine.dispose()
+    return results
+
+
+def _new_user(email: str) -> User:
+    now = datetime.now()
+    return User(id=None, email=Email(email), name="ベンチマーク", created_at=now, updated_at=now)
@@ -0,0 +1,108 @@
+"""
+ベンチマークの実行
+結果はコミット間で比較できるようJSONで出力する（比較は benchmarks.compare）
+
+    python -m benchmarks.run --size 10k --size 100k -o results.json
+"""
+import json
+import platform
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, TextIO, Tuple
+import click
+import sqlalchemy
+from benchmarks import api, app_service, repository
+from benchmarks.context import BenchmarkContext
+from benchmarks.dataset import DATASET_SIZES, parse_size, prepare_database
+from benchmarks.timing import BenchmarkResult
+
+SUITES = {
+    repository.SUITE: repository.run,
+    app_service.SUITE: app_service.run,
+    api.SUITE: api.run,
+}
+
+
+def run_benchmarks(
+    sizes: List[int],
+    suites: List[str],
+    data_dir: Path,
+    seed: int = 42,
+    iterations: int = 200,
+    warmup: int = 10
+) -> List[BenchmarkResult]:
+    """件数ごと・スイートごとにシード済みデータベースのコピーを用意して計測する"""
+    results = []
+    with tempfile.TemporaryDirectory(prefix="benchmark-") as work_dir:
+        for size in sizes:
+            for suite in suites:
+                click.echo(f"計測中: {suite} ({size}件)", err=True)
+                database_url = prepare_database(data_dir, Path(work_dir) / f"{suite}_{size}.db", size, seed)
+                context = BenchmarkContext(database_url, size, seed, iterations, warmup)
+                results.extend(SUITES[suite](context))
+    return results
+
+
+def to_document(results: List[BenchmarkResult], seed: int, iterations: int, warmup: int) -> dict:
+    """計測結果を実行環境の情報とともにJSON用の辞書にする"""
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "seed": seed,
+            "iterations": iterations,
+            "warmup": warmup,
+        },
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@click.command()
+@click.option('--size', 'sizes', multiple=True, default=['10k'], show_default=True,
+              help=f"件数（{' / '.join(DATASET_SIZES)} または整数。複数指定可）")
+@click.option('--suite', 'suites', multiple=True, type=click.Choice(list(SUITES)),
+              help='計測するスイート（省略時はすべて。複数指定可）')
+@click.option('--iterations', type=int, default=200, show_default=True, help='操作ごとの計測回数')
+@click.option('--warmup', type=int, default=10, show_default=True, help='計測前に実行する回数')
+@click.option('--seed', type=int, default=42, show_default=True, help='データセット生成のシード')
+@click.option('--data-dir', type=click.Path(file_okay=False, path_type=Path), default=Path('.benchmarks'),
+              show_default=True, help='シード済みデータベースの保存先（次回以降は再利用する）')
+@click.option('--output', '-o', type=click.File('w', encoding='utf-8'), default='-', help='出力先ファイル（省略時は標準出力）')
+def main(
+    sizes: Tuple[str, ...],
+    suites: Tuple[str, ...],
+    iterations: int,
+    warmup: int,
+    seed: int,
+    data_dir: Path,
+    output: TextIO
+):
+    """リポジトリ・アプリケーションサービス・APIの各層を計測してJSONで出力する"""
+    if iterations < 1 or warmup < 0:
+        raise click.BadParameter("計測回数は1以上、ウォームアップは0以上である必要があります")
+    try:
+        parsed_sizes = [parse_size(size) for size in sizes]
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--size')
+    
+    results = run_benchmarks(parsed_sizes, list(suites or SUITES), data_dir, seed, iterations, warmup)
+    json.dump(to_document(results, seed, iterations, warmup), output, ensure_ascii=False, indent=2)
+    output.write("\n")
+
+
+if __name__ == '__main__':
+    main()
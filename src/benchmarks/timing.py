@@ -0,0 +1,86 @@
+"""
+計測と結果の集計
+"""
+import statistics
+import time
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable, List
+
+
+@dataclass
+class BenchmarkResult:
+    """1つの操作の計測結果（時間はミリ秒）"""
+    suite: str
+    name: str
+    size: int
+    iterations: int
+    mean_ms: float
+    median_ms: float
+    p95_ms: float
+    min_ms: float
+    max_ms: float
+    ops_per_sec: float
+    
+    @property
+    def key(self) -> tuple:
+        """コミット間の比較に使うキー"""
+        return (self.suite, self.name, self.size)
+    
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def summarize(suite: str, name: str, size: int, samples: List[float]) -> BenchmarkResult:
+    """計測した秒数の一覧を集計する"""
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return BenchmarkResult(
+        suite=suite,
+        name=name,
+        size=size,
+        iterations=len(ordered),
+        mean_ms=total / len(ordered) * 1000,
+        median_ms=statistics.median(ordered) * 1000,
+        p95_ms=ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        min_ms=ordered[0] * 1000,
+        max_ms=ordered[-1] * 1000,
+        ops_per_sec=len(ordered) / total if total > 0 else 0.0
+    )
+
+
+def measure(
+    suite: str,
+    name: str,
+    size: int,
+    operation: Callable[[int], object],
+    iterations: int,
+    warmup: int = 0
+) -> BenchmarkResult:
+    """operation(i) を繰り返し実行して計測する（i は 0 から始まる試行番号。ウォームアップは計測しない）"""
+    for i in range(warmup):
+        operation(i)
+    samples = []
+    for i in range(warmup, warmup + iterations):
+        started = time.perf_counter()
+        operation(i)
+        samples.append(time.perf_counter() - started)
+    return summarize(suite, name, size, samples)
+
+
+async def measure_async(
+    suite: str,
+    name: str,
+    size: int,
+    operation: Callable[[int], Awaitable[object]],
+    iterations: int,
+    warmup: int = 0
+) -> BenchmarkResult:
+    """非同期の operation(i) を繰り返し実行して計測する"""
+    for i in range(warmup):
+        await operation(i)
+    samples = []
+    for i in range(warmup, warmup + iterations):
+        started = time.perf_counter()
+        await operation(i)
+        samples.append(time.perf_counter() - started)
+    return summarize(suite, name, size, samples)
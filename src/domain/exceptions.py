@@ -0,0 +1,17 @@
+"""
+ドメイン例外
+"""
+
+
+class DuplicateEmailError(ValueError):
+    """メールアドレスが既に使用されている場合の例外"""
+    
+    def __init__(self, message: str = "このメールアドレスは既に使用されています"):
+        super().__init__(message)
+
+
+class UserNotFoundError(LookupError):
+    """更新対象のユーザーが存在しない場合の例外（並行して削除された場合など）"""
+    
+    def __init__(self, message: str = "ユーザーが見つかりません"):
+        super().__init__(message)
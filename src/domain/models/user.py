@@ -7,7 +7,7 @@ from dataclasses import dataclass
 from domain.value_objects.email import Email
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """ユーザーエンティティ"""
     
@@ -25,6 +25,24 @@ class User:
         if len(self.name) > 100:
             raise ValueError("ユーザー名は100文字以内で入力してください")
     
+    @classmethod
+    def reconstruct(
+        cls,
+        id: int,
+        email: Email,
+        name: str,
+        created_at: datetime,
+        updated_at: datetime
+    ) -> "User":
+        """永続化済みの値からバリデーションを省略して復元する（保存時に検証済みのため）"""
+        user = object.__new__(cls)
+        user.id = id
+        user.email = email
+        user.name = name
+        user.created_at = created_at
+        user.updated_at = updated_at
+        return user
+    
     def change_name(self, new_name: str) -> None:
         """ユーザー名を変更する"""
         if not new_name or len(new_name.strip()) == 0:
@@ -44,4 +62,5 @@ class User:
     def is_active(self) -> bool:
         """ユーザーがアクティブかどうかを判定する"""
         # ビジネスルールに基づく判定ロジック
+        # 集計はリポジトリ側でSQL化しているため、変更時は UserRepository.count_active の実装も合わせる
         return True
@@ -0,0 +1,79 @@
+"""
+非同期ユーザーリポジトリインターフェース
+"""
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, List, Optional
+from domain.models.user import User
+from domain.value_objects.email import Email
+
+
+class AsyncUserRepository(ABC):
+    """非同期ユーザーリポジトリインターフェース"""
+    
+    @abstractmethod
+    async def save(self, user: User) -> User:
+        """ユーザーを保存する
+        
+        更新対象の行が存在しない場合は UserNotFoundError を送出する
+        """
+        pass
+    
+    @abstractmethod
+    async def find_by_id(self, user_id: int) -> Optional[User]:
+        """IDでユーザーを検索する"""
+        pass
+    
+    @abstractmethod
+    async def find_by_email(self, email: Email) -> Optional[User]:
+        """メールアドレスでユーザーを検索する"""
+        pass
+    
+    @abstractmethod
+    async def find_by_ids(self, user_ids: List[int]) -> List[User]:
+        """複数のIDでユーザーをまとめて検索する"""
+        pass
+    
+    @abstractmethod
+    async def find_by_emails(self, emails: List[Email]) -> List[User]:
+        """複数のメールアドレスでユーザーをまとめて検索する"""
+        pass
+    
+    @abstractmethod
+    def iter_all(self, batch_size: int = 1000) -> AsyncIterator[User]:
+        """すべてのユーザーをID順にストリーミング取得する（メモリ使用量はバッチサイズに比例）"""
+        pass
+    
+    @abstractmethod
+    async def find_by_domain(self, domain: str, offset: int = 0, limit: Optional[int] = None) -> List[User]:
+        """指定ドメインのユーザーをID順に取得する"""
+        pass
+    
+    @abstractmethod
+    async def find_page(self, offset: int, limit: int) -> List[User]:
+        """ID順にページ単位でユーザーを取得する"""
+        pass
+    
+    @abstractmethod
+    async def find_after(self, after_id: Optional[int], limit: int) -> List[User]:
+        """指定IDより後ろのユーザーをID順に取得する（キーセットページネーション）"""
+        pass
+    
+    @abstractmethod
+    async def count(self) -> int:
+        """ユーザーの総数を取得する"""
+        pass
+    
+    @abstractmethod
+    async def count_active(self) -> int:
+        """アクティブなユーザー数を取得する（User.is_active と同じ判定条件）"""
+        pass
+    
+    @abstractmethod
+    async def delete(self, user_id: int) -> bool:
+        """ユーザーを削除する"""
+        pass
+    
+    @abstractmethod
+    async def exists_by_email(self, email: Email) -> bool:
+        """メールアドレスが存在するかチェックする"""
+        pass
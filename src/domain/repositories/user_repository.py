@@ -2,7 +2,7 @@
 ユーザーリポジトリインターフェース
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterator, List, Optional, Set
 from domain.models.user import User
 from domain.value_objects.email import Email
 
@@ -12,7 +12,15 @@ class UserRepository(ABC):
     
     @abstractmethod
     def save(self, user: User) -> User:
-        """ユーザーを保存する"""
+        """ユーザーを保存する
+        
+        更新対象の行が存在しない場合は UserNotFoundError を送出する
+        """
+        pass
+    
+    @abstractmethod
+    def save_all(self, users: List[User]) -> None:
+        """新規ユーザーを一括保存する"""
         pass
     
     @abstractmethod
@@ -25,11 +33,51 @@ class UserRepository(ABC):
         """メールアドレスでユーザーを検索する"""
         pass
     
+    @abstractmethod
+    def find_by_ids(self, user_ids: List[int]) -> List[User]:
+        """複数のIDでユーザーをまとめて検索する"""
+        pass
+    
+    @abstractmethod
+    def find_by_emails(self, emails: List[Email]) -> List[User]:
+        """複数のメールアドレスでユーザーをまとめて検索する"""
+        pass
+    
     @abstractmethod
     def find_all(self) -> List[User]:
         """すべてのユーザーを取得する"""
         pass
     
+    @abstractmethod
+    def iter_all(self, batch_size: int = 1000) -> Iterator[User]:
+        """すべてのユーザーをID順にストリーミング取得する（メモリ使用量はバッチサイズに比例）"""
+        pass
+    
+    @abstractmethod
+    def find_by_domain(self, domain: str, offset: int = 0, limit: Optional[int] = None) -> List[User]:
+        """指定ドメインのユーザーをID順に取得する"""
+        pass
+    
+    @abstractmethod
+    def find_page(self, offset: int, limit: int) -> List[User]:
+        """ID順にページ単位でユーザーを取得する"""
+        pass
+    
+    @abstractmethod
+    def find_after(self, after_id: Optional[int], limit: int) -> List[User]:
+        """指定IDより後ろのユーザーをID順に取得する（キーセットページネーション）"""
+        pass
+    
+    @abstractmethod
+    def count(self) -> int:
+        """ユーザーの総数を取得する"""
+        pass
+    
+    @abstractmethod
+    def count_active(self) -> int:
+        """アクティブなユーザー数を取得する（User.is_active と同じ判定条件）"""
+        pass
+    
     @abstractmethod
     def delete(self, user_id: int) -> bool:
         """ユーザーを削除する"""
@@ -39,3 +87,8 @@ class UserRepository(ABC):
     def exists_by_email(self, email: Email) -> bool:
         """メールアドレスが存在するかチェックする"""
         pass
+    
+    @abstractmethod
+    def find_existing_emails(self, emails: List[Email]) -> Set[Email]:
+        """指定されたメールアドレスのうち既に登録済みのものを取得する"""
+        pass
@@ -2,7 +2,7 @@
 ユーザードメインサービス
 複雑なビジネスルールを実装
 """
-from typing import List
+from typing import List, Optional
 from domain.models.user import User
 from domain.value_objects.email import Email
 from domain.repositories.user_repository import UserRepository
@@ -30,14 +30,9 @@ class UserService:
     
     def get_active_users_count(self) -> int:
         """アクティブなユーザー数を取得する"""
-        all_users = self._user_repository.find_all()
-        active_users = [user for user in all_users if user.is_active()]
-        return len(active_users)
+        return self._user_repository.count_active()
     
-    def get_users_by_domain(self, domain: str) -> List[User]:
+    def get_users_by_domain(self, domain: str, offset: int = 0, limit: Optional[int] = None) -> List[User]:
         """指定されたドメインのユーザーを取得する"""
-        all_users = self._user_repository.find_all()
-        return [
-            user for user in all_users 
-            if user.email.value.endswith(f"@{domain}")
-        ]
+        # ドメインは大文字小文字を区別しない
+        return self._user_repository.find_by_domain(domain.lower(), offset, limit)
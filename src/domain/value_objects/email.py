@@ -3,9 +3,28 @@
 """
 import re
 from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
 
+# 基本的なメールアドレス形式（インスタンス生成のたびにコンパイルしないようモジュールで保持）
+_EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
-@dataclass(frozen=True)
+_REQUIRED_ERROR = "メールアドレスは必須です"
+_FORMAT_ERROR = "有効なメールアドレス形式ではありません"
+_LENGTH_ERROR = "メールアドレスは254文字以内で入力してください"
+
+
+def _validation_error(value: str) -> Optional[str]:
+    """バリデーションエラーの理由を返す（正しい場合はNone）"""
+    if not value:
+        return _REQUIRED_ERROR
+    if not _EMAIL_PATTERN.match(value):
+        return _FORMAT_ERROR
+    if len(value) > 254:
+        return _LENGTH_ERROR
+    return None
+
+
+@dataclass(frozen=True, slots=True)
 class Email:
     """メールアドレス値オブジェクト"""
     
@@ -13,16 +32,21 @@ class Email:
     
     def __post_init__(self):
         """バリデーション"""
-        if not self.value:
-            raise ValueError("メールアドレスは必須です")
-        
-        # 基本的なメールアドレス形式チェック
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, self.value):
-            raise ValueError("有効なメールアドレス形式ではありません")
-        
-        if len(self.value) > 254:
-            raise ValueError("メールアドレスは254文字以内で入力してください")
+        error = _validation_error(self.value)
+        if error is not None:
+            raise ValueError(error)
+    
+    @classmethod
+    def trusted(cls, value: str) -> "Email":
+        """検証済みの値（保存時に検証したDBの値など）からバリデーションを省略して生成する"""
+        email = object.__new__(cls)
+        object.__setattr__(email, "value", value)
+        return email
+    
+    @property
+    def domain(self) -> str:
+        """ドメイン部分（小文字に正規化）"""
+        return self.value.rsplit("@", 1)[1].lower()
     
     def __str__(self) -> str:
         return self.value
@@ -34,3 +58,39 @@ class Email:
     
     def __hash__(self) -> int:
         return hash(self.value)
+
+
+@dataclass(frozen=True, slots=True)
+class EmailBatchValidation:
+    """メールアドレスの一括検証結果（入力と同じ順序・件数のリストを持つ）"""
+    
+    values: List[str]
+    valid: List[bool]
+    errors: List[Optional[str]]  # 不正な理由（正しい値はNone）
+    
+    @property
+    def invalid_count(self) -> int:
+        return self.valid.count(False)
+    
+    def invalid_rows(self) -> List[Tuple[int, str]]:
+        """不正な値の（位置, 理由）の一覧"""
+        return [(index, error) for index, error in enumerate(self.errors) if error is not None]
+    
+    def valid_emails(self) -> List[Email]:
+        """正しい値を入力のままEmailにしたもの（検証済みのため再検証しない）"""
+        return [Email.trusted(value) for value, valid in zip(self.values, self.valid) if valid]
+
+
+def validate_emails(values: Iterable[str]) -> EmailBatchValidation:
+    """メールアドレスの列をまとめて検証する
+    
+    Email と同じ規則で1回の走査で検証し、不正な値も例外にせず理由を返す。
+    """
+    values = list(values)
+    valid: List[bool] = []
+    errors: List[Optional[str]] = []
+    for value in values:
+        error = _validation_error(value)
+        valid.append(error is None)
+        errors.append(error)
+    return EmailBatchValidation(values=values, valid=valid, errors=errors)
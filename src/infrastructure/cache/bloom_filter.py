@@ -0,0 +1,51 @@
+"""
+ブルームフィルタ
+"""
+import hashlib
+import math
+
+
+class BloomFilter:
+    """偽陽性のみを許容する確率的な集合
+    
+    想定件数と偽陽性率からビット数とハッシュ数を決める。
+    ハッシュは blake2b の128ビット出力を2つに分けたダブルハッシングで求める。
+    """
+    
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01):
+        if capacity < 1:
+            raise ValueError("想定件数は1以上である必要があります")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("偽陽性率は0より大きく1未満である必要があります")
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.bit_count = max(8, math.ceil(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self.item_count = 0
+        self._bits = bytearray((self.bit_count + 7) // 8)
+    
+    def add(self, value: str) -> None:
+        """値を追加する"""
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.item_count += 1
+    
+    def __contains__(self, value: str) -> bool:
+        """値が含まれている可能性があればTrue（Falseなら確実に含まれない）"""
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+    
+    @property
+    def memory_bytes(self) -> int:
+        """ビット配列のバイト数"""
+        return len(self._bits)
+    
+    def estimated_false_positive_rate(self) -> float:
+        """現在の件数での偽陽性率の推定値"""
+        return (1 - math.exp(-self.hash_count * self.item_count / self.bit_count)) ** self.hash_count
+    
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.bit_count
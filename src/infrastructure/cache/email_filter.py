@@ -0,0 +1,211 @@
+"""
+メールアドレス存在フィルタ（ブルームフィルタによる否定キャッシュ）
+"""
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Iterable, Iterator, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.config import settings
+from domain.value_objects.email import Email
+from infrastructure.cache.bloom_filter import BloomFilter
+from infrastructure.db.models import UserModel
+
+
+@dataclass
+class EmailFilterStats:
+    """メールアドレス存在フィルタの統計情報"""
+    ready: bool
+    capacity: int
+    false_positive_rate: float
+    estimated_false_positive_rate: float
+    item_count: int
+    removals_since_rebuild: int  # 削除・変更で不要になった件数（次回の再構築で除かれる）
+    bit_count: int
+    hash_count: int
+    memory_bytes: int
+    negatives: int  # DBに問い合わせずに「存在しない」と判定した回数
+    rebuilds: int
+    rebuild_errors: int  # 定期再構築の失敗回数（失敗中は前回のフィルタまたは未構築のまま動作する）
+    last_rebuild_error: Optional[str]
+    last_built_at: Optional[float]
+    
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class EmailExistenceFilter:
+    """登録済みメールアドレスのブルームフィルタ
+    
+    「存在しない」判定は確実なため、DBへの問い合わせを省略できる。
+    削除はフィルタから取り除けないため件数だけ記録し、定期的な再構築で反映する。
+    構築前は常に「存在する可能性あり」と答える。
+    
+    フィルタはプロセスごとに持つため、他プロセスでの登録は次回の再構築まで反映されない。
+    複数プロセスで運用する場合は再構築間隔を短くすること。
+    """
+    
+    def __init__(
+        self,
+        capacity: int = 1_000_000,
+        false_positive_rate: float = 0.01,
+        clock: Callable[[], float] = time.time
+    ):
+        self._capacity = capacity
+        self._false_positive_rate = false_positive_rate
+        self._clock = clock
+        self._filter: Optional[BloomFilter] = None
+        self._removals = 0
+        self._negatives = 0
+        self._rebuilds = 0
+        self._rebuild_errors = 0
+        self._last_rebuild_error: Optional[str] = None
+        self._last_built_at: Optional[float] = None
+        # 直近の再構築の開始以降に追加された値（走査のスナップショットより後にコミットされた値を取りこぼさないため）
+        self._recent: List[str] = []
+        self._lock = threading.Lock()
+    
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+    
+    def might_exist(self, email: Email) -> bool:
+        """メールアドレスが存在する可能性があればTrue"""
+        bloom = self._filter
+        if bloom is None or str(email) in bloom:
+            return True
+        with self._lock:
+            self._negatives += 1
+        return False
+    
+    def add(self, email: Email) -> None:
+        """メールアドレスを追加する"""
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(str(email))
+            self._recent.append(str(email))
+    
+    def record_removal(self) -> None:
+        """削除・変更により不要になった値があることを記録する"""
+        with self._lock:
+            self._removals += 1
+    
+    def record_rebuild_error(self, error: str) -> None:
+        """再構築に失敗したことを記録する"""
+        with self._lock:
+            self._rebuild_errors += 1
+            self._last_rebuild_error = error
+    
+    def rebuild(self, emails: Iterable[str], expected_count: int = 0) -> None:
+        """メールアドレスの一覧からフィルタを作り直して差し替える
+        
+        追加はコミット前に行われるため、開始直前に追加された値がまだ走査に含まれないことがある。
+        そこで前回の再構築の開始以降に追加された値をすべて新しいフィルタに引き継ぐ。
+        """
+        bloom = BloomFilter(max(self._capacity, expected_count), self._false_positive_rate)
+        with self._lock:
+            carried = self._recent
+            self._recent = []
+        try:
+            for email in emails:
+                bloom.add(email)
+        except BaseException:
+            with self._lock:
+                self._recent = carried + self._recent
+            raise
+        
+        with self._lock:
+            for email in carried + self._recent:
+                bloom.add(email)
+            self._filter = bloom
+            self._removals = 0
+            self._rebuilds += 1
+            self._last_built_at = self._clock()
+    
+    def stats(self) -> EmailFilterStats:
+        """統計情報を取得する"""
+        with self._lock:
+            bloom = self._filter
+            return EmailFilterStats(
+                ready=bloom is not None,
+                capacity=bloom.capacity if bloom else self._capacity,
+                false_positive_rate=self._false_positive_rate,
+                estimated_false_positive_rate=bloom.estimated_false_positive_rate() if bloom else 0.0,
+                item_count=bloom.item_count if bloom else 0,
+                removals_since_rebuild=self._removals,
+                bit_count=bloom.bit_count if bloom else 0,
+                hash_count=bloom.hash_count if bloom else 0,
+                memory_bytes=bloom.memory_bytes if bloom else 0,
+                negatives=self._negatives,
+                rebuilds=self._rebuilds,
+                rebuild_errors=self._rebuild_errors,
+                last_rebuild_error=self._last_rebuild_error,
+                last_built_at=self._last_built_at
+            )
+
+
+def scan_emails(session: Session, batch_size: int = 10000) -> Iterator[str]:
+    """登録済みのメールアドレスをバッチ単位でストリーミング取得する"""
+    result = session.execute(
+        select(UserModel.email).execution_options(yield_per=batch_size)
+    )
+    for (email,) in result:
+        yield email
+
+
+def rebuild_email_filter(email_filter: EmailExistenceFilter, engine: Engine, batch_size: int = 10000) -> None:
+    """プライマリDBを走査してフィルタを再構築する（レプリカ遅延による取りこぼしを避ける）"""
+    with Session(bind=engine) as session:
+        expected_count = session.execute(select(func.count(UserModel.id))).scalar_one()
+        # 再構築までの追加分を見込んで余裕を持たせる
+        email_filter.rebuild(scan_emails(session, batch_size), expected_count=int(expected_count * 1.5))
+
+
+class EmailFilterRefresher:
+    """フィルタを初回構築し、以降は一定間隔で再構築するバックグラウンドスレッド"""
+    
+    def __init__(
+        self,
+        email_filter: EmailExistenceFilter,
+        engine_factory: Callable[[], Engine],
+        interval_seconds: float
+    ):
+        self._email_filter = email_filter
+        self._engine_factory = engine_factory
+        self._interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def ensure_started(self) -> None:
+        """未起動であればスレッドを起動する（何度呼んでもよい）"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="email-filter-refresher", daemon=True)
+                self._thread.start()
+    
+    def stop(self) -> None:
+        """スレッドを停止する"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                rebuild_email_filter(self._email_filter, self._engine_factory())
+            except Exception as e:
+                # 構築に失敗しても既存のフィルタ（または未構築状態）のまま動作を続ける
+                error = f"{type(e).__name__}: {e}"
+                self._email_filter.record_rebuild_error(error)
+                print(f"メールアドレス存在フィルタの再構築エラー: {error}")
+            self._stop.wait(self._interval_seconds)
+
+
+# グローバルインスタンス（プロセス内で共有）
+email_filter = EmailExistenceFilter(
+    capacity=settings.EMAIL_FILTER_CAPACITY,
+    false_positive_rate=settings.EMAIL_FILTER_FALSE_POSITIVE_RATE
+)
@@ -0,0 +1,134 @@
+"""
+ユーザーキャッシュ（LRU + TTL）
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Optional, Tuple
+from app.config import settings
+from domain.models.user import User
+from domain.value_objects.email import Email
+
+
+@dataclass
+class CacheStats:
+    """キャッシュの統計情報"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # 容量超過による追い出し
+    expirations: int = 0  # TTL切れによる破棄
+    invalidations: int = 0  # 更新・削除による破棄
+    size: int = 0
+    
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class UserCache:
+    """IDとメールアドレスの両方で引けるユーザーキャッシュ
+    
+    エントリはIDをキーに1つだけ保持し、メールアドレスはIDへの索引として持つため、
+    追い出し・破棄の際に両方の索引が常に一致する。
+    エンティティは可変なため、格納時と取得時にコピーする。
+    プロセス内にのみ保持するため、複数ワーカー構成では他のワーカーでの更新が最大 ttl_seconds の間反映されない。
+    """
+    
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        ttl_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if maxsize < 1:
+            raise ValueError("キャッシュサイズは1以上である必要があります")
+        self._maxsize = maxsize
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[int, Tuple[User, float]]" = OrderedDict()
+        self._ids_by_email: Dict[str, int] = {}
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+    
+    def get_by_id(self, user_id: int) -> Optional[User]:
+        """IDでユーザーを取得する（なければNone）"""
+        with self._lock:
+            return self._get(user_id)
+    
+    def get_by_email(self, email: Email) -> Optional[User]:
+        """メールアドレスでユーザーを取得する（なければNone）"""
+        with self._lock:
+            user_id = self._ids_by_email.get(str(email))
+            if user_id is None:
+                self._stats.misses += 1
+                return None
+            return self._get(user_id)
+    
+    def put(self, user: User) -> None:
+        """ユーザーを格納する（ID未採番のユーザーは格納しない）"""
+        if user.id is None:
+            return
+        with self._lock:
+            self._remove(user.id)
+            self._entries[user.id] = (copy.copy(user), self._clock() + self._ttl_seconds)
+            self._ids_by_email[str(user.email)] = user.id
+            while len(self._entries) > self._maxsize:
+                oldest_id = next(iter(self._entries))
+                self._remove(oldest_id)
+                self._stats.evictions += 1
+    
+    def invalidate(self, user_id: Optional[int] = None, email: Optional[Email] = None) -> None:
+        """IDまたはメールアドレスに対応するエントリを破棄する"""
+        with self._lock:
+            if email is not None:
+                email_user_id = self._ids_by_email.pop(str(email), None)
+                if email_user_id is not None and self._remove(email_user_id):
+                    self._stats.invalidations += 1
+            if user_id is not None and self._remove(user_id):
+                self._stats.invalidations += 1
+    
+    def clear(self) -> None:
+        """すべてのエントリを破棄する"""
+        with self._lock:
+            self._entries.clear()
+            self._ids_by_email.clear()
+    
+    def stats(self) -> CacheStats:
+        """統計情報を取得する"""
+        with self._lock:
+            return CacheStats(**{**asdict(self._stats), "size": len(self._entries)})
+    
+    def _get(self, user_id: int) -> Optional[User]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        
+        user, expires_at = entry
+        if expires_at <= self._clock():
+            self._remove(user_id)
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+        
+        self._entries.move_to_end(user_id)
+        self._stats.hits += 1
+        return copy.copy(user)
+    
+    def _remove(self, user_id: int) -> bool:
+        """エントリとメールアドレス索引を削除する（削除した場合True）"""
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return False
+        email = str(entry[0].email)
+        if self._ids_by_email.get(email) == user_id:
+            del self._ids_by_email[email]
+        return True
+
+
+# グローバルインスタンス（プロセス内で共有）
+user_cache = UserCache(
+    maxsize=settings.USER_CACHE_MAXSIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,73 @@
+"""
+既存データベースのスキーマ更新
+create_all では既存テーブルに列が追加されないため、ここで差分を適用する
+"""
+from sqlalchemy import bindparam, inspect, insert, literal, select, text, update
+from sqlalchemy.engine import Engine
+from infrastructure.db.models import UserEmailDirectoryModel, UserModel
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """スキーマを最新化する"""
+    add_email_domain_column(engine)
+    backfill_email_domain(engine)
+
+
+def add_email_domain_column(engine: Engine) -> None:
+    """users.email_domain 列とインデックスがなければ追加する"""
+    columns = {column["name"] for column in inspect(engine).get_columns(UserModel.__tablename__)}
+    if "email_domain" in columns:
+        return
+    
+    with engine.begin() as connection:
+        connection.execute(text(f"ALTER TABLE {UserModel.__tablename__} ADD COLUMN email_domain VARCHAR(254)"))
+        for index in UserModel.__table__.indexes:
+            if "email_domain" in index.columns:
+                index.create(bind=connection, checkfirst=True)
+
+
+def backfill_email_domain(engine: Engine, batch_size: int = 1000) -> int:
+    """email_domain が未設定の行をバッチ単位で埋める"""
+    table = UserModel.__table__
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("user_id"))
+        .values(email_domain=bindparam("domain"))
+    )
+    
+    updated_count = 0
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                select(table.c.id, table.c.email)
+                .where(table.c.email_domain.is_(None))
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                return updated_count
+            
+            connection.execute(
+                statement,
+                [
+                    {"user_id": user_id, "domain": email.rsplit("@", 1)[1].lower()}
+                    for user_id, email in rows
+                ]
+            )
+            updated_count += len(rows)
+
+
+def backfill_email_directory(engine: Engine, shard_index: int, shard_count: int) -> int:
+    """シャーディング構成で、索引のないユーザーのメールアドレスをこのシャードの索引に登録する
+    
+    索引の導入前は行が常にメールアドレスのハッシュで決まるシャードにあったため、同じシャードに登録すればよい
+    """
+    users = UserModel.__table__
+    directory = UserEmailDirectoryModel.__table__
+    missing = (
+        select(users.c.email, users.c.id * shard_count + literal(shard_index))
+        .where(~select(directory.c.email).where(directory.c.email == users.c.email).exists())
+    )
+    with engine.begin() as connection:
+        result = connection.execute(insert(directory).from_select(["email", "user_id"], missing))
+    return result.rowcount
@@ -1,10 +1,14 @@
 """
 ORMモデル（SQLAlchemy）
 """
-from sqlalchemy import Column, Integer, String, DateTime, create_engine
+from sqlalchemy import Column, Integer, String, Text, DateTime, create_engine, event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+from app.config import Settings, settings
 
 Base = declarative_base()
 
@@ -15,6 +19,8 @@ class UserModel(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(254), unique=True, index=True, nullable=False)
+    # ドメイン検索用（小文字に正規化したドメイン部分）。既存DBへの追加を考慮してNULL許容
+    email_domain = Column(String(254), index=True, nullable=True)
     name = Column(String(100), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -23,10 +29,105 @@ class UserModel(Base):
         return f"<UserModel(id={self.id}, email='{self.email}', name='{self.name}')>"
 
 
+class OutboxModel(Base):
+    """アウトボックスORMモデル（配送待ちの副作用。配送に成功した行は削除する）"""
+    __tablename__ = "outbox"
+    
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # この日時以降に配送する（再送時のバックオフ）
+    available_at = Column(DateTime, default=datetime.utcnow, index=True, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    # 配送中のリレーが取得した印と期限（期限切れの行は他のリレーが取得し直す）
+    claim_token = Column(String(32), index=True, nullable=True)
+    claimed_until = Column(DateTime, nullable=True)
+    # 再送上限に達した日時（以降は配送しない）
+    failed_at = Column(DateTime, nullable=True)
+    last_error = Column(String(500), nullable=True)
+    
+    def __repr__(self):
+        return f"<OutboxModel(id={self.id}, kind='{self.kind}', attempts={self.attempts})>"
+
+
+class UserEmailDirectoryModel(Base):
+    """メールアドレスからユーザーIDへの索引（シャーディング構成でのみ使用）
+    
+    メールアドレスのハッシュで決まるシャードに置き、主キーでシャードをまたいだ重複を防ぐ。
+    ユーザーの行はIDで決まるシャードから移動しないため、メールアドレス変更後は行と別のシャードに置かれる。
+    """
+    __tablename__ = "user_email_directory"
+    
+    email = Column(String(254), primary_key=True)
+    user_id = Column(Integer, nullable=False)  # グローバルID
+    
+    def __repr__(self):
+        return f"<UserEmailDirectoryModel(email='{self.email}', user_id={self.user_id})>"
+
+
 # データベース設定
-def create_database_engine(database_url: str):
-    """データベースエンジンを作成"""
-    return create_engine(database_url)
+def create_database_engine(database_url: str, config: Settings = settings):
+    """データベースエンジンを作成（プール設定とSQLiteのPRAGMAを適用）"""
+    url = make_url(database_url)
+    engine = create_engine(url, **engine_options(url, config))
+    if url.get_backend_name() == "sqlite":
+        apply_sqlite_pragmas(engine, config)
+    return engine
+
+
+def create_async_database_engine(database_url: str, config: Settings = settings) -> AsyncEngine:
+    """非同期データベースエンジンを作成（プール設定とSQLiteのPRAGMAを適用）"""
+    url = make_url(database_url)
+    try:
+        engine = create_async_engine(url, **engine_options(url, config))
+    except (InvalidRequestError, ImportError) as e:
+        raise ValueError(
+            f"非同期ドライバーを使用できません（{url.drivername}）。"
+            f"ASYNC_DATABASE_URL に非同期ドライバーのURLを指定し、ドライバーをインストールしてください: {e}"
+        ) from e
+    if url.get_backend_name() == "sqlite":
+        apply_sqlite_pragmas(engine.sync_engine, config)
+    return engine
+
+
+def engine_options(url: URL, config: Settings = settings) -> dict:
+    """設定からエンジン作成時のオプションを組み立てる"""
+    options = {"pool_pre_ping": config.DB_POOL_PRE_PING}
+    # インメモリSQLiteは単一接続のプールを使うためプールサイズ等は指定できない
+    if not is_memory_sqlite(url):
+        options.update(
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_recycle=config.DB_POOL_RECYCLE,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+        )
+    return options
+
+
+def is_memory_sqlite(url: URL) -> bool:
+    """インメモリSQLiteのURLかどうかを判定"""
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def apply_sqlite_pragmas(engine, config: Settings = settings) -> None:
+    """接続確立時にSQLiteのPRAGMAを適用するイベントを登録"""
+    pragmas = [
+        f"PRAGMA journal_mode={config.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size={int(config.SQLITE_MMAP_SIZE)}",
+        f"PRAGMA cache_size={int(config.SQLITE_CACHE_SIZE)}",
+        f"PRAGMA busy_timeout={int(config.SQLITE_BUSY_TIMEOUT)}",
+    ]
+    
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
 
 
 def create_session_factory(engine):
@@ -36,4 +137,6 @@ def create_session_factory(engine):
 
 def create_tables(engine):
     """テーブルを作成"""
+    from infrastructure.db.migrations import upgrade_schema
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
@@ -0,0 +1,181 @@
+"""
+アウトボックス実装（SQLAlchemy）
+"""
+import json
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Union
+from sqlalchemy import and_, bindparam, delete, func, or_, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from application.outbox import Outbox, OutboxMessage
+from infrastructure.db.models import OutboxModel
+
+
+class SqlAlchemyOutbox(Outbox):
+    """ユニットオブワークのセッションに outbox 行を追加するアウトボックス
+    
+    同期・非同期どちらのセッションでも、行はユーザーの変更と同じコミットで確定する
+    """
+    
+    def __init__(self, session: Union[Session, AsyncSession]):
+        self._session = session
+    
+    def add(self, message: OutboxMessage) -> None:
+        """メッセージを記録する"""
+        self._session.add(OutboxModel(kind=message.kind, payload=json.dumps(message.payload, ensure_ascii=False)))
+
+
+@dataclass
+class ClaimedOutboxMessage:
+    """リレーが配送のために取得したメッセージ"""
+    id: int
+    message: OutboxMessage
+    attempts: int  # これまでに失敗した回数
+    claim_token: str
+
+
+@dataclass
+class OutboxFailure:
+    """配送に失敗したメッセージと次回の配送日時（None なら再送しない）"""
+    claimed: ClaimedOutboxMessage
+    error: str
+    retry_at: Optional[datetime]
+
+
+@dataclass
+class OutboxBacklog:
+    """未配送のメッセージの状況（配送を諦めた行は含めない）"""
+    pending: int  # 配送待ち・配送中・再送待ちの件数
+    oldest_pending_at: Optional[datetime]  # 最も古い未配送メッセージの作成日時（UTC）
+    
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class OutboxStore:
+    """outbox テーブルからメッセージを取得・完了・失敗記録し、保持期間を過ぎた行を削除する
+    
+    取得は「未取得または取得期限切れ」の行に印と期限を付ける1回のUPDATEで行う。
+    PostgreSQLなどでは候補行の選択に FOR UPDATE SKIP LOCKED を付け、同時に動くリレー同士が待ち合わせずに別の行を取る。
+    SQLiteでは行ロックがないが、UPDATEがデータベース単位の書き込みロックで直列化されるため同じ行を二重に取得しない。
+    配送中にリレーが停止した行は期限切れ後に取り直されるため、配送は少なくとも1回（重複の可能性あり）となる。
+    """
+    
+    def __init__(self, engine: Engine, clock: Callable[[], datetime] = datetime.utcnow):
+        self._engine = engine
+        self._clock = clock
+    
+    def claim(self, batch_size: int, lease_seconds: float) -> List[ClaimedOutboxMessage]:
+        """配送可能なメッセージをID順に最大 batch_size 件取得する"""
+        now = self._clock()
+        token = uuid.uuid4().hex
+        candidates = (
+            select(OutboxModel.id)
+            .where(
+                OutboxModel.failed_at.is_(None),
+                OutboxModel.available_at <= now,
+                or_(OutboxModel.claimed_until.is_(None), OutboxModel.claimed_until < now)
+            )
+            .order_by(OutboxModel.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        with self._engine.begin() as connection:
+            connection.execute(
+                update(OutboxModel)
+                .where(OutboxModel.id.in_(candidates))
+                .values(claim_token=token, claimed_until=now + timedelta(seconds=lease_seconds))
+            )
+            rows = connection.execute(
+                select(OutboxModel.id, OutboxModel.kind, OutboxModel.payload, OutboxModel.attempts)
+                .where(OutboxModel.claim_token == token)
+                .order_by(OutboxModel.id)
+            ).all()
+        return [
+            ClaimedOutboxMessage(row_id, OutboxMessage(kind, json.loads(payload)), attempts, token)
+            for row_id, kind, payload, attempts in rows
+        ]
+    
+    def renew(self, claim_token: str, lease_seconds: float) -> None:
+        """取得中の行の期限を延長する（取得し直された行は対象外）"""
+        with self._engine.begin() as connection:
+            connection.execute(
+                update(OutboxModel)
+                .where(OutboxModel.claim_token == claim_token)
+                .values(claimed_until=self._clock() + timedelta(seconds=lease_seconds))
+            )
+    
+    def complete(self, claimed: List[ClaimedOutboxMessage]) -> None:
+        """配送済みのメッセージを削除する（取得し直された行は対象外）"""
+        if not claimed:
+            return
+        table = OutboxModel.__table__
+        with self._engine.begin() as connection:
+            connection.execute(
+                delete(table).where(table.c.id == bindparam("row_id"), table.c.claim_token == bindparam("token")),
+                [{"row_id": item.id, "token": item.claim_token} for item in claimed]
+            )
+    
+    def fail(self, failures: List[OutboxFailure]) -> None:
+        """失敗を記録し、再送日時を設定して取得を解除する（再送しない場合は失敗として残す）"""
+        if not failures:
+            return
+        now = self._clock()
+        table = OutboxModel.__table__
+        with self._engine.begin() as connection:
+            connection.execute(
+                update(table)
+                .where(table.c.id == bindparam("row_id"), table.c.claim_token == bindparam("token"))
+                .values(
+                    attempts=bindparam("new_attempts"),
+                    available_at=bindparam("retry_at"),
+                    failed_at=bindparam("new_failed_at"),
+                    last_error=bindparam("error"),
+                    claim_token=None,
+                    claimed_until=None
+                ),
+                [
+                    {
+                        "row_id": failure.claimed.id,
+                        "token": failure.claimed.claim_token,
+                        "new_attempts": failure.claimed.attempts + 1,
+                        "retry_at": failure.retry_at or now,
+                        "new_failed_at": None if failure.retry_at else now,
+                        "error": failure.error[:500]
+                    }
+                    for failure in failures
+                ]
+            )
+    
+    def backlog(self) -> OutboxBacklog:
+        """未配送のメッセージの件数と最も古い作成日時を取得する"""
+        with self._engine.connect() as connection:
+            pending, oldest_pending_at = connection.execute(
+                select(func.count(OutboxModel.id), func.min(OutboxModel.created_at))
+                .where(OutboxModel.failed_at.is_(None))
+            ).one()
+        return OutboxBacklog(pending, oldest_pending_at)
+    
+    def purge(self, retention_seconds: float) -> int:
+        """保持期間を過ぎた行を削除する（削除した件数を返す）
+        
+        対象は配送を諦めた行と、配送されないまま保持期間を過ぎた行（取得中の行は除く）
+        """
+        now = self._clock()
+        cutoff = now - timedelta(seconds=retention_seconds)
+        with self._engine.begin() as connection:
+            result = connection.execute(
+                delete(OutboxModel).where(
+                    or_(
+                        OutboxModel.failed_at < cutoff,
+                        and_(
+                            OutboxModel.created_at < cutoff,
+                            or_(OutboxModel.claimed_until.is_(None), OutboxModel.claimed_until < now)
+                        )
+                    )
+                )
+            )
+        return result.rowcount
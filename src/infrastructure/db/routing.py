@@ -0,0 +1,67 @@
+"""
+プライマリ／読み取りレプリカへの接続振り分け
+"""
+import itertools
+import threading
+from typing import Callable, Optional, Sequence
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+
+class ReplicaRouter:
+    """書き込みはプライマリ、読み取りはレプリカ（ラウンドロビン）に振り分ける
+    
+    書き込み直後の読み取りをプライマリに送るかどうかはセッションごとに決める（RoutingSession を参照）
+    """
+    
+    def __init__(self, primary: Engine, replicas: Sequence[Engine] = ()):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self._replica_cycle = itertools.cycle(self.replicas)
+        self._lock = threading.Lock()
+    
+    def reader(self) -> Engine:
+        """読み取りに使用するエンジンを選択する"""
+        if not self.replicas:
+            return self.primary
+        with self._lock:
+            return next(self._replica_cycle)
+
+
+class RoutingSession(Session):
+    """ReplicaRouter に従って文ごとに接続先を選択するセッション
+    
+    同期セッションとして、また AsyncSession の sync_session_class として使用する
+    （非同期の場合は ReplicaRouter に AsyncEngine.sync_engine を渡す）
+    
+    read_primary を指定したセッション（直前に書き込んだクライアントのリクエストなど）と、
+    書き込んだ後のセッションは読み取りもプライマリに送る。
+    on_write は最初の書き込み時に呼ばれ、クライアントに書き込みを記録するために使う。
+    """
+    
+    def __init__(
+        self,
+        *args,
+        router: ReplicaRouter,
+        read_primary: bool = False,
+        on_write: Optional[Callable[[], None]] = None,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self._router = router
+        self._read_primary = read_primary
+        self._on_write = on_write
+        self._has_written = False
+    
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        """文の種類に応じてプライマリまたはレプリカを返す"""
+        if self._flushing or getattr(clause, "is_dml", False):
+            if not self._has_written:
+                self._has_written = True
+                if self._on_write is not None:
+                    self._on_write()
+            return self._router.primary
+        
+        if self._read_primary or self._has_written:
+            return self._router.primary
+        return self._router.reader()
@@ -1,31 +1,92 @@
 """
 データベースセッション管理
 """
+from typing import AsyncIterator, Callable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from infrastructure.db.models import create_async_database_engine, create_database_engine
+from infrastructure.db.routing import ReplicaRouter, RoutingSession
 
 
 class DatabaseSession:
-    """データベースセッション管理クラス"""
+    """データベースセッション管理クラス
     
-    def __init__(self):
-        self.engine = create_engine(settings.DATABASE_URL)
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+    書き込みはプライマリ、読み取りはレプリカ（設定されている場合）に振り分ける
+    """
     
-    def get_session(self) -> Session:
-        """データベースセッションを取得"""
-        return self.SessionLocal()
+    def __init__(
+        self,
+        database_url: Optional[str] = None,
+        replica_urls: Optional[List[str]] = None
+    ):
+        database_url = database_url or settings.DATABASE_URL
+        replica_urls = settings.DATABASE_REPLICA_URLS if replica_urls is None else replica_urls
+        
+        self.engine = create_database_engine(database_url, settings)
+        self.replica_engines = [create_database_engine(url, settings) for url in replica_urls]
+        self.router = ReplicaRouter(self.engine, self.replica_engines)
+        self.SessionLocal = sessionmaker(
+            class_=RoutingSession,
+            router=self.router,
+            autocommit=False,
+            autoflush=False
+        )
+    
+    def get_session(self, read_primary: bool = False, on_write: Optional[Callable[[], None]] = None) -> Session:
+        """データベースセッションを取得（引数は RoutingSession を参照）"""
+        return self.SessionLocal(read_primary=read_primary, on_write=on_write)
     
     def create_tables(self):
         """テーブルを作成"""
-        from infrastructure.db.models import Base
-        Base.metadata.create_all(bind=self.engine)
+        from infrastructure.db.models import create_tables
+        create_tables(self.engine)
+
+
+class AsyncDatabaseSession:
+    """非同期データベースセッション管理クラス
+    
+    書き込みはプライマリ、読み取りはレプリカ（設定されている場合）に振り分ける
+    """
+    
+    def __init__(
+        self,
+        database_url: Optional[str] = None,
+        replica_urls: Optional[List[str]] = None
+    ):
+        database_url = database_url or settings.ASYNC_DATABASE_URL
+        replica_urls = settings.ASYNC_DATABASE_REPLICA_URLS if replica_urls is None else replica_urls
+        
+        self.engine = create_async_database_engine(database_url, settings)
+        self.replica_engines = [create_async_database_engine(url, settings) for url in replica_urls]
+        # 振り分けは同期セッション上で行うため、各エンジンの sync_engine を渡す
+        self.router = ReplicaRouter(self.engine.sync_engine, [engine.sync_engine for engine in self.replica_engines])
+        # コミット後の属性アクセスで暗黙のI/Oが発生しないよう expire_on_commit=False
+        self.SessionLocal = async_sessionmaker(
+            sync_session_class=RoutingSession,
+            router=self.router,
+            autoflush=False,
+            expire_on_commit=False
+        )
+    
+    def get_session(self, read_primary: bool = False, on_write: Optional[Callable[[], None]] = None) -> AsyncSession:
+        """非同期データベースセッションを取得（引数は RoutingSession を参照）"""
+        return self.SessionLocal(read_primary=read_primary, on_write=on_write)
 
 
 # グローバルインスタンス
 db_session = DatabaseSession()
+# 非同期側はAPIで初めて使う時点で作成する（CLIだけを使う環境に非同期ドライバーを要求しない）
+_async_db_session: Optional[AsyncDatabaseSession] = None
+
+
+def get_async_db_session() -> AsyncDatabaseSession:
+    """非同期データベースセッション管理のグローバルインスタンスを取得する"""
+    global _async_db_session
+    if _async_db_session is None:
+        _async_db_session = AsyncDatabaseSession()
+    return _async_db_session
 
 
 def get_db():
@@ -35,3 +96,17 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """依存性注入用の非同期データベースセッション取得関数"""
+    async with get_async_db_session().get_session() as db:
+        yield db
+
+
+def get_async_session_factory() -> Callable[[], AsyncSession]:
+    """依存性注入用の非同期セッションファクトリー取得関数
+    
+    ストリーミングレスポンスのように、レスポンス送信中にセッションを使う処理で利用する
+    """
+    return get_async_db_session().get_session
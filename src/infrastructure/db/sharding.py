@@ -0,0 +1,53 @@
+"""
+シャーディング構成のデータベースセッション管理
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from sqlalchemy.orm import Session, sessionmaker
+from app.config import settings
+from infrastructure.db.migrations import backfill_email_directory
+from infrastructure.db.models import create_database_engine, create_tables
+
+
+class ShardedDatabaseSession:
+    """シャードごとのエンジン・セッションと、並列問い合わせ用のスレッドプールを管理するクラス"""
+    
+    def __init__(self, shard_urls: Optional[List[str]] = None):
+        shard_urls = settings.DATABASE_SHARD_URLS if shard_urls is None else shard_urls
+        if not shard_urls:
+            raise ValueError("シャードのデータベースURLを1つ以上指定してください")
+        
+        self.engines = [create_database_engine(url, settings) for url in shard_urls]
+        self.session_factories = [
+            sessionmaker(bind=engine, autocommit=False, autoflush=False)
+            for engine in self.engines
+        ]
+        # シャードごとに1スレッドあれば全シャードへ同時に問い合わせられる
+        self.executor = ThreadPoolExecutor(max_workers=len(shard_urls), thread_name_prefix="user-shard")
+    
+    def get_sessions(self) -> List[Session]:
+        """シャードごとのセッションを取得（シャード番号順）"""
+        return [session_factory() for session_factory in self.session_factories]
+    
+    def create_tables(self):
+        """全シャードにテーブルを作成（メールアドレスの索引がないユーザーは索引に登録する）"""
+        for index, engine in enumerate(self.engines):
+            create_tables(engine)
+            backfill_email_directory(engine, index, len(self.engines))
+    
+    def dispose(self):
+        """スレッドプールとエンジンを破棄"""
+        self.executor.shutdown(wait=True)
+        for engine in self.engines:
+            engine.dispose()
+
+
+_sharded_db_session: Optional[ShardedDatabaseSession] = None
+
+
+def get_sharded_db_session() -> ShardedDatabaseSession:
+    """設定（DATABASE_SHARD_URLS）に基づくシャーディング構成を取得（初回呼び出し時に作成）"""
+    global _sharded_db_session
+    if _sharded_db_session is None:
+        _sharded_db_session = ShardedDatabaseSession()
+    return _sharded_db_session
@@ -0,0 +1,128 @@
+"""
+ユニットオブワーク実装（SQLAlchemy）
+"""
+from concurrent.futures import Executor
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from application.unit_of_work import AsyncUnitOfWork, UnitOfWork
+from infrastructure.cache.email_filter import EmailExistenceFilter
+from infrastructure.cache.user_cache import UserCache
+from infrastructure.db.outbox import SqlAlchemyOutbox
+from infrastructure.repositories.async_user_repository_impl import AsyncUserRepositoryImpl
+from infrastructure.repositories.caching_user_repository import (
+    AsyncCachingUserRepository,
+    CachingUserRepository
+)
+from infrastructure.repositories.sharded_user_repository import ShardedUserRepository
+from infrastructure.repositories.user_email_directory import UserEmailDirectory
+from infrastructure.repositories.user_repository_impl import UserRepositoryImpl
+
+
+class SqlAlchemyUnitOfWork(UnitOfWork):
+    """セッションを所有し、リポジトリ間でトランザクションを共有するユニットオブワーク
+    
+    user_cache / email_filter を渡すと、ユーザーリポジトリをキャッシュ付きでラップする。
+    配送するリレーがない構成では record_outbox=False とし、outbox を持たない（行が溜まり続けないようにする）。
+    """
+    
+    def __init__(
+        self,
+        session: Session,
+        user_cache: Optional[UserCache] = None,
+        email_filter: Optional[EmailExistenceFilter] = None,
+        record_outbox: bool = True
+    ):
+        self._session = session
+        self._caching_users: Optional[CachingUserRepository] = None
+        self.users = UserRepositoryImpl(session)
+        self.outbox = SqlAlchemyOutbox(session) if record_outbox else None
+        if user_cache is not None or email_filter is not None:
+            self._caching_users = CachingUserRepository(self.users, user_cache, email_filter)
+            self.users = self._caching_users
+    
+    def commit(self) -> None:
+        """変更を確定する"""
+        try:
+            self._session.commit()
+        finally:
+            self._invalidate_cache()
+    
+    def rollback(self) -> None:
+        """未確定の変更を取り消す"""
+        try:
+            self._session.rollback()
+        finally:
+            self._invalidate_cache()
+    
+    def _invalidate_cache(self) -> None:
+        if self._caching_users is not None:
+            self._caching_users.invalidate_pending()
+
+
+class SqlAlchemyAsyncUnitOfWork(AsyncUnitOfWork):
+    """非同期セッションを所有し、リポジトリ間でトランザクションを共有するユニットオブワーク
+    
+    user_cache / email_filter を渡すと、ユーザーリポジトリをキャッシュ付きでラップする。
+    配送するリレーがない構成では record_outbox=False とし、outbox を持たない（行が溜まり続けないようにする）。
+    """
+    
+    def __init__(
+        self,
+        session: AsyncSession,
+        user_cache: Optional[UserCache] = None,
+        email_filter: Optional[EmailExistenceFilter] = None,
+        record_outbox: bool = True
+    ):
+        self._session = session
+        self._caching_users: Optional[AsyncCachingUserRepository] = None
+        self.users = AsyncUserRepositoryImpl(session)
+        self.outbox = SqlAlchemyOutbox(session) if record_outbox else None
+        if user_cache is not None or email_filter is not None:
+            self._caching_users = AsyncCachingUserRepository(self.users, user_cache, email_filter)
+            self.users = self._caching_users
+    
+    async def commit(self) -> None:
+        """変更を確定する"""
+        try:
+            await self._session.commit()
+        finally:
+            self._invalidate_cache()
+    
+    async def rollback(self) -> None:
+        """未確定の変更を取り消す"""
+        try:
+            await self._session.rollback()
+        finally:
+            self._invalidate_cache()
+    
+    def _invalidate_cache(self) -> None:
+        if self._caching_users is not None:
+            self._caching_users.invalidate_pending()
+
+
+class ShardedUnitOfWork(UnitOfWork):
+    """シャードごとのセッションを所有するユニットオブワーク
+    
+    コミットはシャードごとに順に行うため、複数シャードにまたがる変更（メールアドレス変更時の索引の付け替えなど）は
+    途中のシャードで失敗すると一部だけが確定する。
+    ユーザーと同じトランザクションに書けるアウトボックスがないため、outbox は持たない。
+    """
+    
+    def __init__(self, sessions: List[Session], executor: Executor):
+        self._sessions = sessions
+        self.users = ShardedUserRepository(
+            [UserRepositoryImpl(session) for session in sessions],
+            [UserEmailDirectory(session) for session in sessions],
+            executor
+        )
+    
+    def commit(self) -> None:
+        """全シャードの変更を確定する"""
+        for session in self._sessions:
+            session.commit()
+    
+    def rollback(self) -> None:
+        """全シャードの未確定の変更を取り消す"""
+        for session in self._sessions:
+            session.rollback()
@@ -2,82 +2,238 @@
 メール送信サービス
 """
 import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Optional
+from typing import Any, Callable, Iterable, List, Mapping, Optional, Tuple, TypeVar
 from app.config import settings
+from infrastructure.external_services.mail_templates import (
+    PASSWORD_RESET_TEMPLATE,
+    WELCOME_TEMPLATE,
+    MailTemplateRegistry,
+    mail_templates
+)
+from infrastructure.external_services.smtp_pool import SmtpConnectionPool
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class MailMessage:
+    """送信するメール1通分の内容"""
+    to_addresses: List[str]
+    subject: str
+    body: str
+    from_address: Optional[str] = None
+
+
+@dataclass
+class BulkSendResult:
+    """一括送信の結果"""
+    sent: int = 0
+    failed: int = 0
+    failed_addresses: List[str] = field(default_factory=list)
 
 
 class MailService:
-    """メール送信サービス"""
+    """メール送信サービス
+    
+    認証済みのSMTP接続をプールして複数のメールで使い回す。
+    定型メールは事前にコンパイルしたテンプレート（templates）から組み立てる。
+    """
     
-    def __init__(self):
-        self.smtp_server = settings.MAIL_SERVER
-        self.smtp_port = settings.MAIL_PORT
-        self.username = settings.MAIL_USERNAME
-        self.password = settings.MAIL_PASSWORD
+    def __init__(
+        self,
+        smtp_server: Optional[str] = None,
+        smtp_port: Optional[int] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: Optional[bool] = None,
+        pool_size: Optional[int] = None,
+        templates: Optional[MailTemplateRegistry] = None
+    ):
+        self.smtp_server = smtp_server or settings.MAIL_SERVER
+        self.smtp_port = smtp_port or settings.MAIL_PORT
+        self.username = username or settings.MAIL_USERNAME
+        self.password = password or settings.MAIL_PASSWORD
+        self.use_tls = settings.MAIL_USE_TLS if use_tls is None else use_tls
+        self.pool = SmtpConnectionPool(
+            self._connect,
+            max_size=pool_size or settings.MAIL_POOL_SIZE,
+            max_idle_seconds=settings.MAIL_POOL_IDLE_SECONDS
+        )
+        self.templates = templates or mail_templates
+    
+    @property
+    def is_configured(self) -> bool:
+        """送信に必要な設定が揃っていればTrue"""
+        return bool(self.smtp_server and self.username and self.password)
     
     def send_email(
-        self, 
-        to_addresses: List[str], 
-        subject: str, 
-        body: str, 
+        self,
+        to_addresses: List[str],
+        subject: str,
+        body: str,
         from_address: Optional[str] = None
     ) -> bool:
         """メールを送信する"""
-        if not self.smtp_server or not self.username or not self.password:
+        if not self.is_configured:
             print("メール設定が不完全です。メール送信をスキップします。")
             return False
         
         try:
-            # メールメッセージを作成
-            msg = MIMEMultipart()
-            msg['From'] = from_address or self.username
-            msg['To'] = ', '.join(to_addresses)
-            msg['Subject'] = subject
-            
-            # 本文を追加
-            msg.attach(MIMEText(body, 'plain', 'utf-8'))
-            
-            # SMTPサーバーに接続してメールを送信
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
-            
+            self._send_message(self._build_message(MailMessage(to_addresses, subject, body, from_address)))
             print(f"メール送信成功: {subject} -> {to_addresses}")
             return True
-            
+        
         except Exception as e:
             print(f"メール送信エラー: {e}")
             return False
     
+    def send_bulk(self, messages: Iterable[MailMessage], concurrency: Optional[int] = None) -> BulkSendResult:
+        """メールをまとめて送信する
+        
+        最大 concurrency 本（プールサイズが上限）の接続で並行して送信し、
+        各接続では複数のメールを続けて送る。失敗したメールは宛先を記録して続行する。
+        """
+        def send(message: MailMessage) -> None:
+            self._send_message(self._build_message(message))
+        
+        return self._send_all(messages, send, lambda message: message.to_addresses, concurrency)
+    
+    def send_template(self, template_name: str, to_addresses: List[str], variables: Mapping[str, Any]) -> bool:
+        """テンプレートからメールを組み立てて送信する"""
+        if not self.is_configured:
+            print("メール設定が不完全です。メール送信をスキップします。")
+            return False
+        
+        template = self.templates.get(template_name)
+        try:
+            self._send_raw(to_addresses, template.build(self.username, to_addresses, variables))
+            print(f"メール送信成功: {template.subject} -> {to_addresses}")
+            return True
+        
+        except Exception as e:
+            print(f"メール送信エラー: {e}")
+            return False
+    
+    def send_template_bulk(
+        self,
+        template_name: str,
+        recipients: Iterable[Tuple[str, Mapping[str, Any]]],
+        concurrency: Optional[int] = None
+    ) -> BulkSendResult:
+        """同じテンプレートのメールを宛先ごとの変数で描画してまとめて送信する
+        
+        recipients は（宛先, 変数）の並び。固定のMIMEヘッダーはテンプレートごとに一度だけ組み立てる
+        """
+        template = self.templates.get(template_name)
+        
+        def send(recipient: Tuple[str, Mapping[str, Any]]) -> None:
+            address, variables = recipient
+            self._send_raw([address], template.build(self.username, [address], variables))
+        
+        return self._send_all(recipients, send, lambda recipient: [recipient[0]], concurrency)
+    
+    def close(self) -> None:
+        """プールしている接続を閉じる"""
+        self.pool.close()
+    
     def send_welcome_email(self, user_email: str, user_name: str) -> bool:
         """ウェルカムメールを送信する"""
-        subject = "アカウント登録完了のお知らせ"
-        body = f"""
-{user_name} 様
-
-アカウントの登録が完了いたしました。
-ご利用いただき、ありがとうございます。
-
-今後ともよろしくお願いいたします。
-        """.strip()
-        
-        return self.send_email([user_email], subject, body)
+        return self.send_template(WELCOME_TEMPLATE, [user_email], {"user_name": user_name})
     
     def send_password_reset_email(self, user_email: str, reset_token: str) -> bool:
         """パスワードリセットメールを送信する"""
-        subject = "パスワードリセットのお知らせ"
-        body = f"""
-パスワードリセットのリクエストを受け付けました。
-
-以下のリンクからパスワードをリセットしてください：
-https://example.com/reset-password?token={reset_token}
+        return self.send_template(PASSWORD_RESET_TEMPLATE, [user_email], {"reset_token": reset_token})
+    
+    def _build_message(self, message: MailMessage) -> MIMEMultipart:
+        """メールメッセージを作成する"""
+        msg = MIMEMultipart()
+        msg['From'] = message.from_address or self.username
+        msg['To'] = ', '.join(message.to_addresses)
+        msg['Subject'] = message.subject
+        
+        # 本文を追加
+        msg.attach(MIMEText(message.body, 'plain', 'utf-8'))
+        return msg
+    
+    def _send_message(self, msg: MIMEMultipart) -> None:
+        """プールの接続でメールを送信する"""
+        self._send_with_pool(lambda server: server.send_message(msg))
+    
+    def _send_raw(self, to_addresses: List[str], data: bytes) -> None:
+        """組み立て済みのメール（CRLF改行のバイト列）をプールの接続で送信する"""
+        self._send_with_pool(lambda server: server.sendmail(self.username, to_addresses, data))
+    
+    def _send_with_pool(self, send: Callable[[smtplib.SMTP], Any]) -> None:
+        """プールの接続で送信処理を実行する"""
+        try:
+            with self.pool.connection() as server:
+                send(server)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            # 待機中にサーバー側で切断された接続だった場合は、新しい接続で1回だけ再送する
+            with self.pool.connection() as server:
+                send(server)
+    
+    def _send_all(
+        self,
+        items: Iterable[T],
+        send: Callable[[T], None],
+        addresses_of: Callable[[T], List[str]],
+        concurrency: Optional[int]
+    ) -> BulkSendResult:
+        """最大 concurrency 本の接続で items を並行して送信する（失敗は宛先を記録して続行する）"""
+        result = BulkSendResult()
+        if not self.is_configured:
+            print("メール設定が不完全です。メール送信をスキップします。")
+            return result
+        
+        concurrency = min(concurrency or settings.MAIL_BULK_CONCURRENCY, self.pool.max_size)
+        if concurrency < 1:
+            raise ValueError("同時送信数は1以上である必要があります")
+        
+        iterator = iter(items)
+        lock = threading.Lock()
+        
+        def worker() -> None:
+            while True:
+                with lock:
+                    item = next(iterator, None)
+                if item is None:
+                    return
+                try:
+                    send(item)
+                except Exception:
+                    with lock:
+                        result.failed += 1
+                        result.failed_addresses.extend(addresses_of(item))
+                else:
+                    with lock:
+                        result.sent += 1
+        
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="mail-bulk") as executor:
+            for future in [executor.submit(worker) for _ in range(concurrency)]:
+                future.result()
+        
+        print(f"メール一括送信: 成功 {result.sent} 件, 失敗 {result.failed} 件")
+        return result
+    
+    def _connect(self) -> smtplib.SMTP:
+        """SMTPサーバーに接続して認証する"""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=settings.MAIL_TIMEOUT_SECONDS)
+        try:
+            if self.use_tls:
+                server.starttls()
+            server.login(self.username, self.password)
+        except BaseException:
+            server.close()
+            raise
+        return server
 
-このリンクの有効期限は24時間です。
 
-もしこのリクエストを送信していない場合は、このメールを無視してください。
-        """.strip()
-        
-        return self.send_email([user_email], subject, body)
+# グローバルインスタンス（プロセス内で接続プールを共有）
+mail_service = MailService()
@@ -0,0 +1,125 @@
+"""
+メールテンプレート（事前コンパイルとMIMEヘッダーの使い回し）
+"""
+import base64
+import threading
+from email.header import Header
+from string import Formatter
+from typing import Dict, List, Mapping, Optional, Tuple
+
+
+class MailTemplate:
+    """事前にコンパイルしたメールテンプレート
+    
+    本文は {変数名} 形式のプレースホルダーを登録時に一度だけ解析し、
+    描画時は固定文字列と変数の値を連結するだけにする。
+    件名は宛先によらず固定とし、From・件名・Content-Type などのMIMEヘッダーは
+    差出人ごとに一度だけ組み立てて使い回す（宛先ごとに作るのは To と本文のみ）。
+    """
+    
+    def __init__(self, name: str, subject: str, body: str):
+        self.name = name
+        self.subject = subject
+        self._segments = self._compile(body)
+        self.variables = frozenset(field for _, field in self._segments if field is not None)
+        self._headers: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+    
+    def render(self, variables: Mapping[str, object]) -> str:
+        """変数を埋め込んだ本文を返す（不足している変数があれば KeyError）"""
+        return "".join(
+            literal if field is None else str(variables[field])
+            for literal, field in self._segments
+        )
+    
+    def build(self, from_address: str, to_addresses: List[str], variables: Mapping[str, object]) -> bytes:
+        """送信できる形（CRLF改行のバイト列）のメールを組み立てる"""
+        body = base64.b64encode(self.render(variables).encode("utf-8"))
+        lines = b"\r\n".join(body[i:i + 76] for i in range(0, len(body), 76))
+        to_header = "To: " + ", ".join(to_addresses) + "\r\n"
+        return to_header.encode("utf-8") + self._static_headers(from_address) + b"\r\n" + lines + b"\r\n"
+    
+    def _static_headers(self, from_address: str) -> bytes:
+        """宛先によらないMIMEヘッダー（差出人ごとに一度だけ組み立てる）"""
+        headers = self._headers.get(from_address)
+        if headers is None:
+            subject = Header(self.subject, "utf-8").encode().replace("\n", "\r\n")
+            headers = (
+                f"From: {from_address}\r\n"
+                f"Subject: {subject}\r\n"
+                "MIME-Version: 1.0\r\n"
+                'Content-Type: text/plain; charset="utf-8"\r\n'
+                "Content-Transfer-Encoding: base64\r\n"
+            ).encode("utf-8")
+            with self._lock:
+                self._headers[from_address] = headers
+        return headers
+    
+    @staticmethod
+    def _compile(body: str) -> List[Tuple[str, Optional[str]]]:
+        """本文を（固定文字列, 変数名）の並びに分解する"""
+        segments = []
+        for literal, field, format_spec, conversion in Formatter().parse(body):
+            if format_spec or conversion:
+                raise ValueError(f"書式指定には対応していません: {{{field}}}")
+            if literal:
+                segments.append((literal, None))
+            if field is not None:
+                if not field.isidentifier():
+                    raise ValueError(f"変数名が不正です: {{{field}}}")
+                segments.append(("", field))
+        return segments
+
+
+class MailTemplateRegistry:
+    """名前でテンプレートを引けるレジストリ（登録時にコンパイルする）"""
+    
+    def __init__(self):
+        self._templates: Dict[str, MailTemplate] = {}
+    
+    def register(self, name: str, subject: str, body: str) -> MailTemplate:
+        """テンプレートをコンパイルして登録する"""
+        template = MailTemplate(name, subject, body)
+        self._templates[name] = template
+        return template
+    
+    def get(self, name: str) -> MailTemplate:
+        """テンプレートを取得する（未登録なら KeyError）"""
+        try:
+            return self._templates[name]
+        except KeyError:
+            raise KeyError(f"メールテンプレートが登録されていません: {name}") from None
+
+
+# テンプレート名
+WELCOME_TEMPLATE = "welcome"
+PASSWORD_RESET_TEMPLATE = "password_reset"
+
+# 組み込みのテンプレート（プロセス内で共有）
+mail_templates = MailTemplateRegistry()
+mail_templates.register(
+    WELCOME_TEMPLATE,
+    "アカウント登録完了のお知らせ",
+    """
+{user_name} 様
+
+アカウントの登録が完了いたしました。
+ご利用いただき、ありがとうございます。
+
+今後ともよろしくお願いいたします。
+    """.strip()
+)
+mail_templates.register(
+    PASSWORD_RESET_TEMPLATE,
+    "パスワードリセットのお知らせ",
+    """
+パスワードリセットのリクエストを受け付けました。
+
+以下のリンクからパスワードをリセットしてください：
+https://example.com/reset-password?token={reset_token}
+
+このリンクの有効期限は24時間です。
+
+もしこのリクエストを送信していない場合は、このメールを無視してください。
+    """.strip()
+)
@@ -0,0 +1,219 @@
+"""
+アウトボックスのリレー（outbox テーブルのメッセージをメール送信などに配送する）
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from sqlalchemy.engine import Engine
+from application.outbox import WELCOME_EMAIL, OutboxMessage
+from infrastructure.db.outbox import ClaimedOutboxMessage, OutboxBacklog, OutboxFailure, OutboxStore
+from infrastructure.external_services.mail_service import MailService
+
+
+# メッセージの配送処理。成功すればTrue、失敗（再送対象）ならFalseを返すか例外を送出する
+OutboxDispatcher = Callable[[OutboxMessage], bool]
+
+
+def mail_dispatcher(mail_service: MailService) -> OutboxDispatcher:
+    """メッセージの種類に応じてメールを送信する配送処理を作成する"""
+    handlers = {
+        WELCOME_EMAIL: lambda payload: mail_service.send_welcome_email(payload["email"], payload["name"]),
+    }
+    
+    def dispatch(message: OutboxMessage) -> bool:
+        handler = handlers.get(message.kind)
+        if handler is None:
+            raise ValueError(f"未対応のメッセージ種別です: {message.kind}")
+        return handler(message.payload)
+    
+    return dispatch
+
+
+@dataclass
+class OutboxRelayStats:
+    """リレーの統計情報"""
+    batches: int = 0
+    dispatched: int = 0
+    retries: int = 0  # 失敗して再送を予定した件数
+    failed: int = 0  # 再送上限に達して配送を諦めた件数
+    errors: int = 0  # 取得・記録自体の失敗（DB障害など）
+    purged: int = 0  # 保持期間を過ぎて削除した件数
+    
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class OutboxRelay:
+    """outbox テーブルからバッチ単位でメッセージを取得して配送するリレー
+    
+    取得したバッチは最大 concurrency 件ずつ並行して配送し、成功した行は削除、
+    失敗した行は指数バックオフで再送を予定する（max_attempts 回失敗したら配送を諦めて残す）。
+    配送を諦めた行と配送されないまま retention_seconds を過ぎた行は、purge_interval_seconds ごとに削除する。
+    
+    取得の期限（lease_seconds）が切れると他のリレーが同じ行を取得し、重複して配送される。
+    SMTPのタイムアウトは接続・認証・送信の操作ごとにかかり、再接続や空き待ちもあるため配送時間には上限がない。
+    そこでバッチの配送中は期限の1/3ごとに期限を延長し、リレーが停止した場合にだけ期限が切れるようにする。
+    """
+    
+    def __init__(
+        self,
+        engine_factory: Callable[[], Engine],
+        dispatch: OutboxDispatcher,
+        batch_size: int = 100,
+        concurrency: int = 4,
+        lease_seconds: float = 60.0,
+        max_attempts: int = 5,
+        backoff_seconds: float = 10.0,
+        poll_seconds: float = 1.0,
+        retention_seconds: float = 7 * 24 * 60 * 60,
+        purge_interval_seconds: float = 60 * 60,
+        clock: Callable[[], datetime] = datetime.utcnow
+    ):
+        if batch_size < 1:
+            raise ValueError("バッチサイズは1以上である必要があります")
+        if concurrency < 1:
+            raise ValueError("同時配送数は1以上である必要があります")
+        if lease_seconds <= 0:
+            raise ValueError("取得の期限は0より大きい必要があります")
+        self._engine_factory = engine_factory
+        self._dispatch = dispatch
+        self._batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self._max_attempts = max_attempts
+        self._backoff_seconds = backoff_seconds
+        self._poll_seconds = poll_seconds
+        self._retention_seconds = retention_seconds
+        self._purge_interval = timedelta(seconds=purge_interval_seconds)
+        self._next_purge_at: Optional[datetime] = None
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="outbox-dispatch")
+        self._stats = OutboxRelayStats()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def ensure_started(self) -> None:
+        """未起動であればスレッドを起動する（何度呼んでもよい）"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="outbox-relay", daemon=True)
+                self._thread.start()
+    
+    def stop(self) -> None:
+        """スレッドを停止する（配送中のバッチは完了を待つ）"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
+    
+    def run_once(self) -> int:
+        """1バッチ分のメッセージを配送する（取得した件数を返す）"""
+        store = OutboxStore(self._engine_factory(), self._clock)
+        claimed = store.claim(self._batch_size, self.lease_seconds)
+        if not claimed:
+            return 0
+        
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._renew_lease,
+            args=(store, claimed[0].claim_token, done),
+            name="outbox-lease",
+            daemon=True
+        )
+        heartbeat.start()
+        try:
+            errors = list(self._executor.map(self._deliver, claimed))
+        finally:
+            done.set()
+            heartbeat.join()
+        delivered = [item for item, error in zip(claimed, errors) if error is None]
+        failures = [
+            OutboxFailure(item, error, self._retry_at(item))
+            for item, error in zip(claimed, errors) if error is not None
+        ]
+        store.complete(delivered)
+        store.fail(failures)
+        
+        with self._lock:
+            self._stats.batches += 1
+            self._stats.dispatched += len(delivered)
+            for failure in failures:
+                if failure.retry_at is None:
+                    self._stats.failed += 1
+                else:
+                    self._stats.retries += 1
+        return len(claimed)
+    
+    def drain(self) -> int:
+        """配送可能なメッセージがなくなるまで配送する（取得した件数の合計を返す）"""
+        total = 0
+        while True:
+            count = self.run_once()
+            total += count
+            if count < self._batch_size:
+                return total
+    
+    def purge(self) -> int:
+        """保持期間を過ぎた行を削除する（削除した件数を返す）"""
+        purged = OutboxStore(self._engine_factory(), self._clock).purge(self._retention_seconds)
+        with self._lock:
+            self._stats.purged += purged
+        return purged
+    
+    def stats(self) -> OutboxRelayStats:
+        """統計情報を取得する"""
+        with self._lock:
+            return OutboxRelayStats(**asdict(self._stats))
+    
+    def backlog(self) -> OutboxBacklog:
+        """未配送のメッセージの件数と最も古い作成日時を取得する（DBを参照する）"""
+        return OutboxStore(self._engine_factory(), self._clock).backlog()
+    
+    def _renew_lease(self, store: OutboxStore, claim_token: str, done: threading.Event) -> None:
+        """バッチの配送が終わるまで、期限の1/3ごとに取得の期限を延長する"""
+        while not done.wait(self.lease_seconds / 3):
+            try:
+                store.renew(claim_token, self.lease_seconds)
+            except Exception:
+                # 延長に失敗しても次の周期で再試行する（期限内に成功すれば重複配送は起きない）
+                with self._lock:
+                    self._stats.errors += 1
+    
+    def _deliver(self, claimed: ClaimedOutboxMessage) -> Optional[str]:
+        """メッセージを配送する（失敗した場合はエラー内容を返す）"""
+        try:
+            if self._dispatch(claimed.message):
+                return None
+            return "配送に失敗しました"
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+    
+    def _retry_at(self, claimed: ClaimedOutboxMessage) -> Optional[datetime]:
+        """次回の配送日時（再送上限に達した場合はNone）"""
+        attempts = claimed.attempts + 1
+        if attempts >= self._max_attempts:
+            return None
+        return self._clock() + timedelta(seconds=self._backoff_seconds * (2 ** (attempts - 1)))
+    
+    def _purge_if_due(self) -> None:
+        """前回の削除から purge_interval_seconds 経っていれば保持期間を過ぎた行を削除する"""
+        now = self._clock()
+        if self._next_purge_at is None or now >= self._next_purge_at:
+            self._next_purge_at = now + self._purge_interval
+            self.purge()
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                count = self.run_once()
+                self._purge_if_due()
+            except Exception:
+                # DB障害などで取得・記録に失敗しても、次の周期で取得し直す
+                with self._lock:
+                    self._stats.errors += 1
+                count = 0
+            # バッチが埋まっていれば残りがあるため待たずに続ける
+            if count < self._batch_size:
+                self._stop.wait(self._poll_seconds)
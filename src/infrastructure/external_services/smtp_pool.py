@@ -0,0 +1,140 @@
+"""
+SMTPコネクションプール
+"""
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Callable, Iterator, List, Optional, Tuple
+
+# サーバーが応答コードで拒否したことを表す例外（smtplib がRSET済みのため、接続はそのまま使える）
+SMTP_REJECTIONS = (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)
+
+
+@dataclass
+class SmtpPoolStats:
+    """SMTPコネクションプールの統計情報"""
+    created: int = 0  # 新規に接続・認証した回数
+    reused: int = 0  # 待機中の接続を再利用した回数
+    discarded: int = 0  # エラーや待機時間超過で破棄した接続数
+    idle: int = 0
+    
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class SmtpConnectionPool:
+    """認証済みのSMTP接続を使い回すプール
+    
+    接続・STARTTLS・ログインは新規接続時だけ行い、送信後の接続は待機させて再利用する。
+    同時に使用できる接続数は max_size までで、超えた場合は返却を待つ。
+    宛先の拒否などサーバーが応答で拒否しただけの接続は再利用し、
+    切断・通信エラーなどその他のエラーが起きた接続は状態が不明なため返却せずに破棄する。
+    """
+    
+    def __init__(
+        self,
+        connect: Callable[[], smtplib.SMTP],
+        max_size: int = 4,
+        max_idle_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if max_size < 1:
+            raise ValueError("プールサイズは1以上である必要があります")
+        self._connect = connect
+        self._max_size = max_size
+        self._max_idle_seconds = max_idle_seconds
+        self._clock = clock
+        # 待機中の接続と返却時刻（直近に返却された接続から使う）
+        self._idle: List[Tuple[smtplib.SMTP, float]] = []
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._stats = SmtpPoolStats()
+        self._lock = threading.Lock()
+    
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+    
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        """接続を借りる（サーバーの拒否以外のエラーで抜けた場合は接続を破棄する）"""
+        server = self.acquire()
+        try:
+            yield server
+        except SMTP_REJECTIONS:
+            # 421応答などでsmtplibが接続を閉じていれば破棄する
+            self.release(server, broken=server.sock is None)
+            raise
+        except BaseException:
+            self.release(server, broken=True)
+            raise
+        self.release(server)
+    
+    def acquire(self) -> smtplib.SMTP:
+        """接続を借りる（待機中の接続がなければ新規に接続する）"""
+        self._slots.acquire()
+        try:
+            server = self._take_idle()
+            if server is not None:
+                return server
+            server = self._connect()
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._stats.created += 1
+        return server
+    
+    def release(self, server: smtplib.SMTP, broken: bool = False) -> None:
+        """接続を返却する（broken=Trueなら破棄する）"""
+        try:
+            if broken:
+                self._discard(server)
+            else:
+                with self._lock:
+                    self._idle.append((server, self._clock()))
+        finally:
+            self._slots.release()
+    
+    def close(self) -> None:
+        """待機中の接続をすべて閉じる"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            _quit(server)
+    
+    def stats(self) -> SmtpPoolStats:
+        """統計情報を取得する"""
+        with self._lock:
+            return SmtpPoolStats(**{**asdict(self._stats), "idle": len(self._idle)})
+    
+    def _take_idle(self) -> Optional[smtplib.SMTP]:
+        """待機時間を超えていない接続を取り出す（なければNone）"""
+        expired = []
+        server = None
+        now = self._clock()
+        with self._lock:
+            while self._idle:
+                candidate, released_at = self._idle.pop()
+                if now - released_at < self._max_idle_seconds:
+                    server = candidate
+                    self._stats.reused += 1
+                    break
+                expired.append(candidate)
+        for candidate in expired:
+            self._discard(candidate)
+        return server
+    
+    def _discard(self, server: smtplib.SMTP) -> None:
+        with self._lock:
+            self._stats.discarded += 1
+        _quit(server)
+
+
+def _quit(server: smtplib.SMTP) -> None:
+    """接続を閉じる（切断済みなどのエラーは無視する）"""
+    try:
+        server.quit()
+    except Exception:
+        server.close()
@@ -0,0 +1,156 @@
+"""
+非同期ユーザーリポジトリ実装（SQLAlchemy asyncio拡張）
+"""
+from typing import AsyncIterator, List, Optional
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from domain.exceptions import DuplicateEmailError, UserNotFoundError
+from domain.models.user import User
+from domain.value_objects.email import Email
+from domain.repositories.async_user_repository import AsyncUserRepository
+from infrastructure.db.models import UserModel
+from infrastructure.repositories.user_model_mapper import (
+    IN_CLAUSE_CHUNK_SIZE,
+    active_user_condition,
+    chunks,
+    entity_columns,
+    entity_to_values,
+    is_email_conflict,
+    model_to_entity
+)
+
+
+class AsyncUserRepositoryImpl(AsyncUserRepository):
+    """非同期ユーザーリポジトリ実装
+    
+    トランザクションの確定・取り消しは呼び出し側（ユニットオブワーク）が行う
+    """
+    
+    def __init__(self, db_session: AsyncSession):
+        self._db_session = db_session
+    
+    async def save(self, user: User) -> User:
+        """ユーザーを保存する"""
+        try:
+            if user.id is None:
+                # 新規作成
+                user_model = UserModel(**entity_to_values(user))
+                self._db_session.add(user_model)
+                await self._db_session.flush()  # IDを取得するためにflush
+                user.id = user_model.id
+            else:
+                # 更新（SELECTせずに UPDATE ... WHERE id = ? を1回だけ実行）
+                result = await self._db_session.execute(
+                    update(UserModel)
+                    .where(UserModel.id == user.id)
+                    .values(
+                        email=str(user.email),
+                        email_domain=user.email.domain,
+                        name=user.name,
+                        updated_at=user.updated_at
+                    )
+                )
+                if result.rowcount == 0:
+                    raise UserNotFoundError()
+        except IntegrityError as e:
+            if is_email_conflict(e):
+                raise DuplicateEmailError() from e
+            raise
+        
+        return user
+    
+    async def find_by_id(self, user_id: int) -> Optional[User]:
+        """IDでユーザーを検索する"""
+        user_model = await self._db_session.scalar(select(UserModel).where(UserModel.id == user_id))
+        if user_model is None:
+            return None
+        
+        return model_to_entity(user_model)
+    
+    async def find_by_email(self, email: Email) -> Optional[User]:
+        """メールアドレスでユーザーを検索する"""
+        user_model = await self._db_session.scalar(select(UserModel).where(UserModel.email == str(email)))
+        if user_model is None:
+            return None
+        
+        return model_to_entity(user_model)
+    
+    async def find_by_ids(self, user_ids: List[int]) -> List[User]:
+        """複数のIDでユーザーをまとめて検索する（IN句をチャンク単位で実行）"""
+        users = []
+        for chunk in chunks(list(dict.fromkeys(user_ids)), IN_CLAUSE_CHUNK_SIZE):
+            user_models = await self._db_session.scalars(select(UserModel).where(UserModel.id.in_(chunk)))
+            users.extend(model_to_entity(model) for model in user_models)
+        return users
+    
+    async def find_by_emails(self, emails: List[Email]) -> List[User]:
+        """複数のメールアドレスでユーザーをまとめて検索する（IN句をチャンク単位で実行）"""
+        values = list(dict.fromkeys(str(email) for email in emails))
+        users = []
+        for chunk in chunks(values, IN_CLAUSE_CHUNK_SIZE):
+            user_models = await self._db_session.scalars(select(UserModel).where(UserModel.email.in_(chunk)))
+            users.extend(model_to_entity(model) for model in user_models)
+        return users
+    
+    async def iter_all(self, batch_size: int = 1000) -> AsyncIterator[User]:
+        """すべてのユーザーをID順にストリーミング取得する
+        
+        yield_per によりサーバーサイドカーソルからバッチ単位で読み込み、
+        ORMの状態管理を避けるため列のみを選択する
+        """
+        result = await self._db_session.stream(
+            select(*entity_columns()).order_by(UserModel.id).execution_options(yield_per=batch_size)
+        )
+        async for row in result:
+            yield model_to_entity(row)
+    
+    async def find_by_domain(self, domain: str, offset: int = 0, limit: Optional[int] = None) -> List[User]:
+        """指定ドメインのユーザーをID順に取得する（email_domain列のインデックスを使用）"""
+        statement = (
+            select(UserModel)
+            .where(UserModel.email_domain == domain.lower())
+            .order_by(UserModel.id)
+            .offset(offset)
+        )
+        if limit is not None:
+            statement = statement.limit(limit)
+        user_models = await self._db_session.scalars(statement)
+        return [model_to_entity(model) for model in user_models]
+    
+    async def find_page(self, offset: int, limit: int) -> List[User]:
+        """ID順にページ単位でユーザーを取得する（LIMIT/OFFSETをSQLで実行）"""
+        user_models = await self._db_session.scalars(
+            select(UserModel).order_by(UserModel.id).offset(offset).limit(limit)
+        )
+        return [model_to_entity(model) for model in user_models]
+    
+    async def find_after(self, after_id: Optional[int], limit: int) -> List[User]:
+        """指定IDより後ろのユーザーをID順に取得する（主キーでシークするため深さに依存しない）"""
+        statement = select(UserModel)
+        if after_id is not None:
+            statement = statement.where(UserModel.id > after_id)
+        user_models = await self._db_session.scalars(statement.order_by(UserModel.id).limit(limit))
+        return [model_to_entity(model) for model in user_models]
+    
+    async def count(self) -> int:
+        """ユーザーの総数を取得する"""
+        return await self._db_session.scalar(select(func.count(UserModel.id)))
+    
+    async def count_active(self) -> int:
+        """アクティブなユーザー数を取得する（SELECT COUNT(*) で集計）"""
+        return await self._db_session.scalar(
+            select(func.count(UserModel.id)).where(active_user_condition())
+        )
+    
+    async def delete(self, user_id: int) -> bool:
+        """ユーザーを削除する（DELETE ... WHERE id = ? を1回だけ実行）"""
+        result = await self._db_session.execute(delete(UserModel).where(UserModel.id == user_id))
+        return result.rowcount > 0
+    
+    async def exists_by_email(self, email: Email) -> bool:
+        """メールアドレスが存在するかチェックする"""
+        user_id = await self._db_session.scalar(
+            select(UserModel.id).where(UserModel.email == str(email)).limit(1)
+        )
+        return user_id is not None
@@ -0,0 +1,233 @@
+"""
+キャッシュ付きユーザーリポジトリ（リードスルー）
+"""
+from typing import AsyncIterator, Iterator, List, Optional, Set, Tuple
+from domain.models.user import User
+from domain.repositories.async_user_repository import AsyncUserRepository
+from domain.repositories.user_repository import UserRepository
+from domain.value_objects.email import Email
+from infrastructure.cache.email_filter import EmailExistenceFilter
+from infrastructure.cache.user_cache import UserCache
+
+
+class _CacheInvalidation:
+    """保存・削除したキーを記録し、コミット後に改めて破棄する
+    
+    書き込み後に読み直したコミット前の値や、他のリクエストが読んだ古い値が
+    キャッシュに入り得るため、書き込み時とコミット・ロールバック後の2回破棄する。
+    """
+    
+    def __init__(self, cache: Optional[UserCache]):
+        self._cache = cache
+        self._pending: List[Tuple[Optional[int], Optional[Email]]] = []
+    
+    def invalidate(self, user_id: Optional[int] = None, email: Optional[Email] = None) -> None:
+        if self._cache is None:
+            return
+        self._cache.invalidate(user_id=user_id, email=email)
+        self._pending.append((user_id, email))
+    
+    def invalidate_pending(self) -> None:
+        """記録済みのキーを破棄し、記録をクリアする"""
+        for user_id, email in self._pending:
+            self._cache.invalidate(user_id=user_id, email=email)
+        self._pending.clear()
+
+
+class CachingUserRepository(UserRepository):
+    """find_by_id / find_by_email の結果をキャッシュするリポジトリデコレータ
+    
+    email_filter を渡すと、確実に存在しないメールアドレスの検索をDBに問い合わせずに返す。
+    """
+    
+    def __init__(
+        self,
+        repository: UserRepository,
+        cache: Optional[UserCache] = None,
+        email_filter: Optional[EmailExistenceFilter] = None
+    ):
+        self._repository = repository
+        self._cache = cache
+        self._email_filter = email_filter
+        self._invalidation = _CacheInvalidation(cache)
+    
+    def save(self, user: User) -> User:
+        """ユーザーを保存し、該当エントリを破棄する"""
+        self._invalidation.invalidate(user_id=user.id, email=user.email)
+        if self._email_filter is not None:
+            # 保存に失敗しても偽陽性が増えるだけなので先に追加する
+            self._email_filter.add(user.email)
+        return self._repository.save(user)
+    
+    def save_all(self, users: List[User]) -> None:
+        """新規ユーザーを一括保存する"""
+        for user in users:
+            self._invalidation.invalidate(user_id=user.id, email=user.email)
+            if self._email_filter is not None:
+                self._email_filter.add(user.email)
+        self._repository.save_all(users)
+    
+    def find_by_id(self, user_id: int) -> Optional[User]:
+        """IDでユーザーを検索する（キャッシュ優先）"""
+        user = self._cache.get_by_id(user_id) if self._cache is not None else None
+        if user is not None:
+            return user
+        user = self._repository.find_by_id(user_id)
+        if user is not None and self._cache is not None:
+            self._cache.put(user)
+        return user
+    
+    def find_by_email(self, email: Email) -> Optional[User]:
+        """メールアドレスでユーザーを検索する（キャッシュ優先）"""
+        user = self._cache.get_by_email(email) if self._cache is not None else None
+        if user is not None:
+            return user
+        if self._email_filter is not None and not self._email_filter.might_exist(email):
+            return None
+        user = self._repository.find_by_email(email)
+        if user is not None and self._cache is not None:
+            self._cache.put(user)
+        return user
+    
+    def find_by_ids(self, user_ids: List[int]) -> List[User]:
+        return self._repository.find_by_ids(user_ids)
+    
+    def find_by_emails(self, emails: List[Email]) -> List[User]:
+        return self._repository.find_by_emails(emails)
+    
+    def find_all(self) -> List[User]:
+        return self._repository.find_all()
+    
+    def iter_all(self, batch_size: int = 1000) -> Iterator[User]:
+        return self._repository.iter_all(batch_size)
+    
+    def find_by_domain(self, domain: str, offset: int = 0, limit: Optional[int] = None) -> List[User]:
+        return self._repository.find_by_domain(domain, offset, limit)
+    
+    def find_page(self, offset: int, limit: int) -> List[User]:
+        return self._repository.find_page(offset, limit)
+    
+    def find_after(self, after_id: Optional[int], limit: int) -> List[User]:
+        return self._repository.find_after(after_id, limit)
+    
+    def count(self) -> int:
+        return self._repository.count()
+    
+    def count_active(self) -> int:
+        return self._repository.count_active()
+    
+    def delete(self, user_id: int) -> bool:
+        """ユーザーを削除し、該当エントリを破棄する"""
+        self._invalidation.invalidate(user_id=user_id)
+        deleted = self._repository.delete(user_id)
+        if deleted and self._email_filter is not None:
+            self._email_filter.record_removal()
+        return deleted
+    
+    def exists_by_email(self, email: Email) -> bool:
+        """メールアドレスが存在するかチェックする"""
+        if self._email_filter is not None and not self._email_filter.might_exist(email):
+            return False
+        return self._repository.exists_by_email(email)
+    
+    def find_existing_emails(self, emails: List[Email]) -> Set[Email]:
+        """登録済みのメールアドレスを取得する（確実に存在しないものは問い合わせない）"""
+        if self._email_filter is not None:
+            emails = [email for email in emails if self._email_filter.might_exist(email)]
+            if not emails:
+                return set()
+        return self._repository.find_existing_emails(emails)
+    
+    def invalidate_pending(self) -> None:
+        """コミット・ロールバック後に書き込み済みのキーを改めて破棄する"""
+        self._invalidation.invalidate_pending()
+
+
+class AsyncCachingUserRepository(AsyncUserRepository):
+    """find_by_id / find_by_email の結果をキャッシュする非同期リポジトリデコレータ
+    
+    email_filter を渡すと、確実に存在しないメールアドレスの検索をDBに問い合わせずに返す。
+    """
+    
+    def __init__(
+        self,
+        repository: AsyncUserRepository,
+        cache: Optional[UserCache] = None,
+        email_filter: Optional[EmailExistenceFilter] = None
+    ):
+        self._repository = repository
+        self._cache = cache
+        self._email_filter = email_filter
+        self._invalidation = _CacheInvalidation(cache)
+    
+    async def save(self, user: User) -> User:
+        """ユーザーを保存し、該当エントリを破棄する"""
+        self._invalidation.invalidate(user_id=user.id, email=user.email)
+        if self._email_filter is not None:
+            # 保存に失敗しても偽陽性が増えるだけなので先に追加する
+            self._email_filter.add(user.email)
+        return await self._repository.save(user)
+    
+    async def find_by_id(self, user_id: int) -> Optional[User]:
+        """IDでユーザーを検索する（キャッシュ優先）"""
+        user = self._cache.get_by_id(user_id) if self._cache is not None else None
+        if user is not None:
+            return user
+        user = await self._repository.find_by_id(user_id)
+        if user is not None and self._cache is not None:
+            self._cache.put(user)
+        return user
+    
+    async def find_by_email(self, email: Email) -> Optional[User]:
+        """メールアドレスでユーザーを検索する（キャッシュ優先）"""
+        user = self._cache.get_by_email(email) if self._cache is not None else None
+        if user is not None:
+            return user
+        if self._email_filter is not None and not self._email_filter.might_exist(email):
+            return None
+        user = await self._repository.find_by_email(email)
+        if user is not None and self._cache is not None:
+            self._cache.put(user)
+        return user
+    
+    async def find_by_ids(self, user_ids: List[int]) -> List[User]:
+        return await self._repository.find_by_ids(user_ids)
+    
+    async def find_by_emails(self, emails: List[Email]) -> List[User]:
+        return await self._repository.find_by_emails(emails)
+    
+    def iter_all(self, batch_size: int = 1000) -> AsyncIterator[User]:
+        return self._repository.iter_all(batch_size)
+    
+    async def find_by_domain(self, domain: str, offset: int = 0, limit: Optional[int] = None) -> List[User]:
+        return await self._repository.find_by_domain(domain, offset, limit)
+    
+    async def find_page(self, offset: int, limit: int) -> List[User]:
+        return await self._repository.find_page(offset, limit)
+    
+    async def find_after(self, after_id: Optional[int], limit: int) -> List[User]:
+        return await self._repository.find_after(after_id, limit)
+    
+    async def count(self) -> int:
+        return await self._repository.count()
+    
+    async def count_active(self) -> int:
+        return await self._repository.count_active()
+    
+    async def delete(self, user_id: int) -> bool:
+        """ユーザーを削除し、該当エントリを破棄する"""
+        self._invalidation.invalidate(user_id=user_id)
+        deleted = await self._repository.delete(user_id)
+        if deleted and self._email_filter is not None:
+            self._email_filter.record_removal()
+        return deleted
+    
+    async def exists_by_email(self, email: Email) -> bool:
+        """メールアドレスが存在するかチェックする"""
+        if self._email_filter is not None and not self._email_filter.might_exist(email):
+            return False
+        return await self._repository.exists_by_email(email)
+    
+    def invalidate_pending(self) -> None:
+        """コミット・ロールバック後に書き込み済みのキーを改めて破棄する"""
+        self._invalidation.invalidate_pending()
@@ -0,0 +1,237 @@
+"""
+シャーディングされたユーザーリポジトリ
+"""
+import copy
+import hashlib
+import heapq
+from concurrent.futures import Executor
+from typing import Callable, Dict, Iterator, List, Optional, Set, TypeVar
+from domain.exceptions import UserNotFoundError
+from domain.models.user import User
+from domain.repositories.user_repository import UserRepository
+from domain.value_objects.email import Email
+from infrastructure.repositories.user_email_directory import UserEmailDirectory
+
+T = TypeVar("T")
+
+
+def shard_index_for_email(email: Email, shard_count: int) -> int:
+    """メールアドレスの安定ハッシュから格納先シャードを決める（プロセス・再起動をまたいで不変）"""
+    digest = hashlib.blake2b(str(email).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+class ShardedUserRepository(UserRepository):
+    """複数DBにユーザーを振り分けるリポジトリ
+    
+    新規ユーザーはメールアドレスのハッシュで決まるシャードに保存し、以後は行を移動しない。
+    グローバルIDは「シャード内ID * シャード数 + シャード番号」で表し、IDからシャードを求める（IDは変わらない）。
+    メールアドレスからの検索と重複の検出は、メールアドレスのハッシュで決まるシャードの索引（UserEmailDirectory）で行う。
+    シャード内のID順とグローバルID順は一致するため、ID順の結果は各シャードの結果をマージして作る。
+    複数シャードへの問い合わせは executor で並列に実行する（各シャードのセッションは1スレッドのみが使う）。
+    
+    オフセット方式のページ取得は各シャードから先頭 offset + limit 件を取得してマージするため、
+    offset は MAX_OFFSET までに制限する（それより後ろは find_after のキーセット方式で取得する）。
+    
+    メールアドレス変更で索引のシャードが変わる場合は、コミットがシャードごとに順に行われるため、
+    途中のシャードで失敗すると新旧どちらかの索引だけが残ることがある（そのメールアドレスが使用中と判定される）。
+    シャードの数・順序を変えると既存のIDと配置が無効になる。
+    """
+    
+    # オフセット方式で取得できる位置の上限（シャード数 * (MAX_OFFSET + limit) 件を読むため）
+    MAX_OFFSET = 10000
+    
+    def __init__(self, shards: List[UserRepository], directories: List[UserEmailDirectory], executor: Executor):
+        if not shards:
+            raise ValueError("シャードを1つ以上指定してください")
+        if len(directories) != len(shards):
+            raise ValueError("メールアドレスの索引はシャードごとに指定してください")
+        self._shards = shards
+        self._directories = directories
+        self._executor = executor
+    
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+    
+    def save(self, user: User) -> User:
+        """ユーザーを保存する（行はIDで決まるシャードに置いたまま、メールアドレス変更時は索引を付け替える）"""
+        if user.id is None:
+            index = self._shard_index_for_email(user.email)
+            self._shards[index].save(user)
+            user.id = self._to_global_id(user.id, index)
+            self._directories[index].add(user.email, user.id)
+            return user
+        
+        index, local_id = self._split_id(user.id)
+        current = self._shards[index].find_by_id(local_id)
+        if current is None:
+            raise UserNotFoundError()
+        if current.email != user.email:
+            # 先に新しいメールアドレスを登録し、重複ならここで DuplicateEmailError となる
+            self._directory_for(user.email).add(user.email, user.id)
+            self._directory_for(current.email).remove(current.email)
+        local_user = copy.copy(user)
+        local_user.id = local_id
+        self._shards[index].save(local_user)
+        return user
+    
+    def save_all(self, users: List[User]) -> None:
+        """新規ユーザーを一括保存する（シャードごとにまとめて並列に保存し、採番されたIDを索引に登録）"""
+        groups: Dict[int, List[User]] = {}
+        for user in users:
+            groups.setdefault(self._shard_index_for_email(user.email), []).append(user)
+        
+        def save_group(index: int, shard: UserRepository) -> None:
+            shard.save_all(groups[index])
+            saved = shard.find_by_emails([user.email for user in groups[index]])
+            self._directories[index].add_all([(user.email, self._to_global_id(user.id, index)) for user in saved])
+        
+        self._fan_out(save_group, groups)
+    
+    def find_by_id(self, user_id: int) -> Optional[User]:
+        """IDでユーザーを検索する（IDからシャードを特定）"""
+        index, local_id = self._split_id(user_id)
+        return self._globalize(index, self._shards[index].find_by_id(local_id))
+    
+    def find_by_email(self, email: Email) -> Optional[User]:
+        """メールアドレスでユーザーを検索する（索引でIDを求め、IDのシャードから取得）"""
+        user_id = self._directory_for(email).find_ids([email]).get(email)
+        return None if user_id is None else self.find_by_id(user_id)
+    
+    def find_by_ids(self, user_ids: List[int]) -> List[User]:
+        """複数のIDでユーザーをまとめて検索する"""
+        groups: Dict[int, List[int]] = {}
+        for user_id in user_ids:
+            index, local_id = self._split_id(user_id)
+            groups.setdefault(index, []).append(local_id)
+        results = self._fan_out(lambda index, shard: shard.find_by_ids(groups[index]), groups)
+        return [user for index, users in results.items() for user in self._globalize_all(index, users)]
+    
+    def find_by_emails(self, emails: List[Email]) -> List[User]:
+        """複数のメールアドレスでユーザーをまとめて検索する（索引でIDを求めてからIDで検索）"""
+        return self.find_by_ids(list(self._find_ids(emails).values()))
+    
+    def find_all(self) -> List[User]:
+        """すべてのユーザーをID順に取得する"""
+        results = self._fan_out(lambda index, shard: shard.find_all())
+        users = [user for index, shard_users in results.items() for user in self._globalize_all(index, shard_users)]
+        return sorted(users, key=lambda user: user.id)
+    
+    def iter_all(self, batch_size: int = 1000) -> Iterator[User]:
+        """すべてのユーザーをID順にストリーミング取得する（各シャードの結果を逐次マージ）"""
+        streams = [self._iter_shard(index, batch_size) for index in range(self.shard_count)]
+        return heapq.merge(*streams, key=lambda user: user.id)
+    
+    def find_by_domain(self, domain: str, offset: int = 0, limit: Optional[int] = None) -> List[User]:
+        """指定ドメインのユーザーをID順に取得する（各シャードから先頭 offset + limit 件を取得してマージ）"""
+        if limit is None:
+            raise ValueError("シャーディング構成では取得件数を指定してください")
+        self._check_offset(offset)
+        results = self._fan_out(lambda index, shard: shard.find_by_domain(domain, 0, offset + limit))
+        return self._slice(self._merge(results), offset, limit)
+    
+    def find_page(self, offset: int, limit: int) -> List[User]:
+        """ID順にページ単位でユーザーを取得する（各シャードから先頭 offset + limit 件を取得してマージ）"""
+        self._check_offset(offset)
+        results = self._fan_out(lambda index, shard: shard.find_page(0, offset + limit))
+        return self._slice(self._merge(results), offset, limit)
+    
+    def find_after(self, after_id: Optional[int], limit: int) -> List[User]:
+        """指定IDより後ろのユーザーをID順に取得する"""
+        def find(index: int, shard: UserRepository) -> List[User]:
+            # local_id * N + index > after_id となる最小のシャード内IDの1つ手前
+            local_after = None if after_id is None else (after_id - index) // self.shard_count
+            return shard.find_after(local_after, limit)
+        
+        return self._merge(self._fan_out(find))[:limit]
+    
+    def count(self) -> int:
+        """ユーザーの総数を取得する"""
+        return sum(self._fan_out(lambda index, shard: shard.count()).values())
+    
+    def count_active(self) -> int:
+        """アクティブなユーザー数を取得する"""
+        return sum(self._fan_out(lambda index, shard: shard.count_active()).values())
+    
+    def delete(self, user_id: int) -> bool:
+        """ユーザーを削除する（索引からも取り除く）"""
+        index, local_id = self._split_id(user_id)
+        user = self._shards[index].find_by_id(local_id)
+        if user is None:
+            return False
+        self._directory_for(user.email).remove(user.email)
+        return self._shards[index].delete(local_id)
+    
+    def exists_by_email(self, email: Email) -> bool:
+        """メールアドレスが存在するかチェックする（索引を確認）"""
+        return email in self._directory_for(email).find_ids([email])
+    
+    def find_existing_emails(self, emails: List[Email]) -> Set[Email]:
+        """指定されたメールアドレスのうち既に登録済みのものを取得する（索引を確認）"""
+        return set(self._find_ids(emails))
+    
+    def _check_offset(self, offset: int) -> None:
+        if offset > self.MAX_OFFSET:
+            raise ValueError(
+                f"シャーディング構成では先頭から{self.MAX_OFFSET}件より後ろはページ番号で取得できません。"
+                "カーソル方式で取得してください"
+            )
+    
+    def _shard_index_for_email(self, email: Email) -> int:
+        return shard_index_for_email(email, self.shard_count)
+    
+    def _directory_for(self, email: Email) -> UserEmailDirectory:
+        return self._directories[self._shard_index_for_email(email)]
+    
+    def _find_ids(self, emails: List[Email]) -> Dict[Email, int]:
+        """索引からメールアドレスとグローバルIDの対応を取得する（シャードごとに並列）"""
+        groups = self._group_emails(emails)
+        results = self._fan_out(lambda index, shard: self._directories[index].find_ids(groups[index]), groups)
+        return {email: user_id for found in results.values() for email, user_id in found.items()}
+    
+    def _to_global_id(self, local_id: int, index: int) -> int:
+        return local_id * self.shard_count + index
+    
+    def _split_id(self, user_id: int) -> tuple:
+        """グローバルIDを（シャード番号, シャード内ID）に分解する"""
+        return user_id % self.shard_count, user_id // self.shard_count
+    
+    def _group_emails(self, emails: List[Email]) -> Dict[int, List[Email]]:
+        groups: Dict[int, List[Email]] = {}
+        for email in emails:
+            groups.setdefault(self._shard_index_for_email(email), []).append(email)
+        return groups
+    
+    def _globalize(self, index: int, user: Optional[User]) -> Optional[User]:
+        if user is not None:
+            user.id = self._to_global_id(user.id, index)
+        return user
+    
+    def _globalize_all(self, index: int, users: List[User]) -> List[User]:
+        return [self._globalize(index, user) for user in users]
+    
+    def _iter_shard(self, index: int, batch_size: int) -> Iterator[User]:
+        for user in self._shards[index].iter_all(batch_size):
+            yield self._globalize(index, user)
+    
+    def _fan_out(
+        self,
+        task: Callable[[int, UserRepository], T],
+        indexes: Optional[Dict[int, object]] = None
+    ) -> Dict[int, T]:
+        """シャードごとの処理を並列に実行し、シャード番号ごとの結果を返す"""
+        targets = range(self.shard_count) if indexes is None else sorted(indexes)
+        futures = {index: self._executor.submit(task, index, self._shards[index]) for index in targets}
+        return {index: future.result() for index, future in futures.items()}
+    
+    def _merge(self, results: Dict[int, List[User]]) -> List[User]:
+        """シャードごとのID順の結果を、グローバルID順にマージする"""
+        return list(heapq.merge(
+            *(self._globalize_all(index, users) for index, users in results.items()),
+            key=lambda user: user.id
+        ))
+    
+    @staticmethod
+    def _slice(users: List[User], offset: int, limit: int) -> List[User]:
+        return users[offset:offset + limit]
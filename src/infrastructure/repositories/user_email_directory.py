@@ -0,0 +1,53 @@
+"""
+シャーディング構成のメールアドレス索引
+"""
+from typing import Dict, List, Tuple
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from domain.exceptions import DuplicateEmailError
+from domain.value_objects.email import Email
+from infrastructure.db.models import UserEmailDirectoryModel
+from infrastructure.repositories.user_model_mapper import IN_CLAUSE_CHUNK_SIZE, chunks
+
+
+class UserEmailDirectory:
+    """1つのシャードに置かれたメールアドレス → ユーザーID（グローバルID）の索引
+    
+    登録はユーザーの変更と同じセッション（同じシャードのトランザクション）で行う
+    """
+    
+    def __init__(self, session: Session):
+        self._session = session
+    
+    def add(self, email: Email, user_id: int) -> None:
+        """メールアドレスを登録する（登録済みなら DuplicateEmailError）"""
+        self.add_all([(email, user_id)])
+    
+    def add_all(self, entries: List[Tuple[Email, int]]) -> None:
+        """メールアドレスをまとめて登録する（いずれかが登録済みなら DuplicateEmailError）"""
+        if not entries:
+            return
+        try:
+            self._session.execute(
+                insert(UserEmailDirectoryModel),
+                [{"email": str(email), "user_id": user_id} for email, user_id in entries]
+            )
+        except IntegrityError as e:
+            raise DuplicateEmailError() from e
+    
+    def remove(self, email: Email) -> None:
+        """メールアドレスの登録を取り消す"""
+        self._session.execute(delete(UserEmailDirectoryModel).where(UserEmailDirectoryModel.email == str(email)))
+    
+    def find_ids(self, emails: List[Email]) -> Dict[Email, int]:
+        """登録済みのメールアドレスとユーザーIDの対応を取得する（IN句をチャンク単位で実行）"""
+        values = list(dict.fromkeys(str(email) for email in emails))
+        found = {}
+        for chunk in chunks(values, IN_CLAUSE_CHUNK_SIZE):
+            rows = self._session.execute(
+                select(UserEmailDirectoryModel.email, UserEmailDirectoryModel.user_id)
+                .where(UserEmailDirectoryModel.email.in_(chunk))
+            ).all()
+            found.update({Email.trusted(email): user_id for email, user_id in rows})
+        return found
@@ -0,0 +1,86 @@
+"""
+ユーザーORMモデルとドメインエンティティの変換
+同期・非同期リポジトリ実装で共有する
+"""
+import re
+from typing import Iterator, Sequence, TypeVar
+from sqlalchemy import true
+from sqlalchemy.exc import IntegrityError
+from domain.models.user import User
+from domain.value_objects.email import Email
+from infrastructure.db.models import UserModel
+
+T = TypeVar("T")
+
+# users.email の一意インデックス名（unique=True, index=True の列に SQLAlchemy が付ける名前）
+EMAIL_UNIQUE_INDEX = "ix_users_email"
+SQLITE_UNIQUE_VIOLATION = "UNIQUE constraint failed:"
+# ix_users_email_domain などには一致しないよう、前後が識別子の文字でないことを確認する
+_EMAIL_UNIQUE_INDEX_PATTERN = re.compile(rf"\b{EMAIL_UNIQUE_INDEX}\b")
+
+
+def model_to_entity(model: UserModel) -> User:
+    """ORMモデル（または entity_columns() を選択した行）をドメインエンティティに変換
+    
+    DBの値は保存時に検証済みのため、バリデーションを省略して復元する
+    """
+    return User.reconstruct(
+        id=model.id,
+        email=Email.trusted(model.email),
+        name=model.name,
+        created_at=model.created_at,
+        updated_at=model.updated_at
+    )
+
+
+def entity_columns() -> tuple:
+    """エンティティの復元に必要な列（ORMの状態管理を伴わない大量読み取り用）"""
+    return (UserModel.id, UserModel.email, UserModel.name, UserModel.created_at, UserModel.updated_at)
+
+
+def entity_to_values(user: User) -> dict:
+    """ドメインエンティティをINSERT/UPDATE用の列値に変換（IDを除く）"""
+    return {
+        "email": str(user.email),
+        "email_domain": user.email.domain,
+        "name": user.name,
+        "created_at": user.created_at,
+        "updated_at": user.updated_at,
+    }
+
+
+def active_user_condition():
+    """User.is_active の判定条件をSQLの条件式で表現する
+    
+    User.is_active を変更した場合はこちらも合わせて変更すること
+    """
+    # 現在のビジネスルールでは全ユーザーがアクティブ
+    return true()
+
+
+def is_email_conflict(error: IntegrityError) -> bool:
+    """users.email の一意制約違反かどうかを判定する
+    
+    email_domain のNOT NULL違反など、他の列の違反を取り違えないよう制約名・列名で照合する
+    """
+    orig = error.orig
+    # PostgreSQL（psycopg）は違反した制約名を返す
+    constraint_name = getattr(getattr(orig, "diag", None), "constraint_name", None)
+    if constraint_name is not None:
+        return constraint_name == EMAIL_UNIQUE_INDEX
+    message = str(orig)
+    # SQLite: "UNIQUE constraint failed: users.email"（複合制約では列が列挙される）
+    if message.startswith(SQLITE_UNIQUE_VIOLATION):
+        return message[len(SQLITE_UNIQUE_VIOLATION):].strip() == "users.email"
+    # その他のドライバーはメッセージに含まれるインデックス名で判定する
+    return _EMAIL_UNIQUE_INDEX_PATTERN.search(message) is not None
+
+
+# IN句1回あたりのバインド変数の上限（SQLiteの旧上限999を下回る値）
+IN_CLAUSE_CHUNK_SIZE = 500
+
+
+def chunks(values: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    """IN句に渡す値をバインド変数の上限以下に分割する"""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
@@ -0,0 +1,139 @@
+"""
+ユーザー参照用の読み取りモデル実装（SQLAlchemy）
+必要な列だけをタプルで取得し、ORMモデル・エンティティを作らずに応答DTOを組み立てる
+"""
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from domain.value_objects.email import Email
+from application.dtos.user_dto import UserResponseDTO, UserVersionDTO
+from application.queries.user_queries import AsyncUserQueryService, UserQueryService
+from infrastructure.db.models import UserModel
+from infrastructure.repositories.user_model_mapper import IN_CLAUSE_CHUNK_SIZE, chunks, entity_columns
+
+
+def _select_users():
+    return select(*entity_columns())
+
+
+def _page_statement(offset: int, limit: int):
+    return _select_users().order_by(UserModel.id).offset(offset).limit(limit)
+
+
+def _after_statement(after_id: Optional[int], limit: int):
+    statement = _select_users()
+    if after_id is not None:
+        statement = statement.where(UserModel.id > after_id)
+    return statement.order_by(UserModel.id).limit(limit)
+
+
+def _domain_statement(domain: str, offset: int, limit: int):
+    return (
+        _select_users()
+        .where(UserModel.email_domain == domain)
+        .order_by(UserModel.id)
+        .offset(offset)
+        .limit(limit)
+    )
+
+
+def _lookup_statements(ids: List[int], emails: List[Email]):
+    """IDとメールアドレスのIN句をチャンク単位に分けたSELECT文"""
+    for chunk in chunks(list(dict.fromkeys(ids)), IN_CLAUSE_CHUNK_SIZE):
+        yield _select_users().where(UserModel.id.in_(chunk))
+    values = list(dict.fromkeys(str(email) for email in emails))
+    for chunk in chunks(values, IN_CLAUSE_CHUNK_SIZE):
+        yield _select_users().where(UserModel.email.in_(chunk))
+
+
+def _version_statement(condition):
+    # 主キー・一意インデックスで1行に絞り、2列だけを取得する
+    return select(UserModel.id, UserModel.updated_at).where(condition)
+
+
+def _to_version(row) -> Optional[UserVersionDTO]:
+    return None if row is None else UserVersionDTO(id=row.id, updated_at=row.updated_at)
+
+
+def _to_dto(row) -> UserResponseDTO:
+    # 列の並びに依存しないよう、列名で DTO のフィールドに対応付ける
+    return UserResponseDTO(**row._mapping)
+
+
+def _to_dtos(rows) -> List[UserResponseDTO]:
+    return [_to_dto(row) for row in rows]
+
+
+class UserQueryServiceImpl(UserQueryService):
+    """ユーザー参照用の読み取りモデル実装"""
+    
+    def __init__(self, db_session: Session):
+        self._db_session = db_session
+    
+    def list_page(self, offset: int, limit: int) -> List[UserResponseDTO]:
+        return _to_dtos(self._db_session.execute(_page_statement(offset, limit)))
+    
+    def list_after(self, after_id: Optional[int], limit: int) -> List[UserResponseDTO]:
+        return _to_dtos(self._db_session.execute(_after_statement(after_id, limit)))
+    
+    def list_by_domain(self, domain: str, offset: int, limit: int) -> List[UserResponseDTO]:
+        return _to_dtos(self._db_session.execute(_domain_statement(domain, offset, limit)))
+    
+    def lookup(self, ids: List[int], emails: List[Email]) -> List[UserResponseDTO]:
+        users: Dict[int, UserResponseDTO] = {}
+        for statement in _lookup_statements(ids, emails):
+            for row in self._db_session.execute(statement):
+                users[row.id] = _to_dto(row)
+        return list(users.values())
+    
+    def iter_all(self, batch_size: int = 1000) -> Iterator[UserResponseDTO]:
+        result = self._db_session.execute(
+            _select_users().order_by(UserModel.id).execution_options(yield_per=batch_size)
+        )
+        for row in result:
+            yield _to_dto(row)
+    
+    def version_by_id(self, user_id: int) -> Optional[UserVersionDTO]:
+        return _to_version(self._db_session.execute(_version_statement(UserModel.id == user_id)).first())
+    
+    def version_by_email(self, email: Email) -> Optional[UserVersionDTO]:
+        return _to_version(self._db_session.execute(_version_statement(UserModel.email == str(email))).first())
+
+
+class AsyncUserQueryServiceImpl(AsyncUserQueryService):
+    """非同期ユーザー参照用の読み取りモデル実装"""
+    
+    def __init__(self, db_session: AsyncSession):
+        self._db_session = db_session
+    
+    async def list_page(self, offset: int, limit: int) -> List[UserResponseDTO]:
+        return _to_dtos(await self._db_session.execute(_page_statement(offset, limit)))
+    
+    async def list_after(self, after_id: Optional[int], limit: int) -> List[UserResponseDTO]:
+        return _to_dtos(await self._db_session.execute(_after_statement(after_id, limit)))
+    
+    async def list_by_domain(self, domain: str, offset: int, limit: int) -> List[UserResponseDTO]:
+        return _to_dtos(await self._db_session.execute(_domain_statement(domain, offset, limit)))
+    
+    async def lookup(self, ids: List[int], emails: List[Email]) -> List[UserResponseDTO]:
+        users: Dict[int, UserResponseDTO] = {}
+        for statement in _lookup_statements(ids, emails):
+            for row in await self._db_session.execute(statement):
+                users[row.id] = _to_dto(row)
+        return list(users.values())
+    
+    async def iter_all(self, batch_size: int = 1000) -> AsyncIterator[UserResponseDTO]:
+        result = await self._db_session.stream(
+            _select_users().order_by(UserModel.id).execution_options(yield_per=batch_size)
+        )
+        async for row in result:
+            yield _to_dto(row)
+    
+    async def version_by_id(self, user_id: int) -> Optional[UserVersionDTO]:
+        result = await self._db_session.execute(_version_statement(UserModel.id == user_id))
+        return _to_version(result.first())
+    
+    async def version_by_email(self, email: Email) -> Optional[UserVersionDTO]:
+        result = await self._db_session.execute(_version_statement(UserModel.email == str(email)))
+        return _to_version(result.first())
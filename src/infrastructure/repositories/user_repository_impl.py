@@ -1,16 +1,31 @@
 """
 ユーザーリポジトリ実装
 """
-from typing import List, Optional
+from typing import Iterator, List, Optional, Sequence, Set
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from domain.exceptions import DuplicateEmailError, UserNotFoundError
 from domain.models.user import User
 from domain.value_objects.email import Email
 from domain.repositories.user_repository import UserRepository
 from infrastructure.db.models import UserModel
+from infrastructure.repositories.user_model_mapper import (
+    IN_CLAUSE_CHUNK_SIZE,
+    active_user_condition,
+    chunks,
+    entity_columns,
+    entity_to_values,
+    is_email_conflict,
+    model_to_entity
+)
 
 
 class UserRepositoryImpl(UserRepository):
-    """ユーザーリポジトリ実装"""
+    """ユーザーリポジトリ実装
+    
+    トランザクションの確定・取り消しは呼び出し側（ユニットオブワーク）が行う
+    """
     
     def __init__(self, db_session: Session):
         self._db_session = db_session
@@ -19,26 +34,43 @@ class UserRepositoryImpl(UserRepository):
         """ユーザーを保存する"""
         if user.id is None:
             # 新規作成
-            user_model = UserModel(
-                email=str(user.email),
-                name=user.name,
-                created_at=user.created_at,
-                updated_at=user.updated_at
-            )
+            user_model = UserModel(**entity_to_values(user))
             self._db_session.add(user_model)
-            self._db_session.flush()  # IDを取得するためにflush
+            self._flush_or_raise_duplicate()  # IDを取得するためにflush
             user.id = user_model.id
         else:
-            # 更新
-            user_model = self._db_session.query(UserModel).filter(UserModel.id == user.id).first()
-            if user_model:
-                user_model.email = str(user.email)
-                user_model.name = user.name
-                user_model.updated_at = user.updated_at
+            # 更新（SELECTせずに UPDATE ... WHERE id = ? を1回だけ実行）
+            try:
+                result = self._db_session.execute(
+                    update(UserModel)
+                    .where(UserModel.id == user.id)
+                    .values(
+                        email=str(user.email),
+                        email_domain=user.email.domain,
+                        name=user.name,
+                        updated_at=user.updated_at
+                    )
+                )
+            except IntegrityError as e:
+                self._raise_integrity_error(e)
+            if result.rowcount == 0:
+                raise UserNotFoundError()
         
-        self._db_session.commit()
         return user
     
+    def save_all(self, users: List[User]) -> None:
+        """新規ユーザーを一括保存する（executemanyで一括INSERTする）
+        
+        IDは採番されるが、エンティティには反映しない
+        """
+        if not users:
+            return
+        
+        self._db_session.execute(
+            insert(UserModel),
+            [entity_to_values(user) for user in users]
+        )
+    
     def find_by_id(self, user_id: int) -> Optional[User]:
         """IDでユーザーを検索する"""
         user_model = self._db_session.query(UserModel).filter(UserModel.id == user_id).first()
@@ -55,32 +87,125 @@ class UserRepositoryImpl(UserRepository):
         
         return self._model_to_entity(user_model)
     
+    def find_by_ids(self, user_ids: List[int]) -> List[User]:
+        """複数のIDでユーザーをまとめて検索する（IN句をチャンク単位で実行）"""
+        users = []
+        for chunk in self._chunks(list(dict.fromkeys(user_ids))):
+            user_models = self._db_session.query(UserModel).filter(UserModel.id.in_(chunk)).all()
+            users.extend(self._model_to_entity(model) for model in user_models)
+        return users
+    
+    def find_by_emails(self, emails: List[Email]) -> List[User]:
+        """複数のメールアドレスでユーザーをまとめて検索する（IN句をチャンク単位で実行）"""
+        values = list(dict.fromkeys(str(email) for email in emails))
+        users = []
+        for chunk in self._chunks(values):
+            user_models = self._db_session.query(UserModel).filter(UserModel.email.in_(chunk)).all()
+            users.extend(self._model_to_entity(model) for model in user_models)
+        return users
+    
     def find_all(self) -> List[User]:
         """すべてのユーザーを取得する"""
         user_models = self._db_session.query(UserModel).all()
         return [self._model_to_entity(model) for model in user_models]
     
-    def delete(self, user_id: int) -> bool:
-        """ユーザーを削除する"""
-        user_model = self._db_session.query(UserModel).filter(UserModel.id == user_id).first()
-        if user_model is None:
-            return False
+    def iter_all(self, batch_size: int = 1000) -> Iterator[User]:
+        """すべてのユーザーをID順にストリーミング取得する
         
-        self._db_session.delete(user_model)
-        self._db_session.commit()
-        return True
+        yield_per によりサーバーサイドカーソルからバッチ単位で読み込み、
+        ORMの状態管理を避けるため列のみを選択する
+        """
+        result = self._db_session.execute(
+            select(*entity_columns()).order_by(UserModel.id).execution_options(yield_per=batch_size)
+        )
+        for row in result:
+            yield model_to_entity(row)
+    
+    def find_by_domain(self, domain: str, offset: int = 0, limit: Optional[int] = None) -> List[User]:
+        """指定ドメインのユーザーをID順に取得する（email_domain列のインデックスを使用）"""
+        query = (
+            self._db_session.query(UserModel)
+            .filter(UserModel.email_domain == domain.lower())
+            .order_by(UserModel.id)
+            .offset(offset)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        return [self._model_to_entity(model) for model in query.all()]
+    
+    def find_page(self, offset: int, limit: int) -> List[User]:
+        """ID順にページ単位でユーザーを取得する（LIMIT/OFFSETをSQLで実行）"""
+        user_models = (
+            self._db_session.query(UserModel)
+            .order_by(UserModel.id)
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        return [self._model_to_entity(model) for model in user_models]
+    
+    def find_after(self, after_id: Optional[int], limit: int) -> List[User]:
+        """指定IDより後ろのユーザーをID順に取得する（主キーでシークするため深さに依存しない）"""
+        query = self._db_session.query(UserModel)
+        if after_id is not None:
+            query = query.filter(UserModel.id > after_id)
+        user_models = query.order_by(UserModel.id).limit(limit).all()
+        return [self._model_to_entity(model) for model in user_models]
+    
+    def count(self) -> int:
+        """ユーザーの総数を取得する"""
+        return self._db_session.query(func.count(UserModel.id)).scalar()
+    
+    def count_active(self) -> int:
+        """アクティブなユーザー数を取得する（SELECT COUNT(*) で集計）"""
+        return (
+            self._db_session.query(func.count(UserModel.id))
+            .filter(active_user_condition())
+            .scalar()
+        )
+    
+    def delete(self, user_id: int) -> bool:
+        """ユーザーを削除する（DELETE ... WHERE id = ? を1回だけ実行）"""
+        result = self._db_session.execute(delete(UserModel).where(UserModel.id == user_id))
+        return result.rowcount > 0
     
     def exists_by_email(self, email: Email) -> bool:
         """メールアドレスが存在するかチェックする"""
         count = self._db_session.query(UserModel).filter(UserModel.email == str(email)).count()
         return count > 0
     
+    def find_existing_emails(self, emails: List[Email]) -> Set[Email]:
+        """指定されたメールアドレスのうち既に登録済みのものを取得する（IN句をチャンク単位で実行）"""
+        values = list(dict.fromkeys(str(email) for email in emails))
+        existing_emails = set()
+        for chunk in self._chunks(values):
+            rows = self._db_session.execute(
+                select(UserModel.email).where(UserModel.email.in_(chunk))
+            ).scalars()
+            existing_emails.update(Email(value) for value in rows)
+        return existing_emails
+    
+    def _flush_or_raise_duplicate(self) -> None:
+        """flushし、メールアドレスの一意制約違反をドメイン例外に変換する"""
+        try:
+            self._db_session.flush()
+        except IntegrityError as e:
+            self._raise_integrity_error(e)
+    
+    def _raise_integrity_error(self, error: IntegrityError) -> None:
+        """一意制約違反を変換して送出する（users.email 以外の違反はそのまま送出）
+        
+        セッションのロールバックはユニットオブワークに任せる
+        """
+        if is_email_conflict(error):
+            raise DuplicateEmailError() from error
+        raise error
+    
+    @staticmethod
+    def _chunks(values: Sequence) -> Iterator[Sequence]:
+        """IN句に渡す値をバインド変数の上限以下に分割する"""
+        return chunks(values, IN_CLAUSE_CHUNK_SIZE)
+    
     def _model_to_entity(self, model: UserModel) -> User:
         """ORMモデルをドメインエンティティに変換"""
-        return User(
-            id=model.id,
-            email=Email(model.email),
-            name=model.name,
-            created_at=model.created_at,
-            updated_at=model.updated_at
-        )
+        return model_to_entity(model)
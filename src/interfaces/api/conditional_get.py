@@ -0,0 +1,84 @@
+"""
+条件付きGET（ETag / Last-Modified）
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional
+from fastapi import Request, Response, status
+from application.dtos.user_dto import UserResponseDTO
+
+
+def to_utc(value: datetime) -> datetime:
+    """UTCに変換する（タイムゾーンなしの日時は datetime.now() で記録されたローカル時刻として扱う）"""
+    return value.astimezone(timezone.utc)
+
+
+def user_etag(user_id: int, updated_at: datetime) -> str:
+    """ユーザー1件の強いETag（更新日時はマイクロ秒まで含める）"""
+    return f'"{user_id}-{int(to_utc(updated_at).timestamp() * 1_000_000):x}"'
+
+
+def list_etag(users: Iterable[UserResponseDTO], *extra) -> str:
+    """一覧の弱いETag（各ユーザーのIDと更新日時、総件数などから求める）"""
+    digest = hashlib.blake2b(digest_size=16)
+    for value in extra:
+        digest.update(f"{value}|".encode())
+    for user in users:
+        digest.update(f"{user.id}:{to_utc(user.updated_at).timestamp()}|".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    """Last-Modified ヘッダー用の日時文字列"""
+    return format_datetime(to_utc(value).replace(microsecond=0), usegmt=True)
+
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        return to_utc(parsedate_to_datetime(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match の判定（GETのため弱い比較）"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """条件付きリクエストに対して304を返せるか判定する
+    
+    If-None-Match がある場合は If-Modified-Since より優先する
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        since = _parse_http_date(if_modified_since)
+        # Last-Modified は秒単位のため、比較も秒単位で行う
+        return since is not None and to_utc(last_modified).replace(microsecond=0) <= since
+    return False
+
+
+def has_conditional_headers(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """304レスポンス（本文なし、検証子ヘッダーのみ）"""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime] = None) -> None:
+    """ETag / Last-Modified ヘッダーを設定する"""
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
@@ -0,0 +1,50 @@
+"""
+書き込み直後の読み取り（read-your-writes）をクライアントごとに保証する
+書き込んだクライアントにCookieで期限を渡し、期限内のリクエストだけ読み取りをプライマリに送る
+"""
+import math
+import time
+from typing import AsyncIterator, Callable
+from fastapi import Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from infrastructure.db.session import get_async_session_factory
+
+COOKIE_NAME = "read_primary_until"
+
+
+def reads_from_primary(request: Request, clock: Callable[[], float] = time.time) -> bool:
+    """直近に書き込んだクライアントのリクエストであればTrue（Cookieの期限をサーバー側でも確認する）"""
+    value = request.cookies.get(COOKIE_NAME)
+    if value is None:
+        return False
+    try:
+        return float(value) > clock()
+    except ValueError:
+        return False
+
+
+def mark_client_write(response: Response, seconds: float, clock: Callable[[], float] = time.time) -> None:
+    """書き込んだクライアントに、以後 seconds 秒は読み取りをプライマリに送るCookieを設定する"""
+    if seconds <= 0:
+        return
+    response.set_cookie(
+        COOKIE_NAME,
+        f"{clock() + seconds:.3f}",
+        max_age=math.ceil(seconds),
+        httponly=True,
+        samesite="lax"
+    )
+
+
+async def get_client_async_db(
+    request: Request,
+    response: Response,
+    session_factory: Callable[..., AsyncSession] = Depends(get_async_session_factory)
+) -> AsyncIterator[AsyncSession]:
+    """依存性注入用の非同期データベースセッション（クライアント単位で read-your-writes を保証する）"""
+    async with session_factory(
+        read_primary=reads_from_primary(request),
+        on_write=lambda: mark_client_write(response, settings.DB_READ_YOUR_WRITES_SECONDS)
+    ) as db:
+        yield db
@@ -1,82 +1,215 @@
 """
 ユーザーAPI
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, Callable, List, Optional
+from app.config import settings
 from application.dtos.user_dto import (
     UserCreateDTO, 
     UserUpdateDTO, 
+    UserLookupDTO,
     UserResponseDTO,
     UserListResponseDTO
 )
-from application.services.user_app_service import UserAppService
-from infrastructure.repositories.user_repository_impl import UserRepositoryImpl
-from infrastructure.db.session import get_db
-from infrastructure.external_services.mail_service import MailService
+from application.services.async_user_app_service import AsyncUserAppService
+from application.services.user_export import UserExportFormatter
+from infrastructure.cache.email_filter import EmailFilterRefresher, email_filter
+from infrastructure.cache.user_cache import user_cache
+from infrastructure.db.session import db_session, get_async_session_factory
+from infrastructure.db.unit_of_work import SqlAlchemyAsyncUnitOfWork
+from infrastructure.repositories.user_query_service_impl import AsyncUserQueryServiceImpl
+from interfaces.api.conditional_get import (
+    has_conditional_headers,
+    is_not_modified,
+    list_etag,
+    not_modified_response,
+    set_validators,
+    user_etag
+)
+from interfaces.api.read_your_writes import get_client_async_db
+from infrastructure.external_services.mail_service import mail_service
+from infrastructure.external_services.outbox_relay import OutboxRelay, mail_dispatcher
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+# 一括検索で指定できるIDとメールアドレスの合計件数の上限
+MAX_LOOKUP_ITEMS = 1000
+
+# メールアドレス存在フィルタの構築・定期再構築（有効時のみ初回利用時に起動）
+email_filter_refresher = EmailFilterRefresher(
+    email_filter,
+    lambda: db_session.engine,
+    settings.EMAIL_FILTER_REBUILD_SECONDS
+)
+
+# アウトボックスのリレー（メール設定がある場合のみ初回利用時に起動）
+outbox_relay = OutboxRelay(
+    lambda: db_session.engine,
+    mail_dispatcher(mail_service),
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    concurrency=settings.OUTBOX_CONCURRENCY,
+    lease_seconds=settings.OUTBOX_LEASE_SECONDS,
+    max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+    backoff_seconds=settings.OUTBOX_BACKOFF_SECONDS,
+    poll_seconds=settings.OUTBOX_POLL_SECONDS,
+    retention_seconds=settings.OUTBOX_RETENTION_SECONDS,
+    purge_interval_seconds=settings.OUTBOX_PURGE_INTERVAL_SECONDS
+)
+
 
-def get_user_app_service(db: Session = Depends(get_db)) -> UserAppService:
+def ensure_unsharded() -> None:
+    """シャーディング構成ではAPIを使えないことを示す（APIは DATABASE_URL の単一DBだけを扱うため）"""
+    if settings.DATABASE_SHARD_URLS:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="シャーディング構成ではAPIからユーザーを操作できません。CLIを使用してください"
+        )
+
+
+def get_user_app_service(
+    _: None = Depends(ensure_unsharded),
+    db: AsyncSession = Depends(get_client_async_db)
+) -> AsyncUserAppService:
     """ユーザーアプリケーションサービスの依存性注入"""
-    user_repository = UserRepositoryImpl(db)
-    return UserAppService(user_repository)
+    cache = user_cache if settings.USER_CACHE_ENABLED else None
+    existence_filter = None
+    if settings.EMAIL_FILTER_ENABLED:
+        email_filter_refresher.ensure_started()
+        existence_filter = email_filter
+    # リレーが動かない構成（メール未設定）ではアウトボックスに記録しない
+    if mail_service.is_configured:
+        outbox_relay.ensure_started()
+    return AsyncUserAppService(
+        SqlAlchemyAsyncUnitOfWork(
+            db,
+            user_cache=cache,
+            email_filter=existence_filter,
+            record_outbox=mail_service.is_configured
+        ),
+        AsyncUserQueryServiceImpl(db)
+    )
 
 
 @router.post("/", response_model=UserResponseDTO, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     user_data: UserCreateDTO,
-    user_service: UserAppService = Depends(get_user_app_service)
+    user_service: AsyncUserAppService = Depends(get_user_app_service)
 ):
     """ユーザーを作成する"""
     try:
-        user = user_service.create_user(user_data)
-        
-        # ウェルカムメールを送信
-        mail_service = MailService()
-        mail_service.send_welcome_email(user_data.email, user_data.name)
-        
-        return user
+        # ウェルカムメールはユーザーと同じトランザクションでアウトボックスに記録され、リレーが送信する
+        return await user_service.create_user(user_data)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="内部サーバーエラー")
 
 
+@router.post("/lookup", response_model=List[UserResponseDTO])
+async def lookup_users(
+    lookup_data: UserLookupDTO,
+    user_service: AsyncUserAppService = Depends(get_user_app_service)
+):
+    """IDとメールアドレスの一覧でユーザーをまとめて取得する"""
+    if len(lookup_data.ids) + len(lookup_data.emails) > MAX_LOOKUP_ITEMS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"一度に検索できるのは{MAX_LOOKUP_ITEMS}件までです")
+    try:
+        return await user_service.lookup_users(lookup_data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/export")
+async def export_users(
+    format: str = "ndjson",
+    batch_size: int = 1000,
+    session_factory: Callable[[], AsyncSession] = Depends(get_async_session_factory),
+    _: None = Depends(ensure_unsharded)
+):
+    """全ユーザーをNDJSONまたはCSVでストリーミング出力する"""
+    try:
+        formatter = UserExportFormatter(format)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if batch_size < 1 or batch_size > 10000:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="バッチサイズは1-10000の範囲で指定してください")
+    
+    async def body() -> AsyncIterator[str]:
+        # 依存性注入のセッションはレスポンス送信前に閉じられ得るため、送信中に使うセッションを自前で開く
+        async with session_factory() as db:
+            user_service = AsyncUserAppService(SqlAlchemyAsyncUnitOfWork(db), AsyncUserQueryServiceImpl(db))
+            lines = [formatter.header()]
+            async for user in user_service.iter_users(batch_size):
+                lines.append(formatter.format(user))
+                if len(lines) >= batch_size:
+                    yield "".join(lines)
+                    lines = []
+            yield "".join(lines)
+    
+    return StreamingResponse(
+        body(),
+        media_type=formatter.media_type,
+        headers={"Content-Disposition": f'attachment; filename="users.{formatter.file_format}"'}
+    )
+
+
 @router.get("/{user_id}", response_model=UserResponseDTO)
-def get_user(
+async def get_user(
     user_id: int,
-    user_service: UserAppService = Depends(get_user_app_service)
+    request: Request,
+    response: Response,
+    user_service: AsyncUserAppService = Depends(get_user_app_service)
 ):
-    """IDでユーザーを取得する"""
-    user = user_service.get_user_by_id(user_id)
+    """IDでユーザーを取得する（ETag / Last-Modified による条件付きGETに対応）"""
+    if has_conditional_headers(request):
+        # 更新日時だけを主キーで確認し、変更がなければ本文を組み立てずに304を返す
+        version = await user_service.get_user_version(user_id)
+        if version is not None:
+            etag = user_etag(version.id, version.updated_at)
+            if is_not_modified(request, etag, version.updated_at):
+                return not_modified_response(etag, version.updated_at)
+    
+    user = await user_service.get_user_by_id(user_id)
     if user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ユーザーが見つかりません")
+    set_validators(response, user_etag(user.id, user.updated_at), user.updated_at)
     return user
 
 
 @router.get("/email/{email}", response_model=UserResponseDTO)
-def get_user_by_email(
+async def get_user_by_email(
     email: str,
-    user_service: UserAppService = Depends(get_user_app_service)
+    request: Request,
+    response: Response,
+    user_service: AsyncUserAppService = Depends(get_user_app_service)
 ):
-    """メールアドレスでユーザーを取得する"""
-    user = user_service.get_user_by_email(email)
+    """メールアドレスでユーザーを取得する（ETag / Last-Modified による条件付きGETに対応）"""
+    if has_conditional_headers(request):
+        # 更新日時だけを一意インデックスで確認し、変更がなければ本文を組み立てずに304を返す
+        version = await user_service.get_user_version_by_email(email)
+        if version is not None:
+            etag = user_etag(version.id, version.updated_at)
+            if is_not_modified(request, etag, version.updated_at):
+                return not_modified_response(etag, version.updated_at)
+    
+    user = await user_service.get_user_by_email(email)
     if user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ユーザーが見つかりません")
+    set_validators(response, user_etag(user.id, user.updated_at), user.updated_at)
     return user
 
 
 @router.put("/{user_id}", response_model=UserResponseDTO)
-def update_user(
+async def update_user(
     user_id: int,
     user_data: UserUpdateDTO,
-    user_service: UserAppService = Depends(get_user_app_service)
+    user_service: AsyncUserAppService = Depends(get_user_app_service)
 ):
     """ユーザーを更新する"""
     try:
-        user = user_service.update_user(user_id, user_data)
+        user = await user_service.update_user(user_id, user_data)
         if user is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ユーザーが見つかりません")
         return user
@@ -85,44 +218,91 @@ def update_user(
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(
+async def delete_user(
     user_id: int,
-    user_service: UserAppService = Depends(get_user_app_service)
+    user_service: AsyncUserAppService = Depends(get_user_app_service)
 ):
     """ユーザーを削除する"""
-    success = user_service.delete_user(user_id)
+    success = await user_service.delete_user(user_id)
     if not success:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ユーザーが見つかりません")
 
 
 @router.get("/", response_model=UserListResponseDTO)
-def get_users(
+async def get_users(
+    request: Request,
+    response: Response,
     page: int = 1,
     per_page: int = 10,
-    user_service: UserAppService = Depends(get_user_app_service)
+    after: Optional[str] = None,
+    limit: Optional[int] = None,
+    user_service: AsyncUserAppService = Depends(get_user_app_service)
 ):
-    """ユーザー一覧を取得する"""
-    if page < 1:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ページ番号は1以上である必要があります")
-    if per_page < 1 or per_page > 100:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="1ページあたりの件数は1-100の範囲で指定してください")
+    """ユーザー一覧を取得する
+    
+    after または limit を指定した場合はカーソル方式で取得する。
+    ページ内容から求めた弱いETagを返し、一致すれば304を返す
+    """
+    if after is not None or limit is not None:
+        limit = limit if limit is not None else per_page
+        if limit < 1 or limit > 100:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="取得件数は1-100の範囲で指定してください")
+        try:
+            result = await user_service.get_users_after(after, limit)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    else:
+        if page < 1:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ページ番号は1以上である必要があります")
+        if per_page < 1 or per_page > 100:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="1ページあたりの件数は1-100の範囲で指定してください")
+        result = await user_service.get_users(page, per_page)
     
-    return user_service.get_users(page, per_page)
+    etag = list_etag(result.users, result.total_count, result.next_cursor)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_validators(response, etag)
+    return result
 
 
 @router.get("/stats/active-count")
-def get_active_users_count(
-    user_service: UserAppService = Depends(get_user_app_service)
+async def get_active_users_count(
+    user_service: AsyncUserAppService = Depends(get_user_app_service)
 ):
     """アクティブなユーザー数を取得する"""
-    count = user_service.get_active_users_count()
+    count = await user_service.get_active_users_count()
     return {"active_users_count": count}
 
 
+@router.get("/stats/cache")
+async def get_user_cache_stats():
+    """ユーザーキャッシュの統計情報を取得する"""
+    return user_cache.stats().to_dict()
+
+
+@router.get("/stats/email-filter")
+async def get_email_filter_stats():
+    """メールアドレス存在フィルタの統計情報を取得する"""
+    return email_filter.stats().to_dict()
+
+
+@router.get("/stats/outbox")
+def get_outbox_stats():
+    """アウトボックスのリレーの統計情報と未配送の件数を取得する（同期DBを参照するためスレッドプールで実行する）"""
+    return {**outbox_relay.stats().to_dict(), **outbox_relay.backlog().to_dict()}
+
+
 @router.get("/domain/{domain}", response_model=List[UserResponseDTO])
-def get_users_by_domain(
+async def get_users_by_domain(
     domain: str,
-    user_service: UserAppService = Depends(get_user_app_service)
+    page: int = 1,
+    per_page: int = 100,
+    user_service: AsyncUserAppService = Depends(get_user_app_service)
 ):
     """指定されたドメインのユーザーを取得する"""
-    return user_service.get_users_by_domain(domain)
+    if page < 1:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ページ番号は1以上である必要があります")
+    if per_page < 1 or per_page > 100:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="1ページあたりの件数は1-100の範囲で指定してください")
+    
+    return await user_service.get_users_by_domain(domain, page, per_page)
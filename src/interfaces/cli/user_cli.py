@@ -1,20 +1,33 @@
 """
 ユーザーCLI
 """
+import csv
+import json
+from typing import Iterator, List, TextIO
 import click
 from sqlalchemy.orm import Session
-from application.dtos.user_dto import UserCreateDTO
+from app.config import settings
+from application.dtos.user_dto import UserCreateDTO, UserImportErrorDTO
 from application.services.user_app_service import UserAppService
-from infrastructure.repositories.user_repository_impl import UserRepositoryImpl
+from application.services.user_export import EXPORT_FORMATS, UserExportFormatter
 from infrastructure.db.session import db_session
+from infrastructure.db.sharding import get_sharded_db_session
+from infrastructure.db.unit_of_work import ShardedUnitOfWork, SqlAlchemyUnitOfWork
+from infrastructure.external_services.mail_service import mail_service
+from infrastructure.external_services.outbox_relay import OutboxRelay, mail_dispatcher
+from infrastructure.repositories.user_query_service_impl import UserQueryServiceImpl
 
 
 def get_user_service() -> UserAppService:
-    """ユーザーアプリケーションサービスを取得"""
+    """ユーザーアプリケーションサービスを取得（DATABASE_SHARD_URLS 指定時はシャーディング構成）"""
+    if settings.DATABASE_SHARD_URLS:
+        sharded_db_session = get_sharded_db_session()
+        return UserAppService(ShardedUnitOfWork(sharded_db_session.get_sessions(), sharded_db_session.executor))
+    
     db = db_session.get_session()
     try:
-        user_repository = UserRepositoryImpl(db)
-        return UserAppService(user_repository)
+        # メール未設定では relay-outbox で配送できないため、アウトボックスに記録しない
+        return UserAppService(SqlAlchemyUnitOfWork(db, record_outbox=mail_service.is_configured), UserQueryServiceImpl(db))
     finally:
         db.close()
 
@@ -80,20 +93,29 @@ def get(user_id: int = None, email: str = None):
 
 
 @user_cli.command()
-@click.option('--page', type=int, default=1, help='ページ番号')
+@click.option('--page', type=int, help='ページ番号（シャーディング構成では省略時にカーソル方式で表示する）')
 @click.option('--per-page', type=int, default=10, help='1ページあたりの件数')
-def list_users(page: int, per_page: int):
+@click.option('--cursor', help='前回表示された「次のカーソル」から続きを表示する')
+def list_users(page: int, per_page: int, cursor: str = None):
     """ユーザー一覧を表示する"""
     try:
         user_service = get_user_service()
-        result = user_service.get_users(page, per_page)
         
-        click.echo(f"ユーザー一覧 (全{result.total_count}件, ページ{result.page}/{result.total_count // result.per_page + 1}):")
+        # シャーディング構成のページ番号方式は各シャードから先頭からの全件を読むため、カーソル方式を既定とする
+        if cursor is not None or (page is None and settings.DATABASE_SHARD_URLS):
+            result = user_service.get_users_after(cursor, per_page)
+            click.echo(f"ユーザー一覧 ({len(result.users)}件):")
+        else:
+            result = user_service.get_users(page or 1, per_page)
+            click.echo(f"ユーザー一覧 (全{result.total_count}件, ページ{result.page}/{result.total_count // result.per_page + 1}):")
         click.echo("-" * 80)
         
         for user in result.users:
             click.echo(f"ID: {user.id:3d} | {user.email:30s} | {user.name:20s} | {user.created_at.strftime('%Y-%m-%d %H:%M')}")
         
+        if result.next_cursor:
+            click.echo(f"次のカーソル: {result.next_cursor}")
+        
     except Exception as e:
         click.echo(f"エラー: {e}", err=True)
 
@@ -149,6 +171,87 @@ def delete(user_id: int):
         click.echo(f"エラー: {e}", err=True)
 
 
+def _read_csv_rows(file: TextIO) -> Iterator[UserCreateDTO]:
+    """CSV（email,nameヘッダー付き）を1行ずつDTOに変換する"""
+    for row in csv.DictReader(file):
+        yield UserCreateDTO(email=row.get('email') or '', name=row.get('name') or '')
+
+
+def _read_jsonl_rows(file: TextIO, errors: List[UserImportErrorDTO]) -> Iterator[UserCreateDTO]:
+    """JSONL（1行1オブジェクト）を1行ずつDTOに変換する
+    
+    JSONとして読めない行は中断せずに errors に記録して読み飛ばす（途中のチャンクはコミット済みのため）
+    """
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+            if not isinstance(data, dict):
+                raise ValueError("オブジェクトではありません")
+        except ValueError as e:
+            errors.append(UserImportErrorDTO(row=line_number, email='', reason=f"JSONが不正です: {e}"))
+            continue
+        yield UserCreateDTO(email=data.get('email') or '', name=data.get('name') or '')
+
+
+@user_cli.command(name='import')
+@click.argument('file', type=click.File('r', encoding='utf-8'))
+@click.option('--format', 'file_format', type=click.Choice(['csv', 'jsonl']), help='入力形式（省略時は拡張子から判定）')
+@click.option('--chunk-size', type=int, default=1000, help='1回のINSERT・コミットで処理する件数')
+def import_users(file: TextIO, file_format: str = None, chunk_size: int = 1000):
+    """CSV/JSONLファイルからユーザーを一括インポートする"""
+    if file_format is None:
+        file_format = 'jsonl' if file.name.endswith(('.jsonl', '.ndjson')) else 'csv'
+    # JSONとして読めなかった行（JSONLのみ）。インポート結果とは別に報告する
+    read_errors: List[UserImportErrorDTO] = []
+    rows = _read_jsonl_rows(file, read_errors) if file_format == 'jsonl' else _read_csv_rows(file)
+    
+    try:
+        user_service = get_user_service()
+        result = user_service.import_users(rows, chunk_size)
+        
+        click.echo(
+            f"インポートが完了しました: 成功 {result.imported_count}件, エラー {result.error_count}件, "
+            f"読み込めなかった行 {len(read_errors)}件"
+        )
+        for error in result.errors[:20]:
+            click.echo(f"  {error.row}行目 | {error.email} | {error.reason}", err=True)
+        if result.error_count > 20:
+            click.echo(f"  ...ほか {result.error_count - 20}件", err=True)
+        # 読み込めなかった行の番号はファイルの行番号（空行を含む）
+        for error in read_errors[:20]:
+            click.echo(f"  ファイルの{error.row}行目 | {error.reason}", err=True)
+        if len(read_errors) > 20:
+            click.echo(f"  ...ほか {len(read_errors) - 20}件", err=True)
+        
+    except ValueError as e:
+        click.echo(f"エラー: {e}", err=True)
+    except Exception as e:
+        click.echo(f"予期しないエラー: {e}", err=True)
+
+
+@user_cli.command(name='export')
+@click.option('--output', '-o', type=click.File('w', encoding='utf-8'), default='-', help='出力先ファイル（省略時は標準出力）')
+@click.option('--format', 'file_format', type=click.Choice(EXPORT_FORMATS), default='ndjson', help='出力形式')
+@click.option('--batch-size', type=int, default=1000, help='1回の読み込みで取得する件数')
+def export_users(output: TextIO, file_format: str, batch_size: int):
+    """全ユーザーをNDJSON/CSVでエクスポートする"""
+    try:
+        user_service = get_user_service()
+        formatter = UserExportFormatter(file_format)
+        output.write(formatter.header())
+        count = 0
+        for user in user_service.iter_users(batch_size):
+            output.write(formatter.format(user))
+            count += 1
+        
+        click.echo(f"エクスポートが完了しました: {count}件", err=True)
+        
+    except Exception as e:
+        click.echo(f"エラー: {e}", err=True)
+
+
 @user_cli.command()
 def stats():
     """統計情報を表示する"""
@@ -162,5 +265,47 @@ def stats():
         click.echo(f"エラー: {e}", err=True)
 
 
+@user_cli.command(name='relay-outbox')
+@click.option('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE, help='1回に取得するメッセージ数')
+@click.option('--concurrency', type=int, default=settings.OUTBOX_CONCURRENCY, help='バッチ内の同時配送数')
+def relay_outbox(batch_size: int, concurrency: int):
+    """アウトボックスに溜まったメールを配送可能なものがなくなるまで送信する"""
+    if not mail_service.is_configured:
+        click.echo("メール設定が不完全です。配送をスキップします。", err=True)
+        return
+    
+    try:
+        relay = OutboxRelay(
+            lambda: db_session.engine,
+            mail_dispatcher(mail_service),
+            batch_size=batch_size,
+            concurrency=concurrency,
+            lease_seconds=settings.OUTBOX_LEASE_SECONDS,
+            max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+            backoff_seconds=settings.OUTBOX_BACKOFF_SECONDS,
+            retention_seconds=settings.OUTBOX_RETENTION_SECONDS
+        )
+    except ValueError as e:
+        click.echo(f"エラー: {e}", err=True)
+        return
+    
+    try:
+        relay.drain()
+        relay.purge()
+        result = relay.stats()
+        click.echo(
+            f"配送が完了しました: 成功 {result.dispatched}件, 再送予定 {result.retries}件, "
+            f"失敗 {result.failed}件, 保持期間切れで削除 {result.purged}件"
+        )
+        
+    except ValueError as e:
+        click.echo(f"エラー: {e}", err=True)
+    except Exception as e:
+        click.echo(f"予期しないエラー: {e}", err=True)
+    finally:
+        relay.stop()
+        mail_service.close()
+
+
 if __name__ == '__main__':
     user_cli()
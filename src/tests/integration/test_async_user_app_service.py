@@ -0,0 +1,130 @@
+"""
+非同期ユーザーアプリケーションサービスの結合テスト
+"""
+import asyncio
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from application.dtos.user_dto import UserCreateDTO, UserLookupDTO, UserUpdateDTO
+from application.services.async_user_app_service import AsyncUserAppService
+from infrastructure.db.unit_of_work import SqlAlchemyAsyncUnitOfWork
+from infrastructure.db.models import Base, UserModel
+
+
+class TestAsyncUserAppServiceIntegration:
+    """非同期ユーザーアプリケーションサービスの結合テスト"""
+    
+    @pytest.fixture
+    def loop(self):
+        """テスト用イベントループ"""
+        loop = asyncio.new_event_loop()
+        yield loop
+        loop.close()
+    
+    @pytest.fixture
+    def run(self, loop):
+        """コルーチンを完了まで実行する関数"""
+        return loop.run_until_complete
+    
+    @pytest.fixture
+    def db_session(self, run):
+        """テスト用非同期データベースセッション"""
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        
+        async def create_tables():
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+        
+        run(create_tables())
+        SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+        session = SessionLocal()
+        yield session
+        run(session.close())
+        run(engine.dispose())
+    
+    @pytest.fixture
+    def user_app_service(self, db_session):
+        """非同期ユーザーアプリケーションサービス"""
+        return AsyncUserAppService(SqlAlchemyAsyncUnitOfWork(db_session))
+    
+    def test_create_and_get_user(self, run, user_app_service):
+        """ユーザー作成・取得テスト"""
+        created_user = run(user_app_service.create_user(
+            UserCreateDTO(email="test@example.com", name="テストユーザー")
+        ))
+        
+        assert created_user.id is not None
+        assert run(user_app_service.get_user_by_id(created_user.id)).email == "test@example.com"
+        assert run(user_app_service.get_user_by_email("test@example.com")).id == created_user.id
+        assert run(user_app_service.get_user_by_id(999)) is None
+    
+    def test_create_user_with_duplicate_email_raises_error(self, run, user_app_service):
+        """重複メールアドレスでユーザー作成時にエラーが発生するテスト"""
+        run(user_app_service.create_user(UserCreateDTO(email="test@example.com", name="ユーザー1")))
+        
+        with pytest.raises(ValueError, match="このメールアドレスは既に使用されています"):
+            run(user_app_service.create_user(UserCreateDTO(email="test@example.com", name="ユーザー2")))
+    
+    def test_update_and_delete_user(self, run, user_app_service):
+        """ユーザー更新・削除テスト"""
+        user1 = run(user_app_service.create_user(UserCreateDTO(email="user1@example.com", name="ユーザー1")))
+        run(user_app_service.create_user(UserCreateDTO(email="user2@example.com", name="ユーザー2")))
+        
+        updated_user = run(user_app_service.update_user(user1.id, UserUpdateDTO(name="更新された名前")))
+        assert updated_user.name == "更新された名前"
+        
+        with pytest.raises(ValueError, match="このメールアドレスは既に使用されています"):
+            run(user_app_service.update_user(user1.id, UserUpdateDTO(email="user2@example.com")))
+        
+        assert run(user_app_service.delete_user(user1.id)) is True
+        assert run(user_app_service.delete_user(user1.id)) is False
+    
+    def test_update_user_deleted_concurrently_returns_none(self, run, db_session, user_app_service):
+        """取得後に並行して削除されたユーザーの更新はNoneを返すテスト"""
+        user = run(user_app_service.create_user(UserCreateDTO(email="user1@example.com", name="ユーザー1")))
+        repository = user_app_service._user_repository
+        find_by_id = repository.find_by_id
+        
+        async def find_then_delete(user_id):
+            found = await find_by_id(user_id)
+            await db_session.execute(delete(UserModel).where(UserModel.id == user_id))
+            return found
+        
+        repository.find_by_id = find_then_delete
+        
+        assert run(user_app_service.update_user(user.id, UserUpdateDTO(name="更新された名前"))) is None
+    
+    def test_list_queries(self, run, user_app_service):
+        """一覧・集計系の取得テスト"""
+        for i in range(5):
+            domain = "example.com" if i % 2 == 0 else "test.com"
+            run(user_app_service.create_user(UserCreateDTO(email=f"user{i}@{domain}", name=f"ユーザー{i}")))
+        
+        page = run(user_app_service.get_users(page=2, per_page=3))
+        assert page.total_count == 5
+        assert len(page.users) == 2
+        
+        first = run(user_app_service.get_users_after(limit=3))
+        second = run(user_app_service.get_users_after(first.next_cursor, limit=3))
+        assert [user.id for user in first.users + second.users] == [1, 2, 3, 4, 5]
+        assert second.next_cursor is None
+        
+        assert run(user_app_service.get_active_users_count()) == 5
+        assert len(run(user_app_service.get_users_by_domain("example.com"))) == 3
+        
+        found = run(user_app_service.lookup_users(UserLookupDTO(ids=[1, 2], emails=["user2@example.com"])))
+        assert sorted(user.id for user in found) == [1, 2, 3]
+        
+        with pytest.raises(ValueError, match="2件目のメールアドレス"):
+            run(user_app_service.lookup_users(UserLookupDTO(emails=["user2@example.com", "invalid"])))
+    
+    def test_iter_users(self, run, user_app_service):
+        """全ユーザーをストリーミング取得するテスト"""
+        for i in range(5):
+            run(user_app_service.create_user(UserCreateDTO(email=f"user{i}@example.com", name=f"ユーザー{i}")))
+        
+        async def collect():
+            return [user.email async for user in user_app_service.iter_users(batch_size=2)]
+        
+        assert run(collect()) == [f"user{i}@example.com" for i in range(5)]
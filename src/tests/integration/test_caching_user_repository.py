@@ -0,0 +1,94 @@
+"""
+キャッシュ付きユーザーリポジトリの結合テスト
+"""
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from domain.models.user import User
+from domain.value_objects.email import Email
+from infrastructure.cache.user_cache import UserCache
+from infrastructure.db.models import Base
+from infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+
+
+class TestCachingUserRepositoryIntegration:
+    """キャッシュ付きユーザーリポジトリの結合テスト"""
+    
+    @pytest.fixture
+    def session_factory(self, tmp_path):
+        """テスト用セッションファクトリー"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+        Base.metadata.create_all(engine)
+        yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        engine.dispose()
+    
+    @pytest.fixture
+    def cache(self):
+        return UserCache(maxsize=100, ttl_seconds=60)
+    
+    @pytest.fixture
+    def saved_user(self, session_factory, cache):
+        session = session_factory()
+        uow = SqlAlchemyUnitOfWork(session, user_cache=cache)
+        with uow:
+            now = datetime.now()
+            user = uow.users.save(
+                User(id=None, email=Email("cached@example.com"), name="テストユーザー", created_at=now, updated_at=now)
+            )
+            uow.commit()
+        session.close()
+        return user
+    
+    def _uow(self, session_factory, cache) -> SqlAlchemyUnitOfWork:
+        return SqlAlchemyUnitOfWork(session_factory(), user_cache=cache)
+    
+    def test_read_through(self, session_factory, cache, saved_user):
+        """2回目以降の取得がキャッシュから返るテスト"""
+        uow = self._uow(session_factory, cache)
+        
+        assert uow.users.find_by_id(saved_user.id).name == "テストユーザー"
+        assert uow.users.find_by_email(Email("cached@example.com")).id == saved_user.id
+        
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (1, 1)
+    
+    def test_update_invalidates_both_indexes(self, session_factory, cache, saved_user):
+        """メールアドレス変更後、古いメールアドレスでヒットせず新しい値が返るテスト"""
+        uow = self._uow(session_factory, cache)
+        uow.users.find_by_id(saved_user.id)
+        
+        with uow:
+            user = uow.users.find_by_id(saved_user.id)
+            user.change_email(Email("changed@example.com"))
+            uow.users.save(user)
+            uow.commit()
+        
+        reader = self._uow(session_factory, cache)
+        assert reader.users.find_by_email(Email("cached@example.com")) is None
+        assert reader.users.find_by_id(saved_user.id).email == Email("changed@example.com")
+    
+    def test_rollback_discards_uncommitted_reads(self, session_factory, cache, saved_user):
+        """ロールバックした変更がキャッシュに残らないテスト"""
+        uow = self._uow(session_factory, cache)
+        
+        with uow:
+            user = uow.users.find_by_id(saved_user.id)
+            user.change_name("未確定の名前")
+            uow.users.save(user)
+            # 同一トランザクション内の読み直しで未確定の値がキャッシュされる
+            assert uow.users.find_by_id(saved_user.id).name == "未確定の名前"
+        
+        reader = self._uow(session_factory, cache)
+        assert reader.users.find_by_id(saved_user.id).name == "テストユーザー"
+    
+    def test_delete_invalidates(self, session_factory, cache, saved_user):
+        """削除後にキャッシュから返らないテスト"""
+        uow = self._uow(session_factory, cache)
+        uow.users.find_by_id(saved_user.id)
+        
+        with uow:
+            assert uow.users.delete(saved_user.id) is True
+            uow.commit()
+        
+        assert self._uow(session_factory, cache).users.find_by_id(saved_user.id) is None
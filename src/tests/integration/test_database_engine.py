@@ -0,0 +1,49 @@
+"""
+データベースエンジン設定の結合テスト
+"""
+import pytest
+from sqlalchemy import text
+from app.config import Settings, _to_async_url
+from infrastructure.db.models import create_async_database_engine, create_database_engine
+
+
+class TestDatabaseEngineIntegration:
+    """データベースエンジン設定の結合テスト"""
+    
+    def test_sqlite_pragmas_are_applied(self, tmp_path):
+        """SQLiteのPRAGMAが接続時に適用されるテスト"""
+        config = Settings()
+        config.SQLITE_BUSY_TIMEOUT = 1234
+        config.SQLITE_CACHE_SIZE = -2000
+        engine = create_database_engine(f"sqlite:///{tmp_path / 'app.db'}", config)
+        
+        with engine.connect() as connection:
+            assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+            assert connection.execute(text("PRAGMA cache_size")).scalar() == -2000
+        
+        assert engine.pool.size() == config.DB_POOL_SIZE
+    
+    def test_memory_sqlite_engine(self):
+        """インメモリSQLiteではプール設定を指定せずに作成できるテスト"""
+        engine = create_database_engine("sqlite:///:memory:")
+        
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT 1")).scalar() == 1
+    
+    @pytest.mark.parametrize("url, expected", [
+        ("sqlite:///./app.db", "sqlite+aiosqlite:///./app.db"),
+        ("postgresql://user:pass@db/app", "postgresql+asyncpg://user:pass@db/app"),
+        ("postgresql+psycopg2://user@db/app", "postgresql+asyncpg://user@db/app"),
+        ("mysql+pymysql://user@db/app", "mysql+aiomysql://user@db/app"),
+        ("postgresql+asyncpg://user@db/app", "postgresql+asyncpg://user@db/app"),
+    ])
+    def test_to_async_url(self, url, expected):
+        """既知の同期ドライバーのURLが非同期ドライバーに置き換わるテスト"""
+        assert _to_async_url(url) == expected
+    
+    def test_sync_driver_for_async_engine_raises_clear_error(self):
+        """非同期エンジンに同期ドライバーを指定すると設定を示すエラーになるテスト"""
+        with pytest.raises(ValueError, match="ASYNC_DATABASE_URL"):
+            create_async_database_engine("sqlite:///:memory:")
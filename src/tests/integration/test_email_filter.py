@@ -0,0 +1,144 @@
+"""
+メールアドレス存在フィルタの結合テスト
+"""
+import time
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from domain.models.user import User
+from domain.value_objects.email import Email
+from infrastructure.cache.email_filter import EmailExistenceFilter, EmailFilterRefresher, rebuild_email_filter
+from infrastructure.db.models import Base
+from infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+
+
+class TestEmailFilterIntegration:
+    """メールアドレス存在フィルタの結合テスト"""
+    
+    @pytest.fixture
+    def engine(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+        Base.metadata.create_all(engine)
+        yield engine
+        engine.dispose()
+    
+    @pytest.fixture
+    def session_factory(self, engine):
+        return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    
+    @pytest.fixture
+    def email_filter(self):
+        return EmailExistenceFilter(capacity=1000, false_positive_rate=0.01)
+    
+    @pytest.fixture
+    def queries(self, engine):
+        """発行されたSELECT文を記録する"""
+        statements = []
+        
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+        
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        yield statements
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    
+    def _save(self, session_factory, email_filter, email: str) -> User:
+        session = session_factory()
+        uow = SqlAlchemyUnitOfWork(session, email_filter=email_filter)
+        with uow:
+            now = datetime.now()
+            user = uow.users.save(
+                User(id=None, email=Email(email), name="テストユーザー", created_at=now, updated_at=now)
+            )
+            uow.commit()
+        session.close()
+        return user
+    
+    def test_unbuilt_filter_falls_through(self, session_factory, email_filter):
+        """構築前はすべてDBに問い合わせるテスト"""
+        self._save(session_factory, email_filter, "user1@example.com")
+        
+        uow = SqlAlchemyUnitOfWork(session_factory(), email_filter=email_filter)
+        
+        assert uow.users.exists_by_email(Email("user1@example.com")) is True
+        assert email_filter.stats().ready is False
+    
+    def test_definite_miss_skips_query(self, engine, session_factory, email_filter, queries):
+        """存在しないメールアドレスはDBに問い合わせずに返すテスト"""
+        self._save(session_factory, email_filter, "user1@example.com")
+        rebuild_email_filter(email_filter, engine)
+        queries.clear()
+        
+        uow = SqlAlchemyUnitOfWork(session_factory(), email_filter=email_filter)
+        
+        assert uow.users.find_by_email(Email("unknown@example.com")) is None
+        assert uow.users.exists_by_email(Email("unknown@example.com")) is False
+        assert uow.users.find_existing_emails([Email("unknown@example.com")]) == set()
+        assert queries == []
+        assert uow.users.find_by_email(Email("user1@example.com")) is not None
+        assert email_filter.stats().negatives == 3
+    
+    def test_save_after_build_is_visible(self, engine, session_factory, email_filter):
+        """構築後に保存したメールアドレスが存在すると判定されるテスト"""
+        rebuild_email_filter(email_filter, engine)
+        self._save(session_factory, email_filter, "late@example.com")
+        
+        uow = SqlAlchemyUnitOfWork(session_factory(), email_filter=email_filter)
+        
+        assert uow.users.exists_by_email(Email("late@example.com")) is True
+    
+    def test_rebuild_keeps_adds_committed_after_scan(self, email_filter):
+        """再構築の開始前に追加され、走査より後にコミットされた値が新しいフィルタに残るテスト"""
+        email_filter.rebuild([])
+        # コミット前に追加された値は、直後の再構築の走査にはまだ含まれない
+        email_filter.add(Email("pending@example.com"))
+        email_filter.rebuild([])
+        
+        assert email_filter.might_exist(Email("pending@example.com"))
+        
+        # 次の再構築では走査に含まれるため引き継がない
+        email_filter.rebuild(["pending@example.com"])
+        assert email_filter.stats().item_count == 1
+    
+    def test_delete_is_counted_until_rebuild(self, engine, session_factory, email_filter):
+        """削除件数が記録され、再構築でリセットされるテスト"""
+        user = self._save(session_factory, email_filter, "user1@example.com")
+        rebuild_email_filter(email_filter, engine)
+        
+        session = session_factory()
+        uow = SqlAlchemyUnitOfWork(session, email_filter=email_filter)
+        with uow:
+            uow.users.delete(user.id)
+            uow.commit()
+        session.close()
+        assert email_filter.stats().removals_since_rebuild == 1
+        
+        rebuild_email_filter(email_filter, engine)
+        
+        stats = email_filter.stats()
+        assert (stats.removals_since_rebuild, stats.item_count, stats.rebuilds) == (0, 0, 2)
+    
+    def test_refresher_records_rebuild_errors(self, engine, email_filter):
+        """定期再構築の失敗を統計情報に記録し、次の周期で再構築できるテスト"""
+        calls = []
+        
+        def engine_factory():
+            # 初回だけDBに接続できない
+            calls.append(None)
+            if len(calls) == 1:
+                raise ConnectionError("データベースに接続できません")
+            return engine
+        
+        refresher = EmailFilterRefresher(email_filter, engine_factory, interval_seconds=0.01)
+        refresher.ensure_started()
+        deadline = time.monotonic() + 5
+        while not email_filter.stats().ready and time.monotonic() < deadline:
+            time.sleep(0.01)
+        refresher.stop()
+        
+        stats = email_filter.stats()
+        assert stats.ready
+        assert stats.rebuild_errors == 1
+        assert stats.last_rebuild_error == "ConnectionError: データベースに接続できません"
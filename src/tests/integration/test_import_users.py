@@ -0,0 +1,87 @@
+"""
+ユーザー一括インポートユースケースの結合テスト
+"""
+import io
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from application.dtos.user_dto import UserCreateDTO
+from application.use_cases.import_users import ImportUsersUseCase
+from infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+from infrastructure.db.models import Base
+from interfaces.cli.user_cli import _read_jsonl_rows
+
+
+class TestImportUsersIntegration:
+    """ユーザー一括インポートユースケースの結合テスト"""
+    
+    @pytest.fixture
+    def db_session(self):
+        """テスト用データベースセッション"""
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        session = SessionLocal()
+        yield session
+        session.close()
+    
+    @pytest.fixture
+    def uow(self, db_session):
+        """ユニットオブワーク"""
+        return SqlAlchemyUnitOfWork(db_session)
+    
+    def test_import_users_in_chunks(self, uow):
+        """チャンク分割インポートテスト"""
+        rows = (
+            UserCreateDTO(email=f"user{i}@example.com", name=f"ユーザー{i}")
+            for i in range(7)
+        )
+        
+        result = ImportUsersUseCase(uow, chunk_size=3).execute(rows)
+        
+        assert result.imported_count == 7
+        assert result.error_count == 0
+        assert uow.users.count() == 7
+    
+    def test_import_users_reports_invalid_and_duplicate_rows(self, uow):
+        """不正行・重複行の報告テスト"""
+        ImportUsersUseCase(uow).execute(
+            [UserCreateDTO(email="existing@example.com", name="既存ユーザー")]
+        )
+        rows = [
+            UserCreateDTO(email="new@example.com", name="新規ユーザー"),
+            UserCreateDTO(email="invalid-email", name="不正ユーザー"),
+            UserCreateDTO(email="existing@example.com", name="重複ユーザー"),
+            UserCreateDTO(email="new@example.com", name="入力内重複ユーザー"),
+            UserCreateDTO(email="noname@example.com", name=""),
+        ]
+        
+        result = ImportUsersUseCase(uow, chunk_size=10).execute(rows)
+        
+        assert result.imported_count == 1
+        reasons = {error.row: error.reason for error in result.errors}
+        assert reasons == {
+            2: "有効なメールアドレス形式ではありません",
+            3: "このメールアドレスは既に使用されています",
+            4: "このメールアドレスは既に使用されています",
+            5: "ユーザー名は必須です",
+        }
+        assert uow.users.count() == 2
+    
+    def test_import_jsonl_skips_malformed_lines(self, uow):
+        """JSONとして読めない行は中断せずに記録し、前後の行をインポートするテスト"""
+        file = io.StringIO(
+            '{"email": "user1@example.com", "name": "ユーザー1"}\n'
+            '{"email": "broken@example.com",\n'
+            '\n'
+            '["not", "an", "object"]\n'
+            '{"email": "user2@example.com", "name": "ユーザー2"}\n'
+        )
+        read_errors = []
+        
+        result = ImportUsersUseCase(uow, chunk_size=1).execute(_read_jsonl_rows(file, read_errors))
+        
+        assert (result.imported_count, result.error_count) == (2, 0)
+        assert [error.row for error in read_errors] == [2, 4]
+        assert all(error.reason.startswith("JSONが不正です") for error in read_errors)
+        assert uow.users.count() == 2
@@ -0,0 +1,187 @@
+"""
+メール送信サービスの結合テスト（ローカルのSMTPスタブサーバーを使用）
+"""
+import socket
+import socketserver
+import threading
+from email import message_from_bytes
+from email.header import decode_header, make_header
+import pytest
+from infrastructure.external_services.mail_service import MailMessage, MailService
+from infrastructure.external_services.mail_templates import WELCOME_TEMPLATE
+
+
+class SmtpStubHandler(socketserver.StreamRequestHandler):
+    """最低限のSMTPコマンドに応答するハンドラー"""
+    
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+            server.sockets.append(self.connection)
+        self._reply("220 stub ESMTP")
+        recipients = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self._reply("250-stub", "250 AUTH PLAIN")
+            elif verb == "AUTH":
+                with server.lock:
+                    server.logins += 1
+                self._reply("235 Authentication successful")
+            elif verb == "MAIL":
+                recipients = []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                address = command.split(":", 1)[1].strip("<> ")
+                if address in server.rejected:
+                    self._reply("550 No such user")
+                else:
+                    recipients.append(address)
+                    self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                data = b"".join(iter(lambda: self.rfile.readline(), b".\r\n"))
+                with server.lock:
+                    server.messages.append((recipients, message_from_bytes(data)))
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("250 OK")
+    
+    def _reply(self, *lines: str) -> None:
+        self.wfile.write("".join(f"{line}\r\n" for line in lines).encode())
+
+
+class SmtpStubServer(socketserver.ThreadingTCPServer):
+    """受信したメールと接続数を記録するSMTPスタブサーバー"""
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), SmtpStubHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.logins = 0
+        self.messages = []
+        self.rejected = set()
+        self.sockets = []
+    
+    def drop_connections(self) -> None:
+        """確立済みの接続をサーバー側から切断する"""
+        with self.lock:
+            sockets, self.sockets = self.sockets, []
+        for sock in sockets:
+            sock.shutdown(socket.SHUT_RDWR)
+
+
+class TestMailService:
+    """メール送信サービスのテスト"""
+    
+    @pytest.fixture
+    def smtp_server(self):
+        server = SmtpStubServer()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+    
+    @pytest.fixture
+    def mail_service(self, smtp_server):
+        host, port = smtp_server.server_address
+        service = MailService(
+            smtp_server=host,
+            smtp_port=port,
+            username="user",
+            password="secret",
+            use_tls=False,
+            pool_size=2
+        )
+        yield service
+        service.close()
+    
+    def test_reuses_authenticated_connection(self, mail_service, smtp_server):
+        """複数のメールを1つの認証済み接続で送信するテスト"""
+        assert mail_service.send_welcome_email("user1@example.com", "ユーザー1")
+        assert mail_service.send_welcome_email("user2@example.com", "ユーザー2")
+        assert mail_service.send_password_reset_email("user3@example.com", "token")
+        
+        assert len(smtp_server.messages) == 3
+        assert (smtp_server.connections, smtp_server.logins) == (1, 1)
+        recipients, message = smtp_server.messages[0]
+        assert recipients == ["user1@example.com"]
+        assert str(make_header(decode_header(message["Subject"]))) == "アカウント登録完了のお知らせ"
+        stats = mail_service.pool.stats()
+        assert (stats.created, stats.reused, stats.idle) == (1, 2, 1)
+    
+    def test_reconnects_after_disconnect(self, mail_service, smtp_server):
+        """プールした接続がサーバー側で切断されていたら再接続して送信するテスト"""
+        assert mail_service.send_welcome_email("user1@example.com", "ユーザー1")
+        smtp_server.drop_connections()
+        
+        assert mail_service.send_welcome_email("user2@example.com", "ユーザー2")
+        
+        assert len(smtp_server.messages) == 2
+        assert smtp_server.connections == 2
+        assert mail_service.pool.stats().discarded == 1
+    
+    def test_keeps_connection_after_rejected_recipient(self, mail_service, smtp_server):
+        """宛先が拒否されても接続を破棄せず、次のメールで再利用するテスト"""
+        smtp_server.rejected.add("user1@example.com")
+        
+        assert not mail_service.send_welcome_email("user1@example.com", "ユーザー1")
+        assert mail_service.send_welcome_email("user2@example.com", "ユーザー2")
+        
+        assert len(smtp_server.messages) == 1
+        assert (smtp_server.connections, smtp_server.logins) == (1, 1)
+        stats = mail_service.pool.stats()
+        assert (stats.created, stats.reused, stats.discarded) == (1, 1, 0)
+    
+    def test_send_bulk(self, mail_service, smtp_server):
+        """一括送信が同時接続数の範囲で接続を使い回すテスト"""
+        smtp_server.rejected.add("user7@example.com")
+        messages = (
+            MailMessage([f"user{i}@example.com"], "お知らせ", f"本文{i}")
+            for i in range(20)
+        )
+        
+        result = mail_service.send_bulk(messages, concurrency=2)
+        
+        assert (result.sent, result.failed) == (19, 1)
+        assert result.failed_addresses == ["user7@example.com"]
+        assert len(smtp_server.messages) == 19
+        # 宛先を拒否された接続もそのまま使い回すため、同時接続数の2本を超えない
+        assert smtp_server.connections <= 2
+        assert mail_service.pool.stats().discarded == 0
+    
+    def test_send_template_bulk(self, mail_service, smtp_server):
+        """テンプレートの一括送信で宛先ごとの変数が描画されるテスト"""
+        recipients = ((f"user{i}@example.com", {"user_name": f"ユーザー{i}"}) for i in range(10))
+        
+        result = mail_service.send_template_bulk(WELCOME_TEMPLATE, recipients, concurrency=2)
+        
+        assert (result.sent, result.failed) == (10, 0)
+        bodies = {
+            recipients[0]: message.get_payload(decode=True).decode("utf-8")
+            for recipients, message in smtp_server.messages
+        }
+        assert bodies["user3@example.com"].startswith("ユーザー3 様")
+        assert smtp_server.connections <= 2
+    
+    def test_skips_when_not_configured(self, monkeypatch):
+        """メール設定が不完全な場合は送信しないテスト"""
+        from app.config import settings
+        monkeypatch.setattr(settings, "MAIL_SERVER", None)
+        service = MailService(username="user", password="secret")
+        
+        assert not service.is_configured
+        assert not service.send_email(["user@example.com"], "件名", "本文")
+        assert service.send_bulk([MailMessage(["user@example.com"], "件名", "本文")]).sent == 0
@@ -0,0 +1,37 @@
+"""
+スキーマ更新の結合テスト
+"""
+from sqlalchemy import create_engine, inspect, text
+from infrastructure.db.migrations import upgrade_schema
+
+
+class TestMigrationsIntegration:
+    """スキーマ更新の結合テスト"""
+    
+    def test_upgrade_schema_adds_and_backfills_email_domain(self, tmp_path):
+        """email_domain列の追加とバックフィルのテスト"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        
+        # email_domain列がない旧スキーマ
+        with engine.begin() as connection:
+            connection.execute(text(
+                "CREATE TABLE users ("
+                "id INTEGER PRIMARY KEY, email VARCHAR(254) NOT NULL UNIQUE, "
+                "name VARCHAR(100) NOT NULL, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+            ))
+            connection.execute(text(
+                "INSERT INTO users (email, name, created_at, updated_at) VALUES "
+                "('user1@Example.com', 'ユーザー1', '2024-01-01', '2024-01-01'), "
+                "('user2@test.com', 'ユーザー2', '2024-01-01', '2024-01-01')"
+            ))
+        
+        upgrade_schema(engine)
+        
+        indexes = {index["name"] for index in inspect(engine).get_indexes("users")}
+        assert "ix_users_email_domain" in indexes
+        with engine.connect() as connection:
+            domains = connection.execute(text("SELECT email_domain FROM users ORDER BY id")).scalars().all()
+        assert domains == ["example.com", "test.com"]
+        
+        # 2回目の実行は何もしない
+        upgrade_schema(engine)
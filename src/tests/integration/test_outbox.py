@@ -0,0 +1,235 @@
+"""
+アウトボックスの結合テスト
+"""
+import time
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from application.dtos.user_dto import UserCreateDTO
+from application.outbox import WELCOME_EMAIL, OutboxMessage
+from application.use_cases.create_user import CreateUserUseCase
+from domain.exceptions import DuplicateEmailError
+from infrastructure.db.models import Base, OutboxModel
+from infrastructure.db.outbox import OutboxFailure, OutboxStore
+from infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+from infrastructure.external_services.outbox_relay import OutboxRelay
+
+
+class FakeClock:
+    """テスト用の時計"""
+    
+    def __init__(self):
+        # テスト中に作成した行が配送可能になるよう、少し先の時刻から始める
+        self.now = datetime.utcnow() + timedelta(minutes=1)
+    
+    def __call__(self) -> datetime:
+        return self.now
+
+
+class RecordingDispatcher:
+    """配送したメッセージを記録し、指定した宛先では失敗する配送処理"""
+    
+    def __init__(self):
+        self.messages = []
+        self.failing = set()
+    
+    def __call__(self, message: OutboxMessage) -> bool:
+        if message.payload.get("email") in self.failing:
+            raise ConnectionError("SMTPサーバーに接続できません")
+        self.messages.append(message)
+        return True
+
+
+class TestOutboxIntegration:
+    """アウトボックスの結合テスト"""
+    
+    @pytest.fixture
+    def engine(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+        Base.metadata.create_all(engine)
+        yield engine
+        engine.dispose()
+    
+    @pytest.fixture
+    def session_factory(self, engine):
+        return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+    
+    @pytest.fixture
+    def dispatcher(self):
+        return RecordingDispatcher()
+    
+    @pytest.fixture
+    def relay(self, engine, dispatcher, clock):
+        relay = OutboxRelay(
+            lambda: engine,
+            dispatcher,
+            batch_size=2,
+            concurrency=2,
+            lease_seconds=60,
+            max_attempts=2,
+            backoff_seconds=10,
+            retention_seconds=3600,
+            clock=clock
+        )
+        yield relay
+        relay.stop()
+    
+    def _create_user(self, session_factory, email: str, record_outbox: bool = True) -> None:
+        session = session_factory()
+        try:
+            uow = SqlAlchemyUnitOfWork(session, record_outbox=record_outbox)
+            CreateUserUseCase(uow).execute(UserCreateDTO(email=email, name="テストユーザー"))
+        finally:
+            session.close()
+    
+    def _outbox_rows(self, engine):
+        with engine.connect() as connection:
+            return connection.execute(select(OutboxModel).order_by(OutboxModel.id)).all()
+    
+    def test_records_welcome_email_with_user(self, engine, session_factory):
+        """ユーザー作成と同じトランザクションでウェルカムメールが記録されるテスト"""
+        self._create_user(session_factory, "user1@example.com")
+        
+        rows = self._outbox_rows(engine)
+        assert len(rows) == 1
+        assert rows[0].kind == WELCOME_EMAIL
+        assert rows[0].attempts == 0
+    
+    def test_records_nothing_without_outbox(self, engine, session_factory):
+        """配送するリレーがない構成（record_outbox=False）ではメールを記録しないテスト"""
+        self._create_user(session_factory, "user1@example.com", record_outbox=False)
+        
+        assert self._outbox_rows(engine) == []
+    
+    def test_duplicate_user_records_nothing(self, engine, session_factory):
+        """ユーザーの保存に失敗した場合はメールも記録されないテスト"""
+        self._create_user(session_factory, "user1@example.com")
+        
+        with pytest.raises(DuplicateEmailError):
+            self._create_user(session_factory, "user1@example.com")
+        
+        assert len(self._outbox_rows(engine)) == 1
+    
+    def test_relay_dispatches_and_deletes(self, engine, session_factory, relay, dispatcher):
+        """リレーがバッチ単位で配送し、配送済みの行を削除するテスト"""
+        for i in range(3):
+            self._create_user(session_factory, f"user{i}@example.com")
+        
+        assert relay.drain() == 3
+        
+        assert [message.payload["email"] for message in dispatcher.messages] == [
+            "user0@example.com", "user1@example.com", "user2@example.com"
+        ]
+        assert self._outbox_rows(engine) == []
+        stats = relay.stats()
+        assert (stats.batches, stats.dispatched) == (2, 3)
+    
+    def test_relay_retries_with_backoff_then_gives_up(self, engine, session_factory, relay, dispatcher, clock):
+        """失敗した行はバックオフ後に再送し、上限に達したら失敗として残すテスト"""
+        self._create_user(session_factory, "user1@example.com")
+        dispatcher.failing.add("user1@example.com")
+        
+        relay.run_once()
+        row = self._outbox_rows(engine)[0]
+        assert (row.attempts, row.available_at, row.failed_at) == (1, clock.now + timedelta(seconds=10), None)
+        assert "ConnectionError" in row.last_error
+        
+        # バックオフ中は取得されない
+        assert relay.run_once() == 0
+        
+        clock.now += timedelta(seconds=10)
+        assert relay.run_once() == 1
+        row = self._outbox_rows(engine)[0]
+        assert (row.attempts, row.failed_at) == (2, clock.now)
+        
+        clock.now += timedelta(days=1)
+        assert relay.run_once() == 0
+        stats = relay.stats()
+        assert (stats.dispatched, stats.retries, stats.failed) == (0, 1, 1)
+    
+    def test_lease_is_renewed_while_batch_runs(self, engine, session_factory, clock):
+        """配送が取得の期限を過ぎても、配送中は期限が延長されて他のリレーに取得されないテスト"""
+        self._create_user(session_factory, "user@example.com")
+        other = OutboxStore(engine, clock)
+        reclaimed = []
+        
+        def slow_dispatch(message: OutboxMessage) -> bool:
+            clock.now += timedelta(seconds=60)
+            time.sleep(0.2)
+            reclaimed.extend(other.claim(batch_size=10, lease_seconds=60))
+            return True
+        
+        relay = OutboxRelay(lambda: engine, slow_dispatch, batch_size=1, concurrency=1, lease_seconds=0.06, clock=clock)
+        try:
+            assert relay.run_once() == 1
+        finally:
+            relay.stop()
+        
+        assert reclaimed == []
+        assert self._outbox_rows(engine) == []
+        
+        with pytest.raises(ValueError):
+            OutboxRelay(lambda: engine, slow_dispatch, lease_seconds=0)
+    
+    def test_claimed_rows_are_skipped_until_lease_expires(self, engine, session_factory, clock):
+        """取得済みの行は他のリレーに渡らず、期限切れ後に取り直されるテスト"""
+        for i in range(3):
+            self._create_user(session_factory, f"user{i}@example.com")
+        first = OutboxStore(engine, clock)
+        second = OutboxStore(engine, clock)
+        
+        claimed = first.claim(batch_size=2, lease_seconds=60)
+        others = second.claim(batch_size=10, lease_seconds=60)
+        
+        assert [item.id for item in others] == [3]
+        assert second.claim(batch_size=10, lease_seconds=60) == []
+        
+        # 配送中にリレーが停止した行は期限切れ後に取り直される（少なくとも1回の配送）
+        clock.now += timedelta(seconds=61)
+        reclaimed = second.claim(batch_size=10, lease_seconds=60)
+        assert [item.id for item in reclaimed] == [1, 2, 3]
+        
+        # 取り直された行は元のリレーからは完了できない
+        first.complete(claimed)
+        assert len(self._outbox_rows(engine)) == 3
+        second.complete(reclaimed)
+        assert self._outbox_rows(engine) == []
+    
+    def test_purge_removes_rows_past_retention(self, engine, session_factory, relay, clock):
+        """配送を諦めた行と配送されないまま残った行を保持期間後に削除するテスト"""
+        for i in range(3):
+            self._create_user(session_factory, f"user{i}@example.com")
+        store = OutboxStore(engine, clock)
+        # 1件目は配送を諦めた行にする
+        store.fail([OutboxFailure(store.claim(batch_size=1, lease_seconds=60)[0], "送信できません", None)])
+        
+        # 保持期間内は削除しない
+        assert relay.purge() == 0
+        
+        # 2件目は取得中、3件目は未配送のまま保持期間を過ぎる
+        clock.now += timedelta(seconds=3601)
+        assert [item.id for item in store.claim(batch_size=1, lease_seconds=60)] == [2]
+        
+        assert relay.purge() == 2
+        assert [row.id for row in self._outbox_rows(engine)] == [2]
+        assert relay.stats().purged == 2
+    
+    def test_backlog_counts_undelivered_rows(self, engine, session_factory, relay, clock):
+        """未配送の件数と最も古い作成日時を返し、配送を諦めた行は数えないテスト"""
+        assert relay.backlog().pending == 0
+        assert relay.backlog().oldest_pending_at is None
+        
+        for i in range(3):
+            self._create_user(session_factory, f"user{i}@example.com")
+        store = OutboxStore(engine, clock)
+        store.fail([OutboxFailure(store.claim(batch_size=1, lease_seconds=60)[0], "送信できません", None)])
+        rows = self._outbox_rows(engine)
+        
+        backlog = relay.backlog()
+        assert backlog.pending == 2
+        assert backlog.oldest_pending_at == rows[1].created_at
@@ -0,0 +1,158 @@
+"""
+レプリカ振り分けの結合テスト
+複数のSQLiteファイルをプライマリ・レプリカに見立てて検証する
+"""
+import asyncio
+from datetime import datetime
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import insert
+from domain.models.user import User
+from domain.value_objects.email import Email
+from infrastructure.db.models import Base, UserModel, create_tables
+from infrastructure.db.session import AsyncDatabaseSession, DatabaseSession, get_async_session_factory
+from infrastructure.repositories.async_user_repository_impl import AsyncUserRepositoryImpl
+from infrastructure.repositories.user_repository_impl import UserRepositoryImpl
+from interfaces.api.read_your_writes import COOKIE_NAME
+from interfaces.api.user_api import router
+
+
+class TestReplicaRoutingIntegration:
+    """レプリカ振り分けの結合テスト"""
+    
+    @pytest.fixture
+    def database(self, tmp_path):
+        """プライマリ1台・レプリカ2台構成のデータベース"""
+        database = DatabaseSession(
+            f"sqlite:///{tmp_path / 'primary.db'}",
+            [f"sqlite:///{tmp_path / 'replica1.db'}", f"sqlite:///{tmp_path / 'replica2.db'}"]
+        )
+        for engine in [database.engine, *database.replica_engines]:
+            create_tables(engine)
+        
+        # レプリカごとに異なるデータを入れて読み取り先を判別できるようにする
+        now = datetime.now()
+        for index, engine in enumerate(database.replica_engines, start=1):
+            with engine.begin() as connection:
+                connection.execute(insert(UserModel).values(
+                    id=100,
+                    email=f"replica{index}@example.com",
+                    email_domain="example.com",
+                    name=f"レプリカ{index}",
+                    created_at=now,
+                    updated_at=now
+                ))
+        yield database
+        for engine in [database.engine, *database.replica_engines]:
+            engine.dispose()
+    
+    @staticmethod
+    def _new_user(email: str) -> User:
+        now = datetime.now()
+        return User(id=None, email=Email(email), name="テストユーザー", created_at=now, updated_at=now)
+    
+    def test_reads_round_robin_across_replicas(self, database):
+        """読み取りがレプリカにラウンドロビンで振り分けられるテスト"""
+        names = []
+        for _ in range(4):
+            session = database.get_session()
+            names.append(UserRepositoryImpl(session).find_by_id(100).name)
+            session.close()
+        
+        assert names == ["レプリカ1", "レプリカ2", "レプリカ1", "レプリカ2"]
+    
+    def test_writes_go_to_primary_and_session_reads_its_writes(self, database):
+        """書き込みがプライマリに送られ、同一セッションでは書き込み後にプライマリを読むテスト"""
+        session = database.get_session()
+        repository = UserRepositoryImpl(session)
+        
+        saved_user = repository.save(self._new_user("primary@example.com"))
+        
+        assert repository.find_by_id(saved_user.id) is not None
+        assert repository.find_by_id(100) is None  # プライマリには存在しない
+        session.close()
+        
+        # 他のセッションの読み取りは書き込みの影響を受けずレプリカから読む（レプリカには未反映）
+        other_session = database.get_session()
+        assert UserRepositoryImpl(other_session).find_by_id(saved_user.id) is None
+        other_session.close()
+    
+    def test_read_primary_session_reads_primary(self, database):
+        """read_primary を指定したセッションは書き込み前からプライマリを読み、最初の書き込みで通知されるテスト"""
+        writes = []
+        session = database.get_session(on_write=lambda: writes.append(None))
+        repository = UserRepositoryImpl(session)
+        saved_user = repository.save(self._new_user("primary@example.com"))
+        repository.save(self._new_user("second@example.com"))
+        session.commit()
+        session.close()
+        
+        assert len(writes) == 1
+        
+        primary_session = database.get_session(read_primary=True)
+        assert UserRepositoryImpl(primary_session).find_by_id(saved_user.id) is not None
+        primary_session.close()
+    
+    def test_async_sessions_are_routed(self, tmp_path):
+        """非同期セッションでも読み取りがレプリカに振り分けられるテスト"""
+        async def scenario():
+            database = AsyncDatabaseSession(
+                f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}",
+                [f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"]
+            )
+            for engine in [database.engine, *database.replica_engines]:
+                async with engine.begin() as connection:
+                    await connection.run_sync(Base.metadata.create_all)
+            
+            async with database.get_session() as session:
+                repository = AsyncUserRepositoryImpl(session)
+                saved_user = await repository.save(self._new_user("primary@example.com"))
+                found_in_session = await repository.find_by_id(saved_user.id)
+                await session.commit()
+            
+            async with database.get_session() as session:
+                found_in_replica = await AsyncUserRepositoryImpl(session).find_by_id(saved_user.id)
+            
+            for engine in [database.engine, *database.replica_engines]:
+                await engine.dispose()
+            return found_in_session, found_in_replica
+        
+        found_in_session, found_in_replica = asyncio.run(scenario())
+        
+        assert found_in_session is not None
+        assert found_in_replica is None
+    
+    def test_api_reads_primary_only_for_client_that_wrote(self, tmp_path):
+        """APIでは書き込んだクライアントの読み取りだけがプライマリに送られるテスト"""
+        async def scenario():
+            database = AsyncDatabaseSession(
+                f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}",
+                [f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"]
+            )
+            for engine in [database.engine, *database.replica_engines]:
+                async with engine.begin() as connection:
+                    await connection.run_sync(Base.metadata.create_all)
+            app = FastAPI()
+            app.include_router(router)
+            app.dependency_overrides[get_async_session_factory] = lambda: database.get_session
+            transport = httpx.ASGITransport(app=app)
+            
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as writer, \
+                    httpx.AsyncClient(transport=transport, base_url="http://test") as other:
+                created = await writer.post("/users/", json={"email": "primary@example.com", "name": "テストユーザー"})
+                user_id = created.json()["id"]
+                statuses = (
+                    (await writer.get(f"/users/{user_id}")).status_code,
+                    (await other.get(f"/users/{user_id}")).status_code
+                )
+            
+            for engine in [database.engine, *database.replica_engines]:
+                await engine.dispose()
+            return created, statuses
+        
+        created, statuses = asyncio.run(scenario())
+        
+        assert COOKIE_NAME in created.cookies
+        # 書き込んだクライアントはプライマリから読み、他のクライアントはレプリカ（未反映）から読む
+        assert statuses == (200, 404)
@@ -0,0 +1,178 @@
+"""
+シャーディングされたユーザーリポジトリの結合テスト
+"""
+from datetime import datetime
+import pytest
+from sqlalchemy import delete
+from domain.exceptions import DuplicateEmailError
+from domain.models.user import User
+from domain.value_objects.email import Email
+from infrastructure.db.models import UserEmailDirectoryModel
+from infrastructure.db.sharding import ShardedDatabaseSession
+from infrastructure.db.unit_of_work import ShardedUnitOfWork
+from infrastructure.repositories.sharded_user_repository import ShardedUserRepository, shard_index_for_email
+
+SHARD_COUNT = 3
+
+
+class TestShardedUserRepositoryIntegration:
+    """シャーディングされたユーザーリポジトリの結合テスト（SQLiteファイルを3つ使用）"""
+    
+    @pytest.fixture
+    def sharded_db(self, tmp_path):
+        sharded_db = ShardedDatabaseSession([f"sqlite:///{tmp_path / f'shard{i}.db'}" for i in range(SHARD_COUNT)])
+        sharded_db.create_tables()
+        yield sharded_db
+        sharded_db.dispose()
+    
+    @pytest.fixture
+    def uow(self, sharded_db):
+        return ShardedUnitOfWork(sharded_db.get_sessions(), sharded_db.executor)
+    
+    @pytest.fixture
+    def users(self, uow):
+        """全シャードに行き渡るだけのユーザーを保存する"""
+        now = datetime.now()
+        with uow:
+            saved = [
+                uow.users.save(User(id=None, email=Email(f"user{i}@example.com"), name=f"ユーザー{i}", created_at=now, updated_at=now))
+                for i in range(30)
+            ]
+            uow.commit()
+        return saved
+    
+    def _shard_counts(self, sharded_db) -> list:
+        counts = []
+        for session in sharded_db.get_sessions():
+            counts.append(ShardedUnitOfWork([session], sharded_db.executor).users.count())
+            session.close()
+        return counts
+    
+    def test_rows_are_spread_by_email_hash(self, sharded_db, users):
+        """ユーザーがメールアドレスのハッシュで各シャードに振り分けられるテスト"""
+        expected = [0] * SHARD_COUNT
+        for user in users:
+            expected[shard_index_for_email(user.email, SHARD_COUNT)] += 1
+            assert user.id % SHARD_COUNT == shard_index_for_email(user.email, SHARD_COUNT)
+        
+        assert self._shard_counts(sharded_db) == expected
+        assert all(count > 0 for count in expected)
+    
+    def test_point_lookups(self, uow, users):
+        """IDとメールアドレスで該当シャードから取得できるテスト"""
+        for user in users:
+            assert uow.users.find_by_id(user.id).email == user.email
+            assert uow.users.find_by_email(user.email).id == user.id
+        assert uow.users.exists_by_email(Email("user3@example.com")) is True
+        assert uow.users.find_by_email(Email("missing@example.com")) is None
+    
+    def test_fan_out_queries_are_merged_in_id_order(self, uow, users):
+        """全件・件数・ページングが全シャードの結果をID順にマージするテスト"""
+        ids = sorted(user.id for user in users)
+        
+        assert [user.id for user in uow.users.find_all()] == ids
+        assert [user.id for user in uow.users.iter_all(batch_size=2)] == ids
+        assert uow.users.count() == 30
+        assert [user.id for user in uow.users.find_page(3, 4)] == ids[3:7]
+        assert [user.id for user in uow.users.find_after(ids[4], 5)] == ids[5:10]
+        assert [user.id for user in uow.users.find_by_domain("example.com", 10, 5)] == ids[10:15]
+        assert {user.id for user in uow.users.find_by_ids(ids[:5] + [9999])} == set(ids[:5])
+        assert uow.users.find_existing_emails([Email("user1@example.com"), Email("x@example.com")]) == {Email("user1@example.com")}
+    
+    def test_offset_paging_is_capped(self, uow, users, monkeypatch):
+        """オフセット方式は上限までに制限し、それより後ろはキーセット方式で取得するテスト"""
+        monkeypatch.setattr(ShardedUserRepository, "MAX_OFFSET", 10)
+        ids = sorted(user.id for user in users)
+        
+        assert [user.id for user in uow.users.find_page(10, 5)] == ids[10:15]
+        with pytest.raises(ValueError):
+            uow.users.find_page(11, 5)
+        with pytest.raises(ValueError):
+            uow.users.find_by_domain("example.com", 11, 5)
+        with pytest.raises(ValueError):
+            uow.users.find_by_domain("example.com")
+        assert [user.id for user in uow.users.find_after(ids[19], 5)] == ids[20:25]
+    
+    def _email_on_other_shard(self, user: User, prefix: str) -> Email:
+        """ユーザーの行とは別のシャードにハッシュされるメールアドレス"""
+        return next(
+            Email(f"{prefix}{i}@example.com") for i in range(100)
+            if shard_index_for_email(Email(f"{prefix}{i}@example.com"), SHARD_COUNT) != user.id % SHARD_COUNT
+        )
+    
+    def test_email_change_keeps_id_and_row(self, sharded_db, uow, users):
+        """メールアドレス変更で格納先のハッシュが変わってもIDと行の位置は変わらないテスト"""
+        user = users[0]
+        old_email = user.email
+        new_email = self._email_on_other_shard(user, "moved")
+        old_id = user.id
+        counts = self._shard_counts(sharded_db)
+        
+        with uow:
+            user.change_email(new_email)
+            uow.users.save(user)
+            uow.commit()
+        
+        assert user.id == old_id
+        assert uow.users.find_by_id(old_id).email == new_email
+        assert uow.users.find_by_email(new_email).id == old_id
+        assert [found.id for found in uow.users.find_by_emails([new_email])] == [old_id]
+        assert uow.users.find_by_email(old_email) is None
+        assert uow.users.find_existing_emails([old_email, new_email]) == {new_email}
+        assert self._shard_counts(sharded_db) == counts
+        
+        # 変更後のメールアドレスは他のシャードでも使用中、変更前のメールアドレスは再び使える
+        now = datetime.now()
+        with uow:
+            with pytest.raises(DuplicateEmailError):
+                uow.users.save(User(id=None, email=new_email, name="重複", created_at=now, updated_at=now))
+        with uow:
+            uow.users.save(User(id=None, email=old_email, name="再利用", created_at=now, updated_at=now))
+            uow.commit()
+        assert uow.users.find_by_email(old_email).name == "再利用"
+    
+    def test_email_change_to_used_email_is_rejected(self, uow, users):
+        """使用中のメールアドレスへの変更は DuplicateEmailError となるテスト"""
+        user = users[0]
+        with uow:
+            user.change_email(users[1].email)
+            with pytest.raises(DuplicateEmailError):
+                uow.users.save(user)
+    
+    def test_delete_releases_email(self, uow, users):
+        """削除したユーザーのメールアドレスは索引からも取り除かれるテスト"""
+        with uow:
+            assert uow.users.delete(users[0].id) is True
+            uow.commit()
+        
+        assert uow.users.exists_by_email(users[0].email) is False
+        assert uow.users.delete(users[0].id) is False
+    
+    def test_save_all_registers_emails(self, uow, users):
+        """一括保存したユーザーのメールアドレスが索引に登録されるテスト"""
+        now = datetime.now()
+        emails = [Email(f"bulk{i}@example.com") for i in range(6)]
+        with uow:
+            uow.users.save_all([User(id=None, email=email, name="一括", created_at=now, updated_at=now) for email in emails])
+            uow.commit()
+        
+        assert {user.email for user in uow.users.find_by_emails(emails)} == set(emails)
+        assert all(uow.users.find_by_email(email).id % SHARD_COUNT == shard_index_for_email(email, SHARD_COUNT) for email in emails)
+    
+    def test_create_tables_backfills_email_directory(self, sharded_db, users):
+        """索引のない既存のユーザーが、テーブル作成時に索引へ登録されるテスト"""
+        for engine in sharded_db.engines:
+            with engine.begin() as connection:
+                connection.execute(delete(UserEmailDirectoryModel))
+        
+        sharded_db.create_tables()
+        
+        uow = ShardedUnitOfWork(sharded_db.get_sessions(), sharded_db.executor)
+        assert all(uow.users.find_by_email(user.email).id == user.id for user in users)
+    
+    def test_duplicate_email_is_rejected(self, uow, users):
+        """同じメールアドレスは同じシャードに入るため重複が検出されるテスト"""
+        now = datetime.now()
+        with uow:
+            with pytest.raises(DuplicateEmailError):
+                uow.users.save(User(id=None, email=Email("user1@example.com"), name="重複", created_at=now, updated_at=now))
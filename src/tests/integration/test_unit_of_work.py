@@ -0,0 +1,63 @@
+"""
+ユニットオブワークの結合テスト
+"""
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from domain.models.user import User
+from domain.value_objects.email import Email
+from infrastructure.db.models import Base
+from infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+
+
+class TestUnitOfWorkIntegration:
+    """ユニットオブワークの結合テスト"""
+    
+    @pytest.fixture
+    def session_factory(self, tmp_path):
+        """テスト用セッションファクトリー（コミット結果を別セッションで確認するためファイルDBを使用）"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+        Base.metadata.create_all(engine)
+        yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        engine.dispose()
+    
+    @staticmethod
+    def _new_user(email: str) -> User:
+        now = datetime.now()
+        return User(id=None, email=Email(email), name="テストユーザー", created_at=now, updated_at=now)
+    
+    def _count_committed(self, session_factory) -> int:
+        session = session_factory()
+        try:
+            return SqlAlchemyUnitOfWork(session).users.count()
+        finally:
+            session.close()
+    
+    def test_commit_persists_all_operations(self, session_factory):
+        """複数の操作が1回のコミットでまとめて確定されるテスト"""
+        session = session_factory()
+        uow = SqlAlchemyUnitOfWork(session)
+        
+        with uow:
+            user1 = uow.users.save(self._new_user("user1@example.com"))
+            uow.users.save(self._new_user("user2@example.com"))
+            uow.users.delete(user1.id)
+            assert self._count_committed(session_factory) == 0
+            uow.commit()
+        session.close()
+        
+        assert self._count_committed(session_factory) == 1
+    
+    def test_exit_without_commit_rolls_back(self, session_factory):
+        """コミットせずにブロックを抜けると取り消されるテスト"""
+        session = session_factory()
+        uow = SqlAlchemyUnitOfWork(session)
+        
+        with pytest.raises(RuntimeError):
+            with uow:
+                uow.users.save(self._new_user("user1@example.com"))
+                raise RuntimeError("途中で失敗")
+        session.close()
+        
+        assert self._count_committed(session_factory) == 0
@@ -0,0 +1,142 @@
+"""
+ユーザーAPI（条件付きGET）の結合テスト
+"""
+import asyncio
+import httpx
+import pytest
+from fastapi import FastAPI
+from app.config import settings
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from application.services.async_user_app_service import AsyncUserAppService
+from infrastructure.db.models import Base
+from infrastructure.db.unit_of_work import SqlAlchemyAsyncUnitOfWork
+from infrastructure.repositories.user_query_service_impl import AsyncUserQueryServiceImpl
+from interfaces.api.user_api import get_user_app_service, router
+
+
+class TestUserApiConditionalGet:
+    """ユーザーAPIの条件付きGETのテスト"""
+    
+    @pytest.fixture
+    def loop(self):
+        """テスト用イベントループ"""
+        loop = asyncio.new_event_loop()
+        yield loop
+        loop.close()
+    
+    @pytest.fixture
+    def run(self, loop):
+        """コルーチンを完了まで実行する関数"""
+        return loop.run_until_complete
+    
+    @pytest.fixture
+    def user_app_service(self, run):
+        """インメモリDBを使う非同期ユーザーアプリケーションサービス"""
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        
+        async def create_tables():
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+        
+        run(create_tables())
+        session = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)()
+        yield AsyncUserAppService(SqlAlchemyAsyncUnitOfWork(session), AsyncUserQueryServiceImpl(session))
+        run(session.close())
+        run(engine.dispose())
+    
+    @pytest.fixture
+    def client(self, run, user_app_service):
+        """ユーザーAPIだけを登録したアプリケーションのASGIクライアント"""
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_user_app_service] = lambda: user_app_service
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        yield client
+        run(client.aclose())
+    
+    def _create_user(self, run, client, email: str) -> dict:
+        response = run(client.post("/users/", json={"email": email, "name": "テストユーザー"}))
+        assert response.status_code == 201
+        return response.json()
+    
+    def test_get_user_returns_304_without_loading_user(self, run, client, user_app_service, monkeypatch):
+        """ETagが一致すれば更新日時だけを確認して本文なしの304を返すテスト"""
+        user = self._create_user(run, client, "test@example.com")
+        response = run(client.get(f"/users/{user['id']}"))
+        etag = response.headers["ETag"]
+        
+        assert response.status_code == 200
+        assert response.headers["Last-Modified"].endswith("GMT")
+        
+        async def fail(user_id):
+            raise AssertionError("304を返せる場合はユーザー本体を読み込まない")
+        
+        monkeypatch.setattr(user_app_service, "get_user_by_id", fail)
+        not_modified = run(client.get(f"/users/{user['id']}", headers={"If-None-Match": etag}))
+        
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["ETag"] == etag
+        assert not_modified.headers["Last-Modified"] == response.headers["Last-Modified"]
+        
+        by_date = run(client.get(
+            f"/users/{user['id']}", headers={"If-Modified-Since": response.headers["Last-Modified"]}
+        ))
+        assert by_date.status_code == 304
+    
+    def test_get_user_returns_200_after_update(self, run, client):
+        """更新後は以前のETagでは304にならないテスト"""
+        user = self._create_user(run, client, "test@example.com")
+        etag = run(client.get(f"/users/{user['id']}")).headers["ETag"]
+        run(client.put(f"/users/{user['id']}", json={"name": "更新された名前"}))
+        
+        response = run(client.get(f"/users/{user['id']}", headers={"If-None-Match": etag}))
+        
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()["name"] == "更新された名前"
+    
+    def test_get_missing_user_with_conditional_headers_returns_404(self, run, client):
+        """存在しないユーザーは条件付きリクエストでも404を返すテスト"""
+        response = run(client.get("/users/999", headers={"If-None-Match": "*"}))
+        
+        assert response.status_code == 404
+    
+    def test_get_users_weak_etag(self, run, client):
+        """一覧は弱いETagを返し、一致すれば304、内容が変われば200を返すテスト"""
+        self._create_user(run, client, "user1@example.com")
+        response = run(client.get("/users/"))
+        etag = response.headers["ETag"]
+        
+        assert response.status_code == 200
+        assert etag.startswith('W/"')
+        assert "Last-Modified" not in response.headers
+        assert run(client.get("/users/", headers={"If-None-Match": etag})).status_code == 304
+        
+        self._create_user(run, client, "user2@example.com")
+        changed = run(client.get("/users/", headers={"If-None-Match": etag}))
+        
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert changed.json()["total_count"] == 2
+
+
+class TestUserApiSharding:
+    """シャーディング構成でのユーザーAPIのテスト"""
+    
+    def test_sharded_configuration_is_rejected(self, monkeypatch):
+        """シャーディング構成ではAPIが単一DBを操作せずに503を返すテスト"""
+        monkeypatch.setattr(settings, "DATABASE_SHARD_URLS", ["sqlite:///shard0.db", "sqlite:///shard1.db"])
+        app = FastAPI()
+        app.include_router(router)
+        
+        async def request() -> list:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return [
+                    (await client.get("/users/1")).status_code,
+                    (await client.get("/users/export")).status_code
+                ]
+        
+        assert asyncio.run(request()) == [503, 503]
@@ -6,7 +6,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from application.dtos.user_dto import UserCreateDTO, UserUpdateDTO
 from application.services.user_app_service import UserAppService
-from infrastructure.repositories.user_repository_impl import UserRepositoryImpl
+from infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
 from infrastructure.db.models import Base
 
 
@@ -26,8 +26,7 @@ class TestUserAppServiceIntegration:
     @pytest.fixture
     def user_app_service(self, db_session):
         """ユーザーアプリケーションサービス"""
-        user_repository = UserRepositoryImpl(db_session)
-        return UserAppService(user_repository)
+        return UserAppService(SqlAlchemyUnitOfWork(db_session))
     
     def test_create_user_success(self, user_app_service):
         """ユーザー作成成功テスト"""
@@ -241,3 +240,30 @@ class TestUserAppServiceIntegration:
         assert "user1@example.com" in emails
         assert "user2@example.com" in emails
         assert "user3@test.com" not in emails
+    
+    def test_get_users_with_cursor(self, user_app_service):
+        """カーソル方式のユーザー一覧取得テスト"""
+        for i in range(5):
+            dto = UserCreateDTO(
+                email=f"user{i}@example.com",
+                name=f"ユーザー{i}"
+            )
+            user_app_service.create_user(dto)
+        
+        # 1ページ目（3件）
+        result = user_app_service.get_users_after(limit=3)
+        
+        assert len(result.users) == 3
+        assert result.total_count is None
+        assert result.next_cursor is not None
+        
+        # 2ページ目（2件、最終ページ）
+        result = user_app_service.get_users_after(result.next_cursor, limit=3)
+        
+        assert [user.email for user in result.users] == ["user3@example.com", "user4@example.com"]
+        assert result.next_cursor is None
+    
+    def test_get_users_with_invalid_cursor_raises_error(self, user_app_service):
+        """無効なカーソル指定時にエラーが発生するテスト"""
+        with pytest.raises(ValueError, match="無効なカーソルです"):
+            user_app_service.get_users_after("invalid-cursor", limit=3)
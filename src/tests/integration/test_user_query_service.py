@@ -0,0 +1,77 @@
+"""
+ユーザー参照用読み取りモデルの結合テスト
+"""
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from domain.models.user import User
+from domain.value_objects.email import Email
+from application.queries.user_queries import RepositoryUserQueryService
+from infrastructure.db.models import Base
+from infrastructure.repositories import user_query_service_impl
+from infrastructure.repositories.user_query_service_impl import UserQueryServiceImpl
+from infrastructure.repositories.user_repository_impl import UserRepositoryImpl
+
+
+class TestUserQueryServiceIntegration:
+    """ユーザー参照用読み取りモデルの結合テスト（リポジトリ経由の結果と一致することを確認）"""
+    
+    @pytest.fixture
+    def db_session(self):
+        """テスト用データベースセッション"""
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+        now = datetime.now()
+        UserRepositoryImpl(session).save_all([
+            User(
+                id=None,
+                email=Email(f"user{i}@{'example.com' if i % 2 else 'other.org'}"),
+                name=f"ユーザー{i}",
+                created_at=now,
+                updated_at=now
+            )
+            for i in range(10)
+        ])
+        yield session
+        session.close()
+    
+    @pytest.fixture
+    def queries(self, db_session):
+        return UserQueryServiceImpl(db_session)
+    
+    @pytest.fixture
+    def expected(self, db_session):
+        return RepositoryUserQueryService(UserRepositoryImpl(db_session))
+    
+    def test_lists_match_repository(self, queries, expected):
+        """一覧・カーソル・ドメイン・全件の結果がリポジトリ経由と一致するテスト"""
+        assert queries.list_page(3, 4) == expected.list_page(3, 4)
+        assert queries.list_after(5, 3) == expected.list_after(5, 3)
+        assert queries.list_after(None, 2) == expected.list_after(None, 2)
+        assert queries.list_by_domain("example.com", 1, 2) == expected.list_by_domain("example.com", 1, 2)
+        assert list(queries.iter_all(batch_size=3)) == list(expected.iter_all())
+    
+    def test_dto_fields_do_not_depend_on_column_order(self, queries, expected, monkeypatch):
+        """選択する列の並びが変わっても列名でDTOのフィールドに対応付けるテスト"""
+        columns = user_query_service_impl.entity_columns()
+        monkeypatch.setattr(user_query_service_impl, "entity_columns", lambda: tuple(reversed(columns)))
+        
+        assert queries.list_page(0, 3) == expected.list_page(0, 3)
+        assert queries.lookup([1], []) == expected.lookup([1], [])
+    
+    def test_lookup_merges_by_id(self, queries, monkeypatch):
+        """IDとメールアドレスで同じユーザーを指定しても1件にまとまるテスト"""
+        monkeypatch.setattr(user_query_service_impl, "IN_CLAUSE_CHUNK_SIZE", 2)
+        
+        found = queries.lookup([1, 2, 3, 99], [Email("user1@example.com"), Email("user4@other.org")])
+        
+        assert sorted(user.id for user in found) == [1, 2, 3, 5]
+    
+    def test_version_lookups(self, queries, expected):
+        """IDとメールアドレスでバージョンだけを取得できるテスト"""
+        assert queries.version_by_id(2) == expected.version_by_id(2)
+        assert queries.version_by_email(Email("user1@example.com")).id == 2
+        assert queries.version_by_id(999) is None
+        assert queries.version_by_email(Email("missing@example.com")) is None
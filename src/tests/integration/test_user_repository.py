@@ -2,11 +2,15 @@
 ユーザーリポジトリの結合テスト
 """
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+from domain.exceptions import DuplicateEmailError, UserNotFoundError
 from domain.models.user import User
 from domain.value_objects.email import Email
+from infrastructure.repositories.user_model_mapper import is_email_conflict
+from infrastructure.repositories import user_repository_impl
 from infrastructure.repositories.user_repository_impl import UserRepositoryImpl
 from infrastructure.db.models import Base
 
@@ -73,6 +77,89 @@ class TestUserRepositoryIntegration:
         assert updated_user.name == "更新された名前"
         assert updated_user.updated_at > now
     
+    def test_save_duplicate_email_raises_error(self, db_session, user_repository):
+        """重複メールアドレス保存時に一意制約違反がドメイン例外に変換されるテスト"""
+        now = datetime.now()
+        user1 = User(
+            id=None,
+            email=Email("test@example.com"),
+            name="ユーザー1",
+            created_at=now,
+            updated_at=now
+        )
+        user2 = User(
+            id=None,
+            email=Email("test@example.com"),
+            name="ユーザー2",
+            created_at=now,
+            updated_at=now
+        )
+        user_repository.save(user1)
+        
+        with pytest.raises(DuplicateEmailError, match="このメールアドレスは既に使用されています"):
+            user_repository.save(user2)
+        
+        # ロールバックは呼び出し側が行う（先に保存したユーザーも未コミットのため取り消される）
+        db_session.rollback()
+        assert user_repository.count() == 0
+    
+    def test_only_email_unique_violation_is_email_conflict(self, db_session):
+        """email を含む他の列の制約違反を重複メールアドレスと判定しないテスト"""
+        now = datetime.now()
+        insert = text(
+            "INSERT INTO users (email, email_domain, name, created_at, updated_at) "
+            "VALUES (:email, 'example.com', :name, :now, :now)"
+        )
+        db_session.execute(insert, {"email": "test@example.com", "name": "ユーザー", "now": now})
+        
+        with pytest.raises(IntegrityError) as duplicate:
+            db_session.execute(insert, {"email": "test@example.com", "name": "ユーザー", "now": now})
+        with pytest.raises(IntegrityError) as not_null:
+            db_session.execute(insert, {"email": "other@example.com", "name": None, "now": now})
+        # email_domain を必須にした別のDBでのNOT NULL違反（メッセージに email を含む）
+        engine = create_engine("sqlite:///:memory:")
+        with engine.connect() as connection:
+            connection.execute(text("CREATE TABLE users (email VARCHAR UNIQUE, email_domain VARCHAR NOT NULL)"))
+            with pytest.raises(IntegrityError) as domain_not_null:
+                connection.execute(text("INSERT INTO users (email) VALUES ('test@example.com')"))
+        engine.dispose()
+        
+        assert is_email_conflict(duplicate.value)
+        assert not is_email_conflict(not_null.value)
+        assert "users.email_domain" in str(domain_not_null.value)
+        assert not is_email_conflict(domain_not_null.value)
+    
+    def test_email_conflict_uses_postgres_constraint_name(self):
+        """PostgreSQLでは違反した制約名で判定するテスト"""
+        class Diag:
+            def __init__(self, constraint_name):
+                self.constraint_name = constraint_name
+        
+        class DriverError(Exception):
+            def __init__(self, message, constraint_name):
+                super().__init__(message)
+                self.diag = Diag(constraint_name)
+        
+        def error(constraint_name):
+            return IntegrityError("INSERT", {}, DriverError(f'violates constraint "{constraint_name}"', constraint_name))
+        
+        assert is_email_conflict(error("ix_users_email"))
+        assert not is_email_conflict(error("users_email_domain_check"))
+    
+    def test_save_missing_user_raises_error(self, user_repository):
+        """存在しないユーザー更新時にエラーが発生するテスト"""
+        now = datetime.now()
+        user = User(
+            id=999,
+            email=Email("test@example.com"),
+            name="テストユーザー",
+            created_at=now,
+            updated_at=now
+        )
+        
+        with pytest.raises(UserNotFoundError):
+            user_repository.save(user)
+    
     def test_find_by_id(self, user_repository):
         """ID検索テスト"""
         email = Email("test@example.com")
@@ -203,3 +290,86 @@ class TestUserRepositoryIntegration:
         
         # 存在する場合
         assert user_repository.exists_by_email(email) is True
+    
+    def test_find_page(self, user_repository):
+        """ページ単位取得テスト"""
+        now = datetime.now()
+        
+        for i in range(5):
+            user = User(
+                id=None,
+                email=Email(f"user{i}@example.com"),
+                name=f"ユーザー{i}",
+                created_at=now,
+                updated_at=now
+            )
+            user_repository.save(user)
+        
+        first_page = user_repository.find_page(offset=0, limit=3)
+        second_page = user_repository.find_page(offset=3, limit=3)
+        
+        assert [user.email.value for user in first_page] == [
+            "user0@example.com", "user1@example.com", "user2@example.com"
+        ]
+        assert [user.email.value for user in second_page] == [
+            "user3@example.com", "user4@example.com"
+        ]
+    
+    def test_count(self, user_repository):
+        """総数取得テスト"""
+        now = datetime.now()
+        
+        assert user_repository.count() == 0
+        
+        for i in range(3):
+            user = User(
+                id=None,
+                email=Email(f"user{i}@example.com"),
+                name=f"ユーザー{i}",
+                created_at=now,
+                updated_at=now
+            )
+            user_repository.save(user)
+        
+        assert user_repository.count() == 3
+    
+    def test_find_by_ids_and_emails(self, user_repository, monkeypatch):
+        """ID・メールアドレスの一括検索テスト（IN句のチャンク分割を含む）"""
+        monkeypatch.setattr(user_repository_impl, "IN_CLAUSE_CHUNK_SIZE", 2)
+        now = datetime.now()
+        
+        saved_users = []
+        for i in range(5):
+            user = User(
+                id=None,
+                email=Email(f"user{i}@example.com"),
+                name=f"ユーザー{i}",
+                created_at=now,
+                updated_at=now
+            )
+            saved_users.append(user_repository.save(user))
+        
+        ids = [saved_users[0].id, saved_users[2].id, saved_users[4].id, 999]
+        found_by_ids = user_repository.find_by_ids(ids)
+        
+        assert sorted(user.id for user in found_by_ids) == sorted(ids[:3])
+        
+        emails = [Email("user1@example.com"), Email("user3@example.com"), Email("notfound@example.com")]
+        found_by_emails = user_repository.find_by_emails(emails)
+        
+        assert sorted(user.email.value for user in found_by_emails) == [
+            "user1@example.com", "user3@example.com"
+        ]
+    
+    def test_iter_all_streams_in_id_order(self, user_repository):
+        """バッチサイズより多い件数をID順にストリーミング取得するテスト"""
+        now = datetime.now()
+        user_repository.save_all([
+            User(id=None, email=Email(f"user{i}@example.com"), name=f"ユーザー{i}", created_at=now, updated_at=now)
+            for i in range(7)
+        ])
+        
+        users = list(user_repository.iter_all(batch_size=3))
+        
+        assert [str(user.email) for user in users] == [f"user{i}@example.com" for i in range(7)]
+        assert [user.id for user in users] == sorted(user.id for user in users)
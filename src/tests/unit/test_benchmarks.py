@@ -0,0 +1,109 @@
+"""
+ベンチマーク補助機能の単体テスト
+"""
+import asyncio
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from app.config import settings
+from benchmarks.api import create_app
+from benchmarks.compare import compare_results
+from benchmarks.dataset import generate_users, parse_size
+from benchmarks.timing import summarize
+from infrastructure.db.models import Base
+from infrastructure.db.session import AsyncDatabaseSession
+from interfaces.api import user_api
+
+
+class TestDataset:
+    """データセット生成のテスト"""
+    
+    def test_same_seed_generates_same_users(self):
+        """同じシードなら同じデータになるテスト"""
+        assert list(generate_users(100, seed=1)) == list(generate_users(100, seed=1))
+        assert list(generate_users(100, seed=1)) != list(generate_users(100, seed=2))
+    
+    def test_emails_are_unique_and_match_domain(self):
+        """メールアドレスが一意で、email_domain と一致するテスト"""
+        users = list(generate_users(1000))
+        
+        assert len({user["email"] for user in users}) == 1000
+        assert all(user["email"].endswith("@" + user["email_domain"]) for user in users)
+    
+    @pytest.mark.parametrize("value, expected", [("10k", 10_000), ("100K", 100_000), ("1m", 1_000_000), ("250", 250)])
+    def test_parse_size(self, value, expected):
+        """件数の指定を変換するテスト"""
+        assert parse_size(value) == expected
+    
+    @pytest.mark.parametrize("value", ["0", "abc"])
+    def test_parse_size_invalid(self, value):
+        """不正な件数を拒否するテスト"""
+        with pytest.raises(ValueError):
+            parse_size(value)
+
+
+class TestResults:
+    """計測結果の集計・比較のテスト"""
+    
+    def test_summarize(self):
+        """秒数の一覧をミリ秒で集計するテスト"""
+        result = summarize("repository", "find_by_id", 10, [0.001 * i for i in range(1, 21)])
+        
+        assert result.iterations == 20
+        assert result.min_ms == pytest.approx(1)
+        assert result.median_ms == pytest.approx(10.5)
+        assert result.p95_ms == pytest.approx(20)
+        assert result.ops_per_sec == pytest.approx(20 / 0.21)
+    
+    def test_compare_results(self):
+        """しきい値を超えて遅くなった操作を検出するテスト"""
+        base = {"results": [
+            {"suite": "api", "name": "get_user", "size": 10, "median_ms": 1.0},
+            {"suite": "api", "name": "create_user", "size": 10, "median_ms": 2.0},
+            {"suite": "api", "name": "removed", "size": 10, "median_ms": 2.0},
+        ]}
+        head = {"results": [
+            {"suite": "api", "name": "get_user", "size": 10, "median_ms": 1.5},
+            {"suite": "api", "name": "create_user", "size": 10, "median_ms": 2.1},
+            {"suite": "api", "name": "added", "size": 10, "median_ms": 1.0},
+        ]}
+        
+        comparisons = {comparison.name: comparison for comparison in compare_results(base, head)}
+        
+        assert comparisons["get_user"].ratio == pytest.approx(1.5)
+        assert comparisons["get_user"].is_regression(0.1)
+        assert not comparisons["create_user"].is_regression(0.1)
+        assert comparisons["removed"].ratio is None
+        assert comparisons["added"].base is None
+
+
+class TestApiApp:
+    """APIベンチマーク用アプリケーションのテスト"""
+    
+    def test_does_not_start_background_workers(self, tmp_path, monkeypatch):
+        """メール・フィルタが有効な設定でもリレーや再構築を起動しないテスト"""
+        url = f"sqlite:///{tmp_path / 'bench.db'}"
+        engine = create_engine(url)
+        Base.metadata.create_all(engine)
+        engine.dispose()
+        monkeypatch.setattr(settings, "EMAIL_FILTER_ENABLED", True)
+        monkeypatch.setattr(user_api.mail_service, "smtp_server", "smtp.example.com")
+        monkeypatch.setattr(user_api.mail_service, "username", "user")
+        monkeypatch.setattr(user_api.mail_service, "password", "password")
+        ensure_started_calls = []
+        monkeypatch.setattr(user_api.outbox_relay, "ensure_started", lambda: ensure_started_calls.append("outbox"))
+        monkeypatch.setattr(user_api.email_filter_refresher, "ensure_started", lambda: ensure_started_calls.append("filter"))
+        db = AsyncDatabaseSession(database_url=url.replace("sqlite://", "sqlite+aiosqlite://", 1), replica_urls=[])
+        
+        async def create_user() -> httpx.Response:
+            transport = httpx.ASGITransport(app=create_app(db))
+            try:
+                async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                    return await client.post(
+                        f"{settings.API_V1_STR}/users/", json={"email": "bench@example.com", "name": "ベンチマーク"}
+                    )
+            finally:
+                await db.engine.dispose()
+        
+        assert asyncio.run(create_user()).status_code == 201
+        assert ensure_started_calls == []
@@ -0,0 +1,44 @@
+"""
+ブルームフィルタの単体テスト
+"""
+import pytest
+from infrastructure.cache.bloom_filter import BloomFilter
+
+
+class TestBloomFilter:
+    """ブルームフィルタのテスト"""
+    
+    def test_no_false_negatives(self):
+        """追加した値は必ず含まれると判定されるテスト"""
+        bloom = BloomFilter(capacity=1000, false_positive_rate=0.01)
+        values = [f"user{i}@example.com" for i in range(1000)]
+        for value in values:
+            bloom.add(value)
+        
+        assert all(value in bloom for value in values)
+    
+    def test_false_positive_rate_close_to_target(self):
+        """想定件数まで追加したときの偽陽性率が目標に近いテスト"""
+        bloom = BloomFilter(capacity=2000, false_positive_rate=0.01)
+        for i in range(2000):
+            bloom.add(f"user{i}@example.com")
+        
+        false_positives = sum(f"other{i}@example.com" in bloom for i in range(10000))
+        
+        assert false_positives / 10000 < 0.03
+        assert bloom.estimated_false_positive_rate() == pytest.approx(0.01, rel=0.2)
+    
+    def test_sizing(self):
+        """偽陽性率を下げるとメモリが増えるテスト"""
+        loose = BloomFilter(capacity=10000, false_positive_rate=0.05)
+        strict = BloomFilter(capacity=10000, false_positive_rate=0.001)
+        
+        assert strict.memory_bytes > loose.memory_bytes
+        assert strict.hash_count > loose.hash_count
+    
+    def test_invalid_arguments(self):
+        """不正な引数のテスト"""
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=0)
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=10, false_positive_rate=1.0)
@@ -0,0 +1,78 @@
+"""
+条件付きGETの単体テスト
+"""
+import time
+from datetime import datetime, timedelta, timezone
+import pytest
+from starlette.requests import Request
+from application.dtos.user_dto import UserResponseDTO
+from interfaces.api.conditional_get import http_date, is_not_modified, list_etag, user_etag
+
+
+def _request(**headers) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+class TestConditionalGet:
+    """条件付きGETのテスト"""
+    
+    updated_at = datetime(2024, 1, 2, 3, 4, 5, 678901)
+    
+    def test_etag_changes_with_updated_at(self):
+        """更新日時が変わるとETagが変わるテスト"""
+        assert user_etag(1, self.updated_at) == user_etag(1, self.updated_at)
+        assert user_etag(1, self.updated_at) != user_etag(1, self.updated_at + timedelta(microseconds=1))
+        assert user_etag(1, self.updated_at) != user_etag(2, self.updated_at)
+    
+    @pytest.fixture
+    def tokyo_timezone(self, monkeypatch):
+        """サーバーのローカルタイムゾーンを日本時間にする"""
+        monkeypatch.setenv("TZ", "Asia/Tokyo")
+        time.tzset()
+        yield
+        monkeypatch.undo()
+        time.tzset()
+    
+    def test_naive_datetime_is_treated_as_local_time(self, tokyo_timezone):
+        """タイムゾーンなしの日時はローカル時刻として扱われるテスト"""
+        local = datetime(2024, 1, 2, 12, 4, 5, 678901)
+        aware = datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+        
+        assert user_etag(1, local) == user_etag(1, aware)
+        assert http_date(local) == "Tue, 02 Jan 2024 03:04:05 GMT"
+    
+    def test_if_none_match(self):
+        """If-None-Match は弱い比較で一致判定されるテスト"""
+        etag = user_etag(1, self.updated_at)
+        
+        assert is_not_modified(_request(if_none_match=etag), etag)
+        assert is_not_modified(_request(if_none_match=f'"other", W/{etag}'), etag)
+        assert is_not_modified(_request(if_none_match="*"), etag)
+        assert not is_not_modified(_request(if_none_match='"other"'), etag)
+        assert not is_not_modified(_request(), etag, self.updated_at)
+    
+    def test_if_modified_since(self):
+        """If-Modified-Since は秒単位で比較され、If-None-Match が優先されるテスト"""
+        etag = user_etag(1, self.updated_at)
+        last_modified = http_date(self.updated_at)
+        
+        assert is_not_modified(_request(if_modified_since=last_modified), etag, self.updated_at)
+        assert not is_not_modified(_request(if_modified_since="Mon, 01 Jan 2024 00:00:00 GMT"), etag, self.updated_at)
+        assert not is_not_modified(_request(if_modified_since="invalid"), etag, self.updated_at)
+        assert not is_not_modified(
+            _request(if_none_match='"other"', if_modified_since=last_modified), etag, self.updated_at
+        )
+    
+    def test_list_etag_is_weak_and_content_based(self):
+        """一覧のETagは弱いETagで、内容が変わると変わるテスト"""
+        users = [UserResponseDTO(id=1, email="a@example.com", name="A", created_at=self.updated_at, updated_at=self.updated_at)]
+        changed = [UserResponseDTO(id=1, email="a@example.com", name="B", created_at=self.updated_at, updated_at=self.updated_at + timedelta(seconds=1))]
+        
+        assert list_etag(users, 1).startswith('W/"')
+        assert list_etag(users, 1) == list_etag(users, 1)
+        assert list_etag(users, 1) != list_etag(changed, 1)
+        assert list_etag(users, 1) != list_etag(users, 2)
@@ -2,7 +2,7 @@
 メールアドレス値オブジェクトの単体テスト
 """
 import pytest
-from domain.value_objects.email import Email
+from domain.value_objects.email import Email, validate_emails
 
 
 class TestEmailValueObject:
@@ -63,3 +63,51 @@ class TestEmailValueObject:
         """メールアドレスの文字列表現テスト"""
         email = Email("test@example.com")
         assert str(email) == "test@example.com"
+    
+    def test_email_domain(self):
+        """ドメイン部分取得テスト"""
+        email = Email("Test@Example.COM")
+        assert email.domain == "example.com"
+    
+    def test_trusted_email_skips_validation(self):
+        """検証済みの値からの生成は通常の生成と等価で、__dict__を持たないテスト"""
+        email = Email.trusted("test@example.com")
+        
+        assert email == Email("test@example.com")
+        assert hash(email) == hash(Email("test@example.com"))
+        assert not hasattr(email, "__dict__")
+        with pytest.raises(AttributeError):
+            email.value = "other@example.com"
+
+
+class TestValidateEmails:
+    """メールアドレス一括検証のテスト"""
+    
+    def test_masks_and_reasons(self):
+        """正誤・理由が入力順に返るテスト"""
+        result = validate_emails(["User@Example.COM", "", "invalid", "a" * 250 + "@example.com", "ok@example.com"])
+        
+        assert result.valid == [True, False, False, False, True]
+        assert result.errors == [
+            None,
+            "メールアドレスは必須です",
+            "有効なメールアドレス形式ではありません",
+            "メールアドレスは254文字以内で入力してください",
+            None,
+        ]
+        assert result.invalid_count == 3
+        assert [index for index, _ in result.invalid_rows()] == [1, 2, 3]
+    
+    def test_matches_single_value_validation(self):
+        """1件ずつのEmail生成と同じ判定・同じ値になるテスト"""
+        values = ["test@example.com", "test.example.com", "@example.com", "Mixed@Case.Org"]
+        
+        result = validate_emails(values)
+        
+        for value, valid in zip(values, result.valid):
+            if valid:
+                assert Email(value) in result.valid_emails()
+            else:
+                with pytest.raises(ValueError):
+                    Email(value)
+        assert [str(email) for email in result.valid_emails()] == ["test@example.com", "Mixed@Case.Org"]
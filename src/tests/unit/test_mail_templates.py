@@ -0,0 +1,75 @@
+"""
+メールテンプレートの単体テスト
+"""
+from email import message_from_bytes
+from email.header import decode_header, make_header
+import pytest
+from infrastructure.external_services.mail_templates import (
+    WELCOME_TEMPLATE,
+    MailTemplate,
+    MailTemplateRegistry,
+    mail_templates
+)
+
+
+class TestMailTemplate:
+    """メールテンプレートのテスト"""
+    
+    def test_render(self):
+        """変数を埋め込んで本文を描画するテスト"""
+        template = MailTemplate("greeting", "件名", "{name} 様\n{{ ご注文番号: {order_id} }}")
+        
+        assert template.variables == {"name", "order_id"}
+        assert template.render({"name": "山田", "order_id": 42}) == "山田 様\n{ ご注文番号: 42 }"
+    
+    def test_render_missing_variable(self):
+        """変数が不足している場合は KeyError のテスト"""
+        template = MailTemplate("greeting", "件名", "{name} 様")
+        
+        with pytest.raises(KeyError):
+            template.render({})
+    
+    @pytest.mark.parametrize("body", ["{0}", "{}", "{user.name}", "{name!r}", "{name:>10}"])
+    def test_rejects_unsupported_placeholders(self, body):
+        """変数名以外のプレースホルダーを拒否するテスト"""
+        with pytest.raises(ValueError):
+            MailTemplate("invalid", "件名", body)
+    
+    def test_build_mime_message(self):
+        """組み立てたメールが正しいMIMEとして読めるテスト"""
+        template = mail_templates.get(WELCOME_TEMPLATE)
+        
+        data = template.build("noreply@example.com", ["user@example.com"], {"user_name": "山田" * 100})
+        
+        assert b"\n" not in data.replace(b"\r\n", b"")
+        message = message_from_bytes(data)
+        assert message["From"] == "noreply@example.com"
+        assert message["To"] == "user@example.com"
+        assert str(make_header(decode_header(message["Subject"]))) == "アカウント登録完了のお知らせ"
+        assert message.get_content_type() == "text/plain"
+        body = message.get_payload(decode=True).decode(message.get_content_charset())
+        assert body.replace("\r\n", "\n") == template.render({"user_name": "山田" * 100})
+    
+    def test_static_headers_are_reused(self):
+        """固定のMIMEヘッダーを差出人ごとに一度だけ組み立てるテスト"""
+        template = MailTemplate("greeting", "件名", "{name} 様")
+        
+        template.build("a@example.com", ["user1@example.com"], {"name": "1"})
+        headers = template._static_headers("a@example.com")
+        template.build("a@example.com", ["user2@example.com"], {"name": "2"})
+        
+        assert template._static_headers("a@example.com") is headers
+        assert template._static_headers("b@example.com") is not headers
+
+
+class TestMailTemplateRegistry:
+    """メールテンプレートレジストリのテスト"""
+    
+    def test_register_and_get(self):
+        """登録したテンプレートを名前で取得できるテスト"""
+        registry = MailTemplateRegistry()
+        template = registry.register("greeting", "件名", "{name} 様")
+        
+        assert registry.get("greeting") is template
+        with pytest.raises(KeyError):
+            registry.get("unknown")
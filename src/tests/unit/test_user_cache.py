@@ -0,0 +1,92 @@
+"""
+ユーザーキャッシュの単体テスト
+"""
+from datetime import datetime
+import pytest
+from domain.models.user import User
+from domain.value_objects.email import Email
+from infrastructure.cache.user_cache import UserCache
+
+
+class FakeClock:
+    """テスト用の時計"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestUserCache:
+    """ユーザーキャッシュのテスト"""
+    
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+    
+    @pytest.fixture
+    def cache(self, clock):
+        return UserCache(maxsize=2, ttl_seconds=10, clock=clock)
+    
+    @staticmethod
+    def _user(user_id: int, email: str) -> User:
+        now = datetime.now()
+        return User(id=user_id, email=Email(email), name="テストユーザー", created_at=now, updated_at=now)
+    
+    def test_get_by_id_and_email(self, cache):
+        """IDとメールアドレスの両方で取得できるテスト"""
+        cache.put(self._user(1, "user1@example.com"))
+        
+        assert cache.get_by_id(1).email == Email("user1@example.com")
+        assert cache.get_by_email(Email("user1@example.com")).id == 1
+        assert cache.get_by_id(2) is None
+        
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size) == (2, 1, 1)
+    
+    def test_returns_copies(self, cache):
+        """取得したエンティティを変更してもキャッシュに影響しないテスト"""
+        cache.put(self._user(1, "user1@example.com"))
+        
+        cache.get_by_id(1).change_name("変更後")
+        
+        assert cache.get_by_id(1).name == "テストユーザー"
+    
+    def test_lru_eviction_drops_email_index(self, cache):
+        """容量超過で最も古いエントリが追い出され、メール索引も消えるテスト"""
+        cache.put(self._user(1, "user1@example.com"))
+        cache.put(self._user(2, "user2@example.com"))
+        cache.get_by_id(1)
+        cache.put(self._user(3, "user3@example.com"))
+        
+        assert cache.get_by_id(2) is None
+        assert cache.get_by_email(Email("user2@example.com")) is None
+        assert cache.get_by_id(1) is not None
+        assert cache.stats().evictions == 1
+    
+    def test_ttl_expiration(self, cache, clock):
+        """TTLを過ぎたエントリは取得できないテスト"""
+        cache.put(self._user(1, "user1@example.com"))
+        clock.now = 10
+        
+        assert cache.get_by_email(Email("user1@example.com")) is None
+        assert cache.stats().expirations == 1
+        assert cache.stats().size == 0
+    
+    def test_email_change_keeps_indexes_coherent(self, cache):
+        """メールアドレス変更後に古いメールアドレスで引けないテスト"""
+        cache.put(self._user(1, "old@example.com"))
+        cache.put(self._user(1, "new@example.com"))
+        
+        assert cache.get_by_email(Email("old@example.com")) is None
+        assert cache.get_by_email(Email("new@example.com")).id == 1
+    
+    def test_invalidate_by_email(self, cache):
+        """メールアドレス指定の破棄でIDのエントリも消えるテスト"""
+        cache.put(self._user(1, "user1@example.com"))
+        
+        cache.invalidate(email=Email("user1@example.com"))
+        
+        assert cache.get_by_id(1) is None
+        assert cache.stats().invalidations == 1
@@ -126,3 +126,15 @@ class TestUserEntity:
         )
         
         assert user.is_active() is True
+    
+    def test_reconstruct_equals_validated_user(self):
+        """永続化済みの値からの復元が通常の生成と等価で、__dict__を持たないテスト"""
+        email = Email("test@example.com")
+        now = datetime.now()
+        
+        user = User.reconstruct(id=1, email=email, name="テストユーザー", created_at=now, updated_at=now)
+        
+        assert user == User(id=1, email=email, name="テストユーザー", created_at=now, updated_at=now)
+        assert not hasattr(user, "__dict__")
+        user.change_name("新しい名前")
+        assert user.name == "新しい名前"
@@ -0,0 +1,50 @@
+"""
+ユーザーエクスポート出力形式の単体テスト
+"""
+import csv
+import io
+import json
+from datetime import datetime
+import pytest
+from application.dtos.user_dto import UserResponseDTO
+from application.services.user_export import UserExportFormatter
+
+
+class TestUserExportFormatter:
+    """ユーザーエクスポート出力形式のテスト"""
+    
+    @pytest.fixture
+    def user(self):
+        now = datetime(2024, 1, 2, 3, 4, 5)
+        return UserResponseDTO(id=1, email="user@example.com", name='山田, "太郎"', created_at=now, updated_at=now)
+    
+    def test_ndjson(self, user):
+        """NDJSONは1行1オブジェクトで出力されるテスト"""
+        formatter = UserExportFormatter("ndjson")
+        
+        line = formatter.format(user)
+        
+        assert formatter.header() == ""
+        assert line.endswith("\n")
+        assert json.loads(line) == {
+            "id": 1,
+            "email": "user@example.com",
+            "name": '山田, "太郎"',
+            "created_at": "2024-01-02T03:04:05",
+            "updated_at": "2024-01-02T03:04:05",
+        }
+    
+    def test_csv_quotes_values(self, user):
+        """CSVはヘッダー付きで、区切り文字を含む値がクォートされるテスト"""
+        formatter = UserExportFormatter("csv")
+        
+        rows = list(csv.DictReader(io.StringIO(formatter.header() + formatter.format(user) + formatter.format(user))))
+        
+        assert len(rows) == 2
+        assert rows[0]["name"] == '山田, "太郎"'
+        assert rows[1]["id"] == "1"
+    
+    def test_unknown_format(self):
+        """未対応の形式はエラーになるテスト"""
+        with pytest.raises(ValueError):
+            UserExportFormatter("xml")
@@ -77,35 +77,23 @@ class TestUserService:
     
     def test_get_active_users_count(self):
         """アクティブユーザー数の取得テスト"""
-        mock_user1 = Mock()
-        mock_user1.is_active.return_value = True
-        mock_user2 = Mock()
-        mock_user2.is_active.return_value = False
-        mock_user3 = Mock()
-        mock_user3.is_active.return_value = True
-        
-        self.mock_repository.find_all.return_value = [mock_user1, mock_user2, mock_user3]
+        self.mock_repository.count_active.return_value = 2
         
         result = self.user_service.get_active_users_count()
         
         assert result == 2
-        self.mock_repository.find_all.assert_called_once()
+        self.mock_repository.count_active.assert_called_once()
+        self.mock_repository.find_all.assert_not_called()
     
     def test_get_users_by_domain(self):
         """ドメイン別ユーザー取得テスト"""
         mock_user1 = Mock()
-        mock_user1.email.value = "user1@example.com"
         mock_user2 = Mock()
-        mock_user2.email.value = "user2@test.com"
-        mock_user3 = Mock()
-        mock_user3.email.value = "user3@example.com"
         
-        self.mock_repository.find_all.return_value = [mock_user1, mock_user2, mock_user3]
+        self.mock_repository.find_by_domain.return_value = [mock_user1, mock_user2]
         
-        result = self.user_service.get_users_by_domain("example.com")
+        result = self.user_service.get_users_by_domain("Example.com", offset=10, limit=20)
         
-        assert len(result) == 2
-        assert mock_user1 in result
-        assert mock_user3 in result
-        assert mock_user2 not in result
-        self.mock_repository.find_all.assert_called_once()
+        assert result == [mock_user1, mock_user2]
+        self.mock_repository.find_by_domain.assert_called_once_with("example.com", 10, 20)
+        self.mock_repository.find_all.assert_not_called()